@@ -0,0 +1,434 @@
+"""Generator of synthetic pipeline configurations and API payloads.
+
+Generates a pipeline configuration in the `PipelineConfig` format with N accounts per source and M
+holdings per account, together with the payloads the stub APIs and fake SDKs of `stubs.py` serve for
+them: Bunq monetary accounts, DeGiro portfolio updates, Coinbase accounts, Moralis balances and
+Osmosis balances and pools. The same parameters and seed always generate the same dataset:
+
+    python benchmarks/generate.py datasets/large --holdings 10000 --spam-ratio 0.2 --dust-ratio 0.1
+    python benchmarks/generate.py datasets/mixed --currency EUR=0.7 --currency USD=0.3
+
+The realism of the holdings is controlled by:
+
+- `currencies`: weights of the currencies of bank accounts and stocks, crypto is priced in the
+  preferred currency
+- `spam_ratio`: share of the tokens of wallets that are spam. On EVM chains they are flagged as
+  possible spam, on Solana and Osmosis they have no price
+- `dust_ratio`: share of the holdings the pipeline leaves out: crypto worth less than 1, closed
+  stock positions and cancelled bank accounts
+
+The dataset also records the number of rows a run is expected to store per table, so a benchmark
+or replay can tell dropped holdings apart.
+"""
+
+import argparse
+import json
+import random
+import sys
+from dataclasses import dataclass, field
+from pathlib import Path
+
+import yaml
+
+SOURCES = ("bunq", "degiro", "coinbase", "web3", "web3-solana", "cosmos")
+
+# Category of the pipeline configuration of every source
+CATEGORIES = {
+    "bunq": "bank",
+    "degiro": "stock",
+    "coinbase": "crypto",
+    "web3": "crypto",
+    "web3-solana": "crypto",
+    "cosmos": "crypto",
+}
+
+# Tables of the SQLite connector, named after the categories
+TABLES = ("bank", "stock", "crypto")
+
+
+@dataclass
+class Dataset:
+    """A pipeline configuration with the API payloads of its accounts."""
+
+    config: dict
+    payloads: dict
+    environment: dict[str, str]
+    expected_rows: dict[str, int]
+    parameters: dict = field(default_factory=dict)
+
+    def write(self, directory: str | Path) -> Path:
+        """Write the dataset as `pipeline.yml`, `payloads.json` and `dataset.json`.
+
+        Returns:
+            Path of the pipeline configuration
+
+        """
+        directory = Path(directory)
+        directory.mkdir(parents=True, exist_ok=True)
+        config_path = directory / "pipeline.yml"
+        config_path.write_text(yaml.safe_dump(self.config, sort_keys=False), encoding="utf-8")
+        (directory / "payloads.json").write_text(json.dumps(self.payloads), encoding="utf-8")
+        metadata = {"parameters": self.parameters, "environment": self.environment, "expected_rows": self.expected_rows}
+        (directory / "dataset.json").write_text(json.dumps(metadata, indent=2) + "\n", encoding="utf-8")
+        return config_path
+
+    @classmethod
+    def read(cls, directory: str | Path) -> "Dataset":
+        """Read a dataset written by `write`."""
+        directory = Path(directory)
+        metadata = json.loads((directory / "dataset.json").read_text(encoding="utf-8"))
+        return cls(
+            config=yaml.safe_load((directory / "pipeline.yml").read_text(encoding="utf-8")),
+            payloads=json.loads((directory / "payloads.json").read_text(encoding="utf-8")),
+            environment=metadata["environment"],
+            expected_rows=metadata["expected_rows"],
+            parameters=metadata.get("parameters", {}),
+        )
+
+
+class Generator:
+    """Generates the accounts and holdings of a dataset."""
+
+    def __init__(self, currencies: dict[str, float], spam_ratio: float, dust_ratio: float, seed: int):
+        self.currencies = currencies
+        self.spam_ratio = spam_ratio
+        self.dust_ratio = dust_ratio
+        # Not used for security, only to generate the same dataset for the same seed
+        self.rng = random.Random(seed)  # noqa: S311
+        self.payloads = {
+            "coinmarketcap": {},
+            "osmosis": {"balances": {}, "denoms": {}, "tokens": {}, "delegations": {}, "pools": {}, "multipliers": {}},
+            "moralis": {"evm": {}, "solana": {}},
+            "bunq": {},
+            "degiro": {},
+            "coinbase": {},
+        }
+        self.environment = {
+            "BENCHMARK_COINMARKETCAP_API_KEY": "coinmarketcap",
+            "BENCHMARK_MORALIS_API_KEY": "moralis",
+            "BENCHMARK_TELEGRAM_BOT_TOKEN": "telegram",
+            "BENCHMARK_TELEGRAM_CHAT_ID": "1",
+            "BENCHMARK_DEGIRO_INT_ACCOUNT": "1",
+        }
+        self.expected_rows = dict.fromkeys(TABLES, 0)
+        self._spam = 0
+
+    def _currency(self) -> str:
+        return self.rng.choices(list(self.currencies), weights=list(self.currencies.values()))[0]
+
+    def _is_spam(self) -> bool:
+        return self.rng.random() < self.spam_ratio
+
+    def _is_dust(self) -> bool:
+        return self.rng.random() < self.dust_ratio
+
+    def _coin(self, index: int) -> tuple[str, float]:
+        """Get a listed coin and its price, the same coin for the same index."""
+        symbol = f"TK{index:05d}"
+        coin = self.payloads["coinmarketcap"].setdefault(
+            symbol, {"name": f"Token {index}", "price": round(self.rng.uniform(0.01, 1000), 4)}
+        )
+        return symbol, coin["price"]
+
+    def _spam_symbol(self) -> str:
+        """Get a new symbol without a price."""
+        self._spam += 1
+        return f"SPAM{self._spam:05d}"
+
+    def _amount(self, price: float, dust: bool) -> float:
+        """Get an amount of a coin worth less than 1 when it is dust, and at least 2 otherwise."""
+        value = self.rng.uniform(0.001, 0.9) if dust else self.rng.uniform(2, 10000)
+        return value / price
+
+    def bunq(self, account: int, holdings: int) -> dict:
+        """Generate a Bunq account with a monetary account per holding."""
+        api_key = f"bunq-{account}"
+        monetary_accounts = []
+        for index in range(holdings):
+            dust = self._is_dust()
+            monetary_accounts.append(
+                {
+                    "MonetaryAccountBank": {
+                        "description": f"Account {index}",
+                        "status": "CANCELLED" if dust else "ACTIVE",
+                        "balance": {
+                            "value": f"{0 if dust else self.rng.uniform(10, 10000):.2f}",
+                            "currency": self._currency(),
+                        },
+                        "alias": [{"type": "IBAN", "value": f"NL{account:02d}BUNQ{index:010d}"}],
+                    }
+                }
+            )
+            self.expected_rows["bank"] += not dust
+        self.payloads["bunq"][api_key] = monetary_accounts
+
+        variable = f"BENCHMARK_BUNQ_{account}"
+        self.environment[variable] = api_key
+        return {"api_key_env": variable, "configuration_file": f"bunq-{account}.conf"}
+
+    def degiro(self, account: int, holdings: int) -> dict:
+        """Generate a DeGiro account with a stock position per holding."""
+        username = f"degiro-{account}"
+        positions, products = [], {}
+        for index in range(holdings):
+            product_id = str(account * holdings + index + 1)
+            dust = self._is_dust()
+            price = round(self.rng.uniform(5, 500), 2)
+            size = 0 if dust else self.rng.randint(1, 100)
+            positions.append(
+                {
+                    "id": product_id,
+                    "value": [
+                        {"name": "positionType", "value": "PRODUCT"},
+                        {"name": "size", "value": size},
+                        {"name": "price", "value": price},
+                        {"name": "breakEvenPrice", "value": round(price * self.rng.uniform(0.5, 1.5), 2)},
+                        {"name": "value", "value": round(price * size, 2)},
+                    ],
+                }
+            )
+            products[product_id] = {
+                "name": f"Stock {product_id}",
+                "symbol": f"S{product_id}",
+                "currency": self._currency(),
+            }
+            self.expected_rows["stock"] += not dust
+        self.payloads["degiro"][username] = {
+            "portfolio": positions,
+            "products": products,
+            "cash": round(self.rng.uniform(0, 5000), 2),
+            "currency": self._currency(),
+            "iban": f"DE{account:02d}FLATEX{account:010d}",
+        }
+        # The cash balance is stored as a bank account
+        self.expected_rows["bank"] += 1
+
+        variable = f"BENCHMARK_DEGIRO_{account}"
+        self.environment[variable] = username
+        return {"username_env": variable, "password_env": variable, "int_account_env": "BENCHMARK_DEGIRO_INT_ACCOUNT"}
+
+    def coinbase(self, account: int, holdings: int) -> dict:
+        """Generate a Coinbase account with a wallet per holding."""
+        key_file = f"coinbase-{account}.json"
+        wallets = []
+        for index in range(holdings):
+            symbol, price = self._coin(index)
+            dust = self._is_dust()
+            wallets.append({"available_balance": {"value": f"{self._amount(price, dust):.8f}", "currency": symbol}})
+            self.expected_rows["crypto"] += not dust
+        self.payloads["coinbase"][key_file] = wallets
+        return {"key_file": key_file}
+
+    def web3(self, account: int, holdings: int) -> dict:
+        """Generate an EVM wallet with a token balance per holding."""
+        address = f"0x{account:040x}"
+        balances = []
+        for index in range(holdings):
+            if self._is_spam():
+                symbol, amount, spam = self._spam_symbol(), self.rng.uniform(1, 1e6), True
+            else:
+                symbol, price = self._coin(index)
+                dust = self._is_dust()
+                amount, spam = self._amount(price, dust), False
+                self.expected_rows["crypto"] += not dust
+            balances.append(
+                {"symbol": symbol, "decimals": 18, "balance": str(int(amount * 10**18)), "possible_spam": spam}
+            )
+        self.payloads["moralis"]["evm"][address] = {"eth": balances}
+
+        variable = f"BENCHMARK_WEB3_{account}"
+        self.environment[variable] = address
+        return {"wallet_address_env": variable, "chains": ["eth"]}
+
+    def web3_solana(self, account: int, holdings: int) -> dict:
+        """Generate a Solana wallet with a token per holding."""
+        address = f"So1{account:041d}"
+        tokens = []
+        for index in range(holdings):
+            if self._is_spam():
+                symbol, amount = self._spam_symbol(), self.rng.uniform(1, 1e6)
+            else:
+                symbol, price = self._coin(index)
+                dust = self._is_dust()
+                amount = self._amount(price, dust)
+                self.expected_rows["crypto"] += not dust
+            tokens.append({"symbol": symbol, "amount": f"{amount:.9f}"})
+        self.payloads["moralis"]["solana"][address] = {"mainnet": tokens}
+
+        variable = f"BENCHMARK_WEB3_SOLANA_{account}"
+        self.environment[variable] = address
+        return {"wallet_address_env": variable, "network": "mainnet"}
+
+    def cosmos(self, account: int, holdings: int) -> dict:
+        """Generate an Osmosis wallet with a balance per holding and a pool per ten holdings."""
+        address = f"osmo1{account:038d}"
+        osmosis = self.payloads["osmosis"]
+        balances = []
+        for index in range(holdings):
+            if self._is_spam():
+                # Spam denoms are unknown to the Osmosis API
+                denom = f"factory/{address}/{self._spam_symbol().lower()}"
+                amount = self.rng.uniform(1, 1e6)
+            else:
+                symbol, price = self._coin(index)
+                denom = f"ibc/{index:064X}"
+                osmosis["denoms"][denom] = symbol
+                osmosis["tokens"][symbol] = {"name": f"Token {index}", "symbol": symbol, "exponent": 6}
+                dust = self._is_dust()
+                amount = self._amount(price, dust)
+                self.expected_rows["crypto"] += not dust
+            balances.append({"denom": denom, "amount": str(int(amount * 10**6))})
+        osmosis["balances"][address] = balances
+
+        delegations = []
+        for pool in range(max(holdings // 10, 1)):
+            pool_id = str(pool + 1)
+            denom = f"gamm/pool/{pool_id}"
+            primary, _ = self._coin(2 * pool)
+            secondary, price = self._coin(2 * pool + 1)
+            osmosis["pools"][pool_id] = [{"symbol": primary}, {"symbol": secondary}]
+            osmosis["multipliers"][denom] = "0.5"
+            dust = self._is_dust()
+            # The pipeline values a pool as the delegated amount x multiplier x 2 of the secondary coin
+            delegations.append({"denom": denom, "amount": str(int(self._amount(price, dust) * 10**6))})
+            self.expected_rows["crypto"] += not dust
+        osmosis["delegations"][address] = delegations
+
+        variable = f"BENCHMARK_COSMOS_{account}"
+        self.environment[variable] = address
+        return {"wallet_address_env": variable, "network": "osmosis"}
+
+
+def generate(
+    sources: list[str] | tuple[str, ...] = SOURCES,
+    accounts: int = 1,
+    holdings: int = 10,
+    currencies: dict[str, float] | None = None,
+    spam_ratio: float = 0.0,
+    dust_ratio: float = 0.0,
+    seed: int = 0,
+    preferred_currency: str = "EUR",
+) -> Dataset:
+    """Generate a dataset of N accounts per source with M holdings each.
+
+    Paths in the configuration are relative, so every run in its own directory starts from scratch.
+
+    Raises:
+        ValueError: When a source is unknown or a ratio is not between 0 and 1
+
+    """
+    unknown = set(sources) - set(SOURCES)
+    if unknown:
+        raise ValueError(f"Unknown sources: {', '.join(sorted(unknown))}")
+    if not (0 <= spam_ratio <= 1 and 0 <= dust_ratio <= 1):
+        raise ValueError("The spam and dust ratios must be between 0 and 1")
+
+    currencies = currencies or {preferred_currency: 1.0}
+    generator = Generator(currencies, spam_ratio, dust_ratio, seed)
+    source_accounts = {category: [] for category in TABLES}
+    for source in sources:
+        for account in range(accounts):
+            account_config = getattr(generator, source.replace("-", "_"))(account, holdings)
+            source_accounts[CATEGORIES[source]].append(
+                {"name": f"{source} {account}", "type": source, **account_config}
+            )
+
+    config = {
+        "global": {"log_level": "WARNING", "preferred_currency": preferred_currency},
+        "database": {
+            "connector": "sqlite",
+            "sqlite_path": "finance.db",
+            "spool_path": "spool",
+            "totals_history_path": "daily_totals.json",
+            "snapshot_hashes_path": "snapshot_hashes.json",
+        },
+        "reporting": {"enabled": False},
+        "logging": {
+            "type": "telegram",
+            "telegram": {
+                "bot_token_env": "BENCHMARK_TELEGRAM_BOT_TOKEN",
+                "chat_id_env": "BENCHMARK_TELEGRAM_CHAT_ID",
+                "send_summary": True,
+            },
+        },
+        "bank": {"enabled": bool(source_accounts["bank"]), "accounts": source_accounts["bank"]},
+        "stock": {"enabled": bool(source_accounts["stock"]), "accounts": source_accounts["stock"]},
+        "crypto": {
+            "enabled": bool(source_accounts["crypto"]),
+            "coinmarketcap_api_key_env": "BENCHMARK_COINMARKETCAP_API_KEY",
+            "moralis_api_key_env": "BENCHMARK_MORALIS_API_KEY",
+            "accounts": source_accounts["crypto"],
+        },
+    }
+    parameters = {
+        "sources": list(sources),
+        "accounts": accounts,
+        "holdings": holdings,
+        "currencies": currencies,
+        "spam_ratio": spam_ratio,
+        "dust_ratio": dust_ratio,
+        "seed": seed,
+    }
+    return Dataset(config, generator.payloads, generator.environment, generator.expected_rows, parameters)
+
+
+def parse_currencies(values: list[str]) -> dict[str, float]:
+    """Parse `<currency>` and `<currency>=<weight>` options into weights per currency.
+
+    Raises:
+        ValueError: When a weight is not a positive number
+
+    """
+    currencies = {}
+    for value in values:
+        currency, _, weight = value.partition("=")
+        currencies[currency.upper()] = float(weight or 1)
+        if currencies[currency.upper()] <= 0:
+            raise ValueError(f"Weight of {currency} must be positive")
+    return currencies
+
+
+def add_arguments(parser: argparse.ArgumentParser):
+    """Add the generator options to a parser."""
+    parser.add_argument("--sources", nargs="+", choices=SOURCES, default=list(SOURCES), help="Sources (default: all)")
+    parser.add_argument(
+        "--currency",
+        action="append",
+        default=[],
+        help="Currency of bank accounts and stocks, `<currency>=<weight>` for a mix (default: EUR)",
+    )
+    parser.add_argument("--spam-ratio", type=float, default=0.0, help="Share of spam wallet tokens (default: 0)")
+    parser.add_argument("--dust-ratio", type=float, default=0.0, help="Share of holdings left out (default: 0)")
+    parser.add_argument("--seed", type=int, default=0, help="Seed of the generated holdings (default: 0)")
+
+
+def main() -> int:
+    """Generate a dataset and write it to a directory."""
+    parser = argparse.ArgumentParser(description="Generate a synthetic Finance Dashboard configuration and payloads")
+    parser.add_argument("directory", type=Path, help="Directory the dataset is written to")
+    parser.add_argument("--accounts", "-n", type=int, default=1, help="Accounts per source (default: 1)")
+    parser.add_argument("--holdings", "-m", type=int, default=10, help="Holdings per account (default: 10)")
+    add_arguments(parser)
+    args = parser.parse_args()
+
+    try:
+        dataset = generate(
+            args.sources,
+            args.accounts,
+            args.holdings,
+            parse_currencies(args.currency),
+            args.spam_ratio,
+            args.dust_ratio,
+            args.seed,
+        )
+    except ValueError as e:
+        parser.error(str(e))
+
+    config_path = dataset.write(args.directory)
+    rows = ", ".join(f"{count} {table}" for table, count in dataset.expected_rows.items())
+    sys.stdout.write(f"Dataset written to {config_path.parent}, a run is expected to store {rows} rows\n")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,258 @@
+"""End-to-end benchmark of a Finance Dashboard run against stub APIs.
+
+Runs `FinanceDashboard.run` with the local SQLite connector over configurations of N accounts per
+source with M holdings each, generated by `generate.py` or read from datasets it wrote, without
+calling any live API: CoinMarketCap, the Osmosis API and LCD, Moralis and Telegram are served by
+local stub servers, the Bunq, DeGiro and Coinbase SDK clients are replaced by fakes (see `stubs.py`).
+Every scenario runs in a fresh worker process and reports the wall time of the run, the stored rows
+and the expected rows that are missing, the requests per endpoint and the peak memory:
+
+    python benchmarks/pipeline.py --accounts 1 2 --holdings 10 100 --spam-ratio 0.2 --dust-ratio 0.1
+    python benchmarks/pipeline.py --holdings 50 --latency 0.05 --latency coinmarketcap=0.2 --rate-limit 30
+    python benchmarks/pipeline.py --dataset datasets/large
+
+Latency and rate limits (requests per second) apply to all services, or to one with
+`<service>=<value>`. Requests over the rate limit are answered with status 429, like the real APIs.
+"""
+
+import argparse
+import json
+import os
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+from collections import Counter
+from pathlib import Path
+
+from generate import TABLES, Dataset, add_arguments, generate, parse_currencies
+from stubs import HTTP_SERVICES, SDK_SERVICES, Faults, StubServers, install_fake_sdks
+
+ROOT = Path(__file__).resolve().parent.parent
+
+
+def run_worker(scenario_path: Path):
+    """Run the pipeline of a scenario in this process and write the measurements next to it."""
+    import resource
+    import sqlite3
+    import tracemalloc
+
+    scenario = json.loads(scenario_path.read_text(encoding="utf-8"))
+    payloads = json.loads(Path(scenario["payloads"]).read_text(encoding="utf-8"))
+    faults = Faults(scenario["latency"])
+    sdk_counts: Counter = Counter()
+    os.environ.update(scenario["environment"])
+    sys.path.insert(0, str(ROOT / "src"))
+
+    install_fake_sdks(payloads, scenario["urls"], faults, sdk_counts)
+
+    from finance_dashboard.logger import telegram
+    from finance_dashboard.main import FinanceDashboard
+    from finance_dashboard.model import crypto
+    from finance_dashboard.pipeline_config import PipelineConfig
+    from finance_dashboard.repository.crypto import cosmos_repository
+
+    crypto.COINMARKETCAP_BASE_URL = scenario["urls"]["coinmarketcap"]
+    crypto.COINMARKETCAP_REQUEST_INTERVAL = scenario["coinmarketcap_interval"]
+    cosmos_repository.OSMOSIS_ZONE_API_URL = scenario["urls"]["osmosis_api"]
+    cosmos_repository.OSMOSIS_ZONE_LCD_URL = scenario["urls"]["osmosis_lcd"]
+    telegram.TELEGRAM_API_URL = scenario["urls"]["telegram"]
+
+    if scenario["trace_memory"]:
+        tracemalloc.start()
+
+    start = time.perf_counter()
+    dashboard = FinanceDashboard(PipelineConfig(scenario["config"]))
+    initialized = time.perf_counter()
+    dashboard.run()
+    finished = time.perf_counter()
+
+    # Send the queued Telegram messages, so they are counted with this scenario
+    if dashboard.telegram_logger:
+        dashboard.telegram_logger.close()
+
+    connection = sqlite3.connect(dashboard.config.database_sqlite_path)
+    rows = {
+        table: connection.execute(f"SELECT COUNT(*) FROM {table}").fetchone()[0]  # noqa: S608
+        for table in TABLES
+    }
+    connection.close()
+
+    max_rss = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    result = {
+        "init_seconds": initialized - start,
+        "run_seconds": finished - initialized,
+        "rows": rows,
+        "sdk_calls": dict(sdk_counts),
+        "max_rss_bytes": max_rss if sys.platform == "darwin" else max_rss * 1024,
+        "peak_traced_bytes": tracemalloc.get_traced_memory()[1] if scenario["trace_memory"] else None,
+    }
+    scenario_path.with_suffix(".result.json").write_text(json.dumps(result), encoding="utf-8")
+
+
+def run_scenario(servers: StubServers, directory: Path, scenario: dict) -> dict:
+    """Run a scenario in a worker process.
+
+    Raises:
+        RuntimeError: When the worker fails
+
+    """
+    scenario_path = directory / "scenario.json"
+    scenario_path.write_text(json.dumps(scenario), encoding="utf-8")
+    servers.take_counts()
+
+    with (directory / "worker.log").open("w", encoding="utf-8") as log:
+        process = subprocess.run(  # noqa: S603
+            [sys.executable, __file__, "--worker", str(scenario_path)],
+            cwd=directory,
+            stdout=log,
+            stderr=subprocess.STDOUT,
+            check=False,
+        )
+    if process.returncode:
+        raise RuntimeError(f"Worker failed, see {directory / 'worker.log'}")
+
+    result = json.loads(scenario_path.with_suffix(".result.json").read_text(encoding="utf-8"))
+    result["requests"] = dict(sorted((servers.take_counts() + Counter(result.pop("sdk_calls"))).items()))
+    return result
+
+
+def _service_values(values: list[str], convert) -> dict:
+    """Parse `<value>` and `<service>=<value>` options, the former applying to all services.
+
+    Raises:
+        ValueError: When the service is unknown
+
+    """
+    parsed = {}
+    for value in values:
+        service, _, setting = value.rpartition("=")
+        if service and service not in (*HTTP_SERVICES, *SDK_SERVICES):
+            raise ValueError(f"Unknown service: {service}")
+        parsed[service or "*"] = convert(setting)
+    return parsed
+
+
+def _summarize(name: str, dataset: Dataset, runs: list[dict]) -> dict:
+    last = runs[-1]
+    requests = sum(count for endpoint, count in last["requests"].items() if not endpoint.endswith(".rate_limited"))
+    return {
+        "scenario": name,
+        "run_seconds": statistics.median(run["run_seconds"] for run in runs),
+        "init_seconds": statistics.median(run["init_seconds"] for run in runs),
+        "rows": last["rows"],
+        "expected_rows": dataset.expected_rows,
+        "missing_rows": sum(dataset.expected_rows.values()) - sum(last["rows"].values()),
+        "request_count": requests,
+        "rate_limited": sum(
+            count for endpoint, count in last["requests"].items() if endpoint.endswith(".rate_limited")
+        ),
+        "requests": last["requests"],
+        "max_rss_bytes": max(run["max_rss_bytes"] for run in runs),
+        "peak_traced_bytes": last["peak_traced_bytes"],
+        "runs": runs,
+    }
+
+
+def report(results: list[dict]) -> str:
+    """Format the results as a table."""
+    lines = [
+        f"{'scenario':<16} {'run s':>8} {'init s':>7} {'bank':>6} {'stock':>6} {'crypto':>7} "
+        f"{'missing':>8} {'requests':>9} {'429s':>5} {'max RSS MB':>11} {'traced MB':>10}"
+    ]
+    for result in results:
+        traced = result["peak_traced_bytes"]
+        lines.append(
+            f"{result['scenario']:<16} {result['run_seconds']:8.2f} {result['init_seconds']:7.2f} "
+            f"{result['rows']['bank']:6d} {result['rows']['stock']:6d} {result['rows']['crypto']:7d} "
+            f"{result['missing_rows']:8d} {result['request_count']:9d} {result['rate_limited']:5d} "
+            f"{result['max_rss_bytes'] / 2**20:11.1f} {traced / 2**20 if traced is not None else float('nan'):10.1f}"
+        )
+    return "\n".join(lines)
+
+
+def main() -> int:
+    """Run the pipeline benchmark."""
+    parser = argparse.ArgumentParser(description="Benchmark Finance Dashboard runs against stub APIs")
+    parser.add_argument("--accounts", "-n", type=int, nargs="+", default=[1], help="Accounts per source (default: 1)")
+    parser.add_argument(
+        "--holdings", "-m", type=int, nargs="+", default=[10], help="Holdings per account (default: 10)"
+    )
+    add_arguments(parser)
+    parser.add_argument("--dataset", type=Path, nargs="+", help="Run datasets written by generate.py instead")
+    parser.add_argument(
+        "--latency", action="append", default=[], help="Seconds of latency, `<seconds>` or `<service>=<seconds>`"
+    )
+    parser.add_argument(
+        "--rate-limit",
+        action="append",
+        default=[],
+        help="Requests per second of the stub APIs, `<limit>` or `<service>=<limit>`",
+    )
+    parser.add_argument(
+        "--coinmarketcap-interval",
+        type=float,
+        default=0.0,
+        help="Seconds the pipeline waits before every CoinMarketCap request (default: 0, the pipeline waits 3)",
+    )
+    parser.add_argument("--repeat", "-r", type=int, default=1, help="Runs per scenario (default: 1)")
+    parser.add_argument("--trace-memory", action="store_true", help="Also measure the peak traced memory, slower")
+    parser.add_argument("--output", "-o", type=Path, help="Write the results as JSON")
+    parser.add_argument("--worker", type=Path, help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.worker:
+        run_worker(args.worker)
+        return 0
+
+    try:
+        latency = _service_values(args.latency, float)
+        rate_limit = _service_values(args.rate_limit, int)
+        if args.dataset:
+            datasets = [(path.name, Dataset.read(path)) for path in args.dataset]
+        else:
+            currencies = parse_currencies(args.currency)
+            datasets = [
+                (
+                    f"{accounts}x{holdings}",
+                    generate(args.sources, accounts, holdings, currencies, args.spam_ratio, args.dust_ratio, args.seed),
+                )
+                for accounts in args.accounts
+                for holdings in args.holdings
+            ]
+    except ValueError as e:
+        parser.error(str(e))
+
+    results = []
+    with tempfile.TemporaryDirectory() as temp_directory:
+        for name, dataset in datasets:
+            directory = Path(temp_directory) / name
+            config_path = dataset.write(directory)
+
+            runs = []
+            with StubServers(dataset.payloads, Faults(latency, rate_limit)) as servers:
+                for run in range(args.repeat):
+                    run_directory = directory / f"run-{run}"
+                    run_directory.mkdir()
+                    scenario = {
+                        "config": str(config_path),
+                        "payloads": str(directory / "payloads.json"),
+                        "environment": dataset.environment,
+                        "urls": servers.urls,
+                        "latency": latency,
+                        "coinmarketcap_interval": args.coinmarketcap_interval,
+                        "trace_memory": args.trace_memory,
+                    }
+                    runs.append(run_scenario(servers, run_directory, scenario))
+            results.append(_summarize(name, dataset, runs))
+
+    sys.stdout.write(report(results) + "\n")
+    if args.output:
+        args.output.parent.mkdir(parents=True, exist_ok=True)
+        args.output.write_text(json.dumps(results, indent=2) + "\n", encoding="utf-8")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,303 @@
+"""Startup benchmark for the Finance Dashboard CLI.
+
+Measures, each in a fresh interpreter so nothing is cached between runs:
+
+- `validate_only`: wall time of `finance-dashboard --validate-only`
+- `import_pipeline`: time to import `finance_dashboard.main`
+- `dashboard_init`: time spent in `FinanceDashboard.__init__`
+- `currency_converter`: time spent constructing `CurrencyConverter`
+- `bigquery_credentials`: time spent loading the BigQuery service account credentials, only when the
+  configuration uses BigQuery and its credentials file exists
+
+It also records the `-X importtime` breakdown per module of the CLI with `--validate-only` and of the
+pipeline. Results are written as JSON and can be compared with a baseline of an earlier commit:
+
+    python benchmarks/startup.py --output benchmarks/baselines/startup.json
+    python benchmarks/startup.py --compare benchmarks/baselines/startup.json
+
+Without `--config` a pipeline with the local SQLite connector and a single Cosmos account is used,
+so the benchmark runs without credentials. Nothing is collected, only startup is measured.
+"""
+
+# ruff: noqa: S603  # Subprocesses run the current interpreter with arguments built by this script
+
+import argparse
+import json
+import os
+import platform
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parent.parent
+
+DEFAULT_CONFIG = """\
+global:
+  log_level: WARNING
+  preferred_currency: EUR
+database:
+  connector: sqlite
+  sqlite_path: {directory}/finance.db
+  spool_path: {directory}/spool
+reporting:
+  enabled: false
+logging:
+  type: console
+bank:
+  enabled: false
+stock:
+  enabled: false
+crypto:
+  enabled: true
+  accounts:
+    - name: Cosmos
+      type: cosmos
+      wallet_address_env: OSMOSIS_WALLET_ADDRESS
+      network: osmosis
+"""
+
+DASHBOARD_INIT = """
+import json, sys, time
+from finance_dashboard.pipeline_config import PipelineConfig
+from finance_dashboard.main import FinanceDashboard
+config = PipelineConfig(sys.argv[1])
+start = time.perf_counter()
+FinanceDashboard(config)
+print(json.dumps(time.perf_counter() - start))
+"""
+
+CURRENCY_CONVERTER = """
+import json, time
+from currency_converter import CurrencyConverter
+start = time.perf_counter()
+CurrencyConverter(ref_currency="EUR")
+print(json.dumps(time.perf_counter() - start))
+"""
+
+BIGQUERY_CREDENTIALS = """
+import json, sys, time
+from google.oauth2 import service_account
+start = time.perf_counter()
+service_account.Credentials.from_service_account_file(sys.argv[1])
+print(json.dumps(time.perf_counter() - start))
+"""
+
+
+def _environment() -> dict[str, str]:
+    """Get the environment of the benchmarked interpreters, with the source tree on the path."""
+    environment = dict(os.environ)
+    environment["PYTHONPATH"] = os.pathsep.join(filter(None, [str(ROOT / "src"), environment.get("PYTHONPATH")]))
+    return environment
+
+
+def _run(arguments: list[str], directory: Path) -> subprocess.CompletedProcess:
+    return subprocess.run(
+        [sys.executable, *arguments],
+        cwd=directory,
+        env=_environment(),
+        capture_output=True,
+        text=True,
+        check=True,
+    )
+
+
+def _summarize(runs: list[float]) -> dict:
+    return {"median": statistics.median(runs), "min": min(runs), "runs": runs}
+
+
+def measure_wall_time(arguments: list[str], directory: Path, repeat: int) -> dict:
+    """Measure the wall time of running the interpreter with arguments."""
+    runs = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        _run(arguments, directory)
+        runs.append(time.perf_counter() - start)
+    return _summarize(runs)
+
+
+def measure_snippet(snippet: str, arguments: list[str], directory: Path, repeat: int) -> dict:
+    """Measure the time a snippet reports, it prints its elapsed seconds as JSON."""
+    return _summarize([json.loads(_run(["-c", snippet, *arguments], directory).stdout) for _ in range(repeat)])
+
+
+def import_times(arguments: list[str], directory: Path) -> dict[str, dict[str, int]]:
+    """Get the self and cumulative import time per module in microseconds."""
+    result = _run(["-X", "importtime", *arguments], directory)
+    modules = {}
+    for line in result.stderr.splitlines():
+        if not line.startswith("import time:") or "self [us]" in line:
+            continue
+        self_us, cumulative_us, module = (part.strip() for part in line.removeprefix("import time:").split("|"))
+        modules[module] = {"self_us": int(self_us), "cumulative_us": int(cumulative_us)}
+    return modules
+
+
+def _credentials_path(config_path: Path) -> Path | None:
+    sys.path.insert(0, str(ROOT / "src"))
+    from finance_dashboard.pipeline_config import PipelineConfig
+
+    config = PipelineConfig(str(config_path))
+    if config.database_connector != "bigquery":
+        return None
+    path = config_path.parent / config.database_credentials_path
+    return path if path.is_file() else None
+
+
+def run_benchmarks(config_path: Path, repeat: int) -> dict:
+    """Run all benchmarks, recording an error instead of a result for benchmarks that fail.
+
+    The interpreters run in the directory of the configuration, so its relative paths resolve like
+    when the CLI is run from there.
+    """
+    config = str(config_path)
+    directory = config_path.parent
+    benchmarks = {
+        "validate_only": lambda: measure_wall_time(
+            ["-m", "finance_dashboard", "--config", config, "--validate-only"], directory, repeat
+        ),
+        "import_pipeline": lambda: measure_wall_time(["-c", "import finance_dashboard.main"], directory, repeat),
+        "dashboard_init": lambda: measure_snippet(DASHBOARD_INIT, [config], directory, repeat),
+        "currency_converter": lambda: measure_snippet(CURRENCY_CONVERTER, [], directory, repeat),
+    }
+    credentials_path = _credentials_path(config_path)
+    if credentials_path:
+        benchmarks["bigquery_credentials"] = lambda: measure_snippet(
+            BIGQUERY_CREDENTIALS, [str(credentials_path)], directory, repeat
+        )
+
+    timings = {}
+    for name, benchmark in benchmarks.items():
+        try:
+            timings[name] = benchmark()
+        except subprocess.CalledProcessError as e:
+            timings[name] = {"error": (e.stderr.strip().splitlines() or [str(e)])[-1]}
+
+    imports = {}
+    for name, arguments in (
+        ("validate_only", ["-m", "finance_dashboard", "--config", config, "--validate-only"]),
+        ("pipeline", ["-c", "import finance_dashboard.main"]),
+    ):
+        try:
+            imports[name] = import_times(arguments, directory)
+        except subprocess.CalledProcessError as e:
+            imports[name] = {"error": (e.stderr.strip().splitlines() or [str(e)])[-1]}
+
+    return {
+        "commit": _git_commit(),
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "timestamp": time.strftime("%Y-%m-%dT%H:%M:%S"),
+        "config": config,
+        "timings": timings,
+        "imports": imports,
+    }
+
+
+def _git_commit() -> str | None:
+    try:
+        return subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"],  # noqa: S607
+            cwd=ROOT,
+            capture_output=True,
+            text=True,
+            check=True,
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def report(results: dict, top: int) -> str:
+    """Format the timings and the slowest imports as text."""
+    lines = [f"Startup benchmark of {results['commit'] or 'working tree'} (Python {results['python']})", ""]
+    for name, timing in results["timings"].items():
+        if "error" in timing:
+            lines.append(f"{name:<22} failed: {timing['error']}")
+        else:
+            lines.append(f"{name:<22} median {timing['median'] * 1000:9.1f} ms   min {timing['min'] * 1000:9.1f} ms")
+
+    for name, modules in results["imports"].items():
+        lines += ["", f"Slowest imports ({name}):"]
+        if "error" in modules:
+            lines.append(f"  failed: {modules['error']}")
+            continue
+        slowest = sorted(modules.items(), key=lambda item: item[1]["cumulative_us"], reverse=True)[:top]
+        for module, times in slowest:
+            lines.append(f"  {times['cumulative_us'] / 1000:9.1f} ms  {times['self_us'] / 1000:8.1f} ms self  {module}")
+    return "\n".join(lines)
+
+
+def compare(results: dict, baseline: dict, threshold: float) -> tuple[str, bool]:
+    """Compare results with a baseline.
+
+    Returns:
+        Tuple of the comparison as text and whether any timing regressed more than the threshold
+
+    """
+    lines = [f"Compared with {baseline.get('commit') or 'baseline'} (threshold {threshold:.0%}):", ""]
+    regressed = False
+    for name, timing in results["timings"].items():
+        base = baseline.get("timings", {}).get(name, {})
+        if "median" not in timing or "median" not in base:
+            continue
+        change = timing["median"] / base["median"] - 1
+        flag = ""
+        if change > threshold:
+            flag = "  REGRESSION"
+            regressed = True
+        lines.append(
+            f"{name:<22} {base['median'] * 1000:9.1f} ms -> {timing['median'] * 1000:9.1f} ms  {change:+7.1%}{flag}"
+        )
+
+    for name, modules in results["imports"].items():
+        base_modules = baseline.get("imports", {}).get(name, {})
+        if "error" in modules or "error" in base_modules:
+            continue
+        added = sorted(set(modules) - set(base_modules), key=lambda module: -modules[module]["self_us"])
+        added_us = sum(modules[module]["self_us"] for module in added)
+        if added:
+            lines += ["", f"New imports ({name}): {len(added)} modules, {added_us / 1000:.1f} ms self time"]
+            lines += [f"  {modules[module]['self_us'] / 1000:8.1f} ms  {module}" for module in added[:10]]
+    return "\n".join(lines), regressed
+
+
+def main() -> int:
+    """Run the startup benchmark."""
+    parser = argparse.ArgumentParser(description="Benchmark the startup of the Finance Dashboard CLI")
+    parser.add_argument("--config", "-c", type=Path, help="Pipeline configuration, a local SQLite one by default")
+    parser.add_argument("--repeat", "-n", type=int, default=5, help="Number of runs per benchmark (default: 5)")
+    parser.add_argument("--top", type=int, default=15, help="Number of slowest imports to show (default: 15)")
+    parser.add_argument("--output", "-o", type=Path, help="Write the results as JSON, for example as a baseline")
+    parser.add_argument("--compare", type=Path, help="Compare the results with a baseline JSON file")
+    parser.add_argument(
+        "--threshold", type=float, default=0.2, help="Relative slowdown reported as regression (default: 0.2)"
+    )
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as directory:
+        directory = Path(directory)
+        config_path = args.config.resolve() if args.config else directory / "pipeline.yml"
+        if not args.config:
+            config_path.write_text(DEFAULT_CONFIG.format(directory=directory), encoding="utf-8")
+
+        results = run_benchmarks(config_path, args.repeat)
+        if not args.config:
+            results["config"] = "default"
+
+    sys.stdout.write(report(results, args.top) + "\n")
+
+    if args.output:
+        args.output.parent.mkdir(parents=True, exist_ok=True)
+        args.output.write_text(json.dumps(results, indent=2) + "\n", encoding="utf-8")
+
+    if args.compare:
+        comparison, regressed = compare(results, json.loads(args.compare.read_text(encoding="utf-8")), args.threshold)
+        sys.stdout.write("\n" + comparison + "\n")
+        return 1 if regressed else 0
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
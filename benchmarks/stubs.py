@@ -0,0 +1,417 @@
+"""Stub APIs and fake SDK clients for the pipeline benchmark.
+
+The HTTP APIs the pipeline calls directly, CoinMarketCap, the Osmosis API and LCD, Moralis and
+Telegram, are served by local stub servers. The SDK clients of Bunq, DeGiro and Coinbase are
+replaced by fakes, and so is the Moralis SDK, which forwards to the Moralis stub server. Both serve
+the holdings of a payloads dictionary:
+
+    {
+        "coinmarketcap": {symbol: {"name": ..., "price": ...}},
+        "osmosis": {
+            "balances": {address: [{"denom": ..., "amount": ...}]},
+            "denoms": {denom: symbol},
+            "tokens": {symbol: {"name": ..., "symbol": ..., "exponent": ...}},
+            "delegations": {address: [{"denom": "gamm/pool/<id>", "amount": ...}]},
+            "pools": {pool_id: [{"symbol": ...}, {"symbol": ...}]},
+            "multipliers": {denom: ...},
+        },
+        "moralis": {"evm": {address: {chain: [balance]}}, "solana": {address: {network: [token]}}},
+        "bunq": {api_key: [monetary_account]},
+        "degiro": {username: {"portfolio": [position], "products": {id: product}, "cash": ..., "iban": ...}},
+        "coinbase": {key_file_name: [account]},
+    }
+
+Every request and SDK call is counted, and latency and rate limits can be injected per service.
+"""
+
+import json
+import sys
+import threading
+import time
+from collections import Counter, deque
+from http import HTTPStatus
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+from types import ModuleType, SimpleNamespace
+from urllib.parse import parse_qs, urlsplit
+
+import requests
+
+HTTP_SERVICES = ("coinmarketcap", "osmosis_api", "osmosis_lcd", "moralis", "telegram")
+SDK_SERVICES = ("bunq", "degiro", "coinbase")
+
+# Number of balances per page of the Osmosis LCD, like the default of the Cosmos SDK
+LCD_PAGE_SIZE = 100
+
+
+class Faults:
+    """Latency and rate limits injected per service."""
+
+    def __init__(self, latency: dict[str, float] | None = None, rate_limit: dict[str, int] | None = None):
+        self.latency = latency or {}
+        self.rate_limit = rate_limit or {}
+        self._requests: dict[str, deque] = {}
+        self._lock = threading.Lock()
+
+    def delay(self, service: str):
+        """Wait the latency of a service, a service without its own latency uses the default under `*`."""
+        latency = self.latency.get(service, self.latency.get("*", 0))
+        if latency:
+            time.sleep(latency)
+
+    def allow(self, service: str) -> bool:
+        """Check whether a request fits in the requests per second of a service."""
+        limit = self.rate_limit.get(service, self.rate_limit.get("*", 0))
+        if not limit:
+            return True
+
+        now = time.monotonic()
+        with self._lock:
+            window = self._requests.setdefault(service, deque())
+            while window and window[0] <= now - 1:
+                window.popleft()
+            if len(window) >= limit:
+                return False
+            window.append(now)
+            return True
+
+
+class StubServer:
+    """Serves one stub API on a local port."""
+
+    def __init__(self, service: str, payloads: dict, faults: Faults, counts: Counter, lock: threading.Lock):
+        self.service = service
+        self.payloads = payloads
+        self.faults = faults
+        self.counts = counts
+        self.lock = lock
+        self.messages = 0
+        self.server = ThreadingHTTPServer(("127.0.0.1", 0), self._handler())
+        self.server.daemon_threads = True
+        self.thread = threading.Thread(target=self.server.serve_forever, name=f"stub-{service}", daemon=True)
+
+    @property
+    def url(self) -> str:
+        """Get the base URL of the stub."""
+        host, port = self.server.server_address[:2]
+        return f"http://{host}:{port}"
+
+    def start(self):
+        """Start serving in a background thread."""
+        self.thread.start()
+
+    def stop(self):
+        """Stop serving."""
+        self.server.shutdown()
+        self.server.server_close()
+
+    def _handler(self) -> type[BaseHTTPRequestHandler]:
+        stub = self
+
+        class Handler(BaseHTTPRequestHandler):
+            def do_GET(self):
+                stub.handle(self)
+
+            def do_POST(self):
+                stub.handle(self)
+
+            def log_message(self, format, *args):  # noqa: A002
+                pass
+
+        return Handler
+
+    def handle(self, request: BaseHTTPRequestHandler):
+        """Answer a request from the payloads, after the injected latency and rate limit."""
+        url = urlsplit(request.path)
+        query = {key: values[0] for key, values in parse_qs(url.query).items()}
+        route, status, body = getattr(self, f"_{self.service}")(url.path, query)
+
+        self.faults.delay(self.service)
+        allowed = self.faults.allow(self.service)
+        with self.lock:
+            self.counts[f"{self.service}.{route}"] += 1
+            if not allowed:
+                self.counts[f"{self.service}.rate_limited"] += 1
+
+        if not allowed:
+            status, body = HTTPStatus.TOO_MANY_REQUESTS, self._rate_limited()
+
+        content = json.dumps(body).encode()
+        request.send_response(status)
+        request.send_header("Content-Type", "application/json")
+        request.send_header("Content-Length", str(len(content)))
+        if not allowed:
+            request.send_header("Retry-After", "1")
+        request.end_headers()
+        request.wfile.write(content)
+
+    def _rate_limited(self) -> dict:
+        if self.service == "coinmarketcap":
+            return {"status": {"error_code": 1008, "error_message": "You've exceeded your API Key's rate limit"}}
+        if self.service == "telegram":
+            return {"ok": False, "error_code": 429, "parameters": {"retry_after": 1}}
+        return {"message": "Too many requests"}
+
+    def _coinmarketcap(self, path: str, query: dict) -> tuple[str, int, dict]:
+        if path != "/v1/cryptocurrency/quotes/latest":
+            return "unknown", HTTPStatus.NOT_FOUND, {}
+
+        symbol, currency = query.get("symbol", ""), query.get("convert", "USD")
+        coin = self.payloads["coinmarketcap"].get(symbol)
+        if coin is None:
+            return "quotes", HTTPStatus.BAD_REQUEST, {"status": {"error_code": 400, "error_message": "Invalid symbol"}}
+        quote = {currency: {"price": coin["price"]}}
+        return "quotes", HTTPStatus.OK, {"data": {symbol: {"name": coin["name"], "symbol": symbol, "quote": quote}}}
+
+    def _osmosis_api(self, path: str, query: dict) -> tuple[str, int, dict | list]:
+        osmosis = self.payloads["osmosis"]
+        if path == "/search/v1/symbol":
+            symbol = osmosis["denoms"].get(query.get("denom", ""))
+            return "symbol", HTTPStatus.OK, {"symbol": symbol} if symbol else {}
+        if path.startswith("/tokens/v2/"):
+            token = osmosis["tokens"].get(path.removeprefix("/tokens/v2/"))
+            return "tokens", HTTPStatus.OK if token else HTTPStatus.NOT_FOUND, [token] if token else []
+        if path.startswith("/pools/v2/"):
+            pool = osmosis["pools"].get(path.removeprefix("/pools/v2/"))
+            return "pools", HTTPStatus.OK if pool else HTTPStatus.NOT_FOUND, pool or []
+        return "unknown", HTTPStatus.NOT_FOUND, {}
+
+    def _osmosis_lcd(self, path: str, query: dict) -> tuple[str, int, dict]:
+        osmosis = self.payloads["osmosis"]
+        if path.startswith("/cosmos/bank/v1beta1/balances/"):
+            balances = osmosis["balances"].get(path.removeprefix("/cosmos/bank/v1beta1/balances/"), [])
+            start = int(query.get("pagination.key", 0))
+            end = start + LCD_PAGE_SIZE
+            next_key = str(end) if end < len(balances) else None
+            body = {"balances": balances[start:end], "pagination": {"next_key": next_key, "total": str(len(balances))}}
+            return "balances", HTTPStatus.OK, body
+        if path.startswith("/osmosis/superfluid/v1beta1/total_delegation_by_delegator/"):
+            address = path.removeprefix("/osmosis/superfluid/v1beta1/total_delegation_by_delegator/")
+            return "delegations", HTTPStatus.OK, {"total_delegated_coins": osmosis["delegations"].get(address, [])}
+        if path == "/osmosis/superfluid/v1beta1/asset_multiplier":
+            multiplier = osmosis["multipliers"].get(query.get("denom", ""), "0")
+            return "asset_multiplier", HTTPStatus.OK, {"osmo_equivalent_multiplier": {"multiplier": multiplier}}
+        return "unknown", HTTPStatus.NOT_FOUND, {}
+
+    def _moralis(self, path: str, query: dict) -> tuple[str, int, dict | list]:
+        parts = path.strip("/").split("/")
+        moralis = self.payloads["moralis"]
+        if len(parts) == 4 and parts[:2] == ["api", "v2.2"] and parts[3] == "erc20":
+            balances = moralis["evm"].get(parts[2], {}).get(query.get("chain", "eth"), [])
+            return "erc20", HTTPStatus.OK, balances
+        if len(parts) == 4 and parts[0] == "account" and parts[3] == "portfolio":
+            tokens = moralis["solana"].get(parts[2], {}).get(parts[1], [])
+            return "sol_portfolio", HTTPStatus.OK, {"nativeBalance": {"solana": "0"}, "tokens": tokens, "nfts": []}
+        return "unknown", HTTPStatus.NOT_FOUND, {}
+
+    def _telegram(self, path: str, query: dict) -> tuple[str, int, dict]:
+        if not path.endswith("/sendMessage"):
+            return "unknown", HTTPStatus.NOT_FOUND, {"ok": False}
+        with self.lock:
+            self.messages += 1
+            message_id = self.messages
+        return "sendMessage", HTTPStatus.OK, {"ok": True, "result": {"message_id": message_id}}
+
+
+class StubServers:
+    """The stub servers of all HTTP services, sharing the request counts."""
+
+    def __init__(self, payloads: dict, faults: Faults):
+        self.counts: Counter = Counter()
+        self._lock = threading.Lock()
+        self.servers = {
+            service: StubServer(service, payloads, faults, self.counts, self._lock) for service in HTTP_SERVICES
+        }
+
+    @property
+    def urls(self) -> dict[str, str]:
+        """Get the base URL per service."""
+        return {service: server.url for service, server in self.servers.items()}
+
+    def take_counts(self) -> Counter:
+        """Get the request counts since the last call."""
+        with self._lock:
+            counts = Counter(self.counts)
+            self.counts.clear()
+        return counts
+
+    def __enter__(self) -> "StubServers":
+        for server in self.servers.values():
+            server.start()
+        return self
+
+    def __exit__(self, *exc_info):
+        for server in self.servers.values():
+            server.stop()
+
+
+def _namespace(value):
+    """Convert JSON payloads to objects with attributes, like the models of the Bunq SDK."""
+    if isinstance(value, dict):
+        return SimpleNamespace(**{f"{key}_" if key == "type" else key: _namespace(item) for key, item in value.items()})
+    if isinstance(value, list):
+        return [_namespace(item) for item in value]
+    return value
+
+
+def _module(name: str, **attributes) -> ModuleType:
+    """Register a fake module, as attribute of its parent package too."""
+    module = sys.modules.get(name) or ModuleType(name)
+    module.__dict__.update(attributes)
+    sys.modules[name] = module
+    parent, _, child = name.rpartition(".")
+    if parent:
+        setattr(_module(parent), child, module)
+    return module
+
+
+def install_fake_sdks(payloads: dict, urls: dict[str, str], faults: Faults, counts: Counter):
+    """Replace the SDKs of Bunq, DeGiro, Coinbase and Moralis by fakes serving the payloads.
+
+    Must be called before the pipeline imports the SDKs. The Moralis fake calls the Moralis stub
+    server at `urls["moralis"]`, the other fakes answer in-process after the injected latency.
+    """
+
+    def call(service: str, method: str):
+        faults.delay(service)
+        counts[f"{service}.{method}"] += 1
+
+    _install_bunq(payloads["bunq"], call)
+    _install_degiro(payloads["degiro"], call)
+    _install_coinbase(payloads["coinbase"], call)
+    _install_moralis(urls["moralis"])
+
+
+def _install_bunq(accounts: dict, call):
+    account_types = (
+        "MonetaryAccountBank",
+        "MonetaryAccountSavings",
+        "MonetaryAccountJoint",
+        "MonetaryAccountLight",
+        "MonetaryAccountExternal",
+        "MonetaryAccountInvestment",
+    )
+
+    class ApiContext:
+        def __init__(self, api_key: str):
+            self.api_key = api_key
+
+        @classmethod
+        def create(cls, environment, api_key: str, description: str):
+            call("bunq", "create_api_context")
+            return cls(api_key)
+
+        @classmethod
+        def restore(cls, path: str):
+            return cls(json.loads(Path(path).read_text(encoding="utf-8"))["api_key"])
+
+        def save(self, path: str):
+            Path(path).parent.mkdir(parents=True, exist_ok=True)
+            Path(path).write_text(json.dumps({"api_key": self.api_key}), encoding="utf-8")
+
+    class BunqContext:
+        api_context = None
+
+        @classmethod
+        def load_api_context(cls, api_context: ApiContext):
+            cls.api_context = api_context
+
+    class MonetaryAccountApiObject:
+        @staticmethod
+        def list(params: dict | None = None):
+            call("bunq", "monetary_accounts")
+            count = int((params or {}).get("count", 10))
+            monetary_accounts = []
+            for account in accounts.get(BunqContext.api_context.api_key, [])[:count]:
+                monetary_account = SimpleNamespace(**dict.fromkeys(account_types))
+                for account_type, fields in account.items():
+                    setattr(monetary_account, account_type, _namespace(fields))
+                monetary_accounts.append(monetary_account)
+            return SimpleNamespace(value=monetary_accounts)
+
+    class FloatAdapter:
+        @staticmethod
+        def deserialize(target_class, string):
+            return float(string)
+
+    _module("bunq", ApiEnvironmentType=SimpleNamespace(PRODUCTION="PRODUCTION", SANDBOX="SANDBOX"))
+    _module("bunq.sdk.context.api_context", ApiContext=ApiContext)
+    _module("bunq.sdk.context.bunq_context", BunqContext=BunqContext)
+    _module("bunq.sdk.model.generated.endpoint", MonetaryAccountApiObject=MonetaryAccountApiObject)
+    _module("bunq.sdk.json.float_adapter", FloatAdapter=FloatAdapter)
+
+
+def _install_degiro(portfolios: dict, call):
+    class UpdateOption:
+        PORTFOLIO = "portfolio"
+        TOTAL_PORTFOLIO = "totalPortfolio"
+
+    class API:
+        def __init__(self, credentials):
+            self.portfolio = portfolios[credentials.username]
+
+        def connect(self):
+            call("degiro", "connect")
+
+        def logout(self):
+            call("degiro", "logout")
+
+        def get_update(self, request_list: list, raw: bool = False) -> dict:
+            call("degiro", "update")
+            update = {}
+            for request in request_list:
+                if request.option == UpdateOption.PORTFOLIO:
+                    update["portfolio"] = {"value": self.portfolio["portfolio"]}
+                elif request.option == UpdateOption.TOTAL_PORTFOLIO:
+                    update["totalPortfolio"] = {
+                        "value": [
+                            {"name": "totalCash", "value": self.portfolio["cash"]},
+                            {"name": "cashFundCompensationCurrency", "value": self.portfolio["currency"]},
+                        ]
+                    }
+            return update
+
+        def get_products_info(self, product_list: list, raw: bool = False) -> dict:
+            call("degiro", "products_info")
+            products = self.portfolio["products"]
+            return {"data": {product_id: products[product_id] for product_id in product_list}}
+
+        def get_client_details(self) -> dict:
+            call("degiro", "client_details")
+            return {"data": {"flatexBankAccount": {"iban": self.portfolio["iban"]}}}
+
+    _module("degiro_connector.trading.api", API=API)
+    _module(
+        "degiro_connector.trading.models.account",
+        UpdateOption=UpdateOption,
+        UpdateRequest=lambda option, last_updated=0: SimpleNamespace(option=option, last_updated=last_updated),
+    )
+    _module("degiro_connector.trading.models.credentials", Credentials=SimpleNamespace)
+
+
+def _install_coinbase(wallets: dict, call):
+    class RESTClient:
+        def __init__(self, key_file: str | None = None, **kwargs):
+            self.accounts = wallets[Path(key_file).name]
+
+        def get_accounts(self, limit: int = 49, **kwargs) -> dict:
+            call("coinbase", "accounts")
+            return {"accounts": self.accounts[:limit]}
+
+    _module("coinbase.rest", RESTClient=RESTClient)
+
+
+def _install_moralis(url: str):
+    def get(path: str, api_key: str, params: dict | None = None):
+        response = requests.get(url + path, params=params, headers={"X-API-Key": api_key}, timeout=30)
+        response.raise_for_status()
+        return response.json()
+
+    def get_wallet_token_balances(api_key: str, params: dict) -> list:
+        return get(f"/api/v2.2/{params['address']}/erc20", api_key, {"chain": params.get("chain", "eth")})
+
+    def get_portfolio(api_key: str, params: dict) -> dict:
+        return get(f"/account/{params.get('network', 'mainnet')}/{params['address']}/portfolio", api_key)
+
+    _module("moralis.evm_api.token", get_wallet_token_balances=get_wallet_token_balances)
+    _module("moralis.sol_api.account", get_portfolio=get_portfolio)
@@ -8,8 +8,8 @@ import argparse
 import logging
 import sys
 
-from finance_dashboard.main import FinanceDashboard
 from finance_dashboard.pipeline_config import PipelineConfig
+from finance_dashboard.profiling import PROFILERS, Profiler, create_profiler, output_directory
 
 
 def setup_logging(level: str = "INFO"):
@@ -56,6 +56,27 @@ Configuration:
         help="Override log level from configuration",
     )
 
+    parser.add_argument(
+        "--migrate-partitioning",
+        action="store_true",
+        help="Migrate existing BigQuery tables to date-partitioned tables instead of running the pipeline",
+    )
+
+    parser.add_argument(
+        "--profile",
+        nargs="?",
+        const="sampling",
+        choices=PROFILERS,
+        help="Profile the run per source with the sampling (default) or cprofile profiler",
+    )
+
+    parser.add_argument(
+        "--profile-dir",
+        type=str,
+        default="profiles",
+        help="Directory the profiles are written to (default: profiles)",
+    )
+
     args = parser.parse_args()
 
     # Load pipeline configuration
@@ -85,10 +106,20 @@ Configuration:
     if args.validate_only:
         return 0
 
+    # Imported only now, so validating the configuration doesn't load the pipeline and its dependencies
+    from finance_dashboard.main import FinanceDashboard
+
+    profiler = create_profiler(args.profile) if args.profile else None
+    if profiler:
+        profiler.start()
+
     # Run the pipeline
     try:
-        dashboard = FinanceDashboard(pipeline_config)
-        dashboard.run()
+        dashboard = FinanceDashboard(pipeline_config, profiler)
+        if args.migrate_partitioning:
+            dashboard.migrate_partitioning()
+        else:
+            dashboard.run()
         return 0
     except KeyboardInterrupt:
         logger.warning("Pipeline interrupted by user")
@@ -96,6 +127,19 @@ Configuration:
     except Exception as e:
         logger.error(f"Pipeline failed: {e}", exc_info=True)
         return 1
+    finally:
+        if profiler:
+            profiler.stop()
+            write_profiles(profiler, args.profile_dir, logger)
+
+
+def write_profiles(profiler: Profiler, directory: str, logger: logging.Logger):
+    """Write the profiles of the run to a new directory in the profile directory."""
+    try:
+        paths = profiler.write(output_directory(directory))
+        logger.info(f"Profiles written to {paths[-1].parent}, top functions per source in {paths[-1].name}")
+    except Exception:
+        logger.exception("Failed to write profiles")
 
 
 if __name__ == "__main__":
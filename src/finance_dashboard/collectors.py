@@ -0,0 +1,208 @@
+"""Collectors of the built-in source types of Finance Dashboard.
+
+Every collector is called as `collector(context, account_name, account_config)`, the contract of
+the source registry in `finance_dashboard.sources`. A collector creates the repository of its source
+and stores the data of one account with it. Collectors log their errors instead of raising them, so
+one failing account doesn't stop the collection of the others.
+"""
+
+import logging
+
+from finance_dashboard import memory
+from finance_dashboard.sources import SourceContext
+
+
+def collect_bunq(context: SourceContext, account_name: str, account_config: dict):
+    """Collect Bunq bank account data.
+
+    Args:
+        context: Context of the run
+        account_name: Name of the account
+        account_config: Account configuration dictionary
+
+    """
+    logger = logging.getLogger(__name__)
+    api_key = context.account_env_value(account_config, "api_key_env")
+    config_file = account_config.get("configuration_file", "")
+
+    if not api_key:
+        logger.info(f"Skipping {account_name} - no API key configured")
+        return
+
+    from finance_dashboard.repository.bank.bunq_repository import BunqRepository
+
+    try:
+        logger.info(f"Collecting {account_name} account data")
+        with memory.stage("sdk.bunq", source=account_name):
+            repository = BunqRepository(context.repository_config(), api_key, config_file)
+        repository.get_and_store_accounts(account_name)
+        logger.info(f"{account_name} data collection completed")
+    except Exception:
+        logger.exception(f"{account_name} data collection failed")
+
+
+def collect_degiro(context: SourceContext, account_name: str, account_config: dict):
+    """Collect DeGiro stock data.
+
+    Args:
+        context: Context of the run
+        account_name: Name of the account
+        account_config: Account configuration dictionary
+
+    """
+    logger = logging.getLogger(__name__)
+    username = context.account_env_value(account_config, "username_env")
+    password = context.account_env_value(account_config, "password_env")
+    int_account = context.account_env_value(account_config, "int_account_env")
+    totp = context.account_env_value(account_config, "totp_env")
+
+    if not username:
+        logger.info(f"Skipping {account_name} - no credentials configured")
+        return
+
+    from finance_dashboard.repository.stock.degiro_repository import DeGiroRepository
+
+    try:
+        logger.info(f"Collecting {account_name} stock data")
+        with memory.stage("sdk.degiro", source=account_name):
+            repository = DeGiroRepository(context.repository_config(), username, password, int_account, totp)
+        repository.get_and_store_stocks(account_name)
+        repository.get_and_store_account(account_name)
+        repository.logout()
+        logger.info(f"{account_name} data collection completed")
+    except Exception:
+        logger.exception(f"{account_name} data collection failed")
+
+
+def collect_coinbase(context: SourceContext, account_name: str, account_config: dict):
+    """Collect Coinbase exchange data.
+
+    Args:
+        context: Context of the run
+        account_name: Name of the account
+        account_config: Account configuration dictionary
+
+    """
+    logger = logging.getLogger(__name__)
+    key_file = account_config.get("key_file", "")
+
+    if not key_file:
+        logger.info(f"Skipping {account_name} - no key file configured")
+        return
+
+    from finance_dashboard.repository.crypto.coinbase_repository import CoinbaseRepository
+
+    try:
+        logger.info(f"Collecting {account_name} account data")
+        with memory.stage("sdk.coinbase", source=account_name):
+            repository = CoinbaseRepository(context.repository_config(), key_file)
+        repository.get_and_store_wallets(account_name)
+        logger.info(f"{account_name} data collection completed")
+    except Exception:
+        logger.exception(f"{account_name} data collection failed")
+
+
+def collect_web3(context: SourceContext, account_name: str, account_config: dict):
+    """Collect Web3 EVM wallet data.
+
+    Args:
+        context: Context of the run
+        account_name: Name of the account
+        account_config: Account configuration dictionary
+
+    """
+    logger = logging.getLogger(__name__)
+    wallet_address = context.account_env_value(account_config, "wallet_address_env")
+    chains = account_config.get("chains", [])
+
+    if not wallet_address:
+        logger.info(f"Skipping {account_name} - no wallet address configured")
+        return
+
+    if not context.moralis_api_key:
+        logger.info(f"Skipping {account_name} - no Moralis API key configured")
+        return
+
+    from finance_dashboard.repository.crypto.web3_repository import Web3Repository
+
+    try:
+        logger.info(f"Collecting {account_name} wallet data")
+        with memory.stage("sdk.moralis", source=account_name):
+            repository = Web3Repository(context.repository_config(), context.moralis_api_key)
+
+        for chain in chains:
+            chain_name = f"{account_name} {chain.upper()}"
+            repository.get_and_store_evm_wallet(chain_name, wallet_address, chain)
+
+        logger.info(f"{account_name} data collection completed")
+    except Exception:
+        logger.exception(f"{account_name} data collection failed")
+
+
+def collect_web3_solana(context: SourceContext, account_name: str, account_config: dict):
+    """Collect Web3 Solana wallet data.
+
+    Args:
+        context: Context of the run
+        account_name: Name of the account
+        account_config: Account configuration dictionary
+
+    """
+    logger = logging.getLogger(__name__)
+    wallet_address = context.account_env_value(account_config, "wallet_address_env")
+    network = account_config.get("network", "mainnet")
+
+    if not wallet_address:
+        logger.info(f"Skipping {account_name} - no wallet address configured")
+        return
+
+    if not context.moralis_api_key:
+        logger.info(f"Skipping {account_name} - no Moralis API key configured")
+        return
+
+    from finance_dashboard.repository.crypto.web3_repository import Web3Repository
+
+    try:
+        logger.info(f"Collecting {account_name} wallet data")
+        with memory.stage("sdk.moralis", source=account_name):
+            repository = Web3Repository(context.repository_config(), context.moralis_api_key)
+        repository.get_and_store_sol_wallet(account_name, wallet_address, network)
+        logger.info(f"{account_name} data collection completed")
+    except Exception:
+        logger.exception(f"{account_name} data collection failed")
+
+
+def collect_cosmos(context: SourceContext, account_name: str, account_config: dict):
+    """Collect Cosmos-based wallet data.
+
+    Args:
+        context: Context of the run
+        account_name: Name of the account
+        account_config: Account configuration dictionary
+
+    """
+    logger = logging.getLogger(__name__)
+    wallet_address = context.account_env_value(account_config, "wallet_address_env")
+    network = account_config.get("network", "osmosis")
+
+    if not wallet_address:
+        logger.info(f"Skipping {account_name} - no wallet address configured")
+        return
+
+    from finance_dashboard.repository.crypto.cosmos_repository import CosmosRepository
+
+    try:
+        logger.info(f"Collecting {account_name} wallet data")
+        with memory.stage("sdk.cosmos", source=account_name):
+            repository = CosmosRepository(context.repository_config())
+
+        if network.lower() == "osmosis":
+            repository.get_and_store_wallet(account_name, wallet_address)
+            repository.get_and_store_pools(account_name, wallet_address)
+        else:
+            logger.warning(f"Unsupported Cosmos network: {network}")
+            return
+
+        logger.info(f"{account_name} data collection completed")
+    except Exception:
+        logger.exception(f"{account_name} data collection failed")
@@ -4,3 +4,23 @@ class Connector:
     def store_data(self, df, table_name):
         """Store data to the connector's destination."""
         raise NotImplementedError
+
+    def flush(self):
+        """Write any data that is still buffered by the connector."""
+        pass
+
+    def close(self):
+        """Release the connections and threads held by the connector."""
+        pass
+
+    def get_category_totals(self, day):
+        """Get the total balance per category for a single date."""
+        raise NotImplementedError
+
+    def get_daily_summary(self, report_date=None):
+        """Get a summary of the latest date with data up to the report date compared to the day before."""
+        raise NotImplementedError
+
+    def run_statistics(self) -> dict:
+        """Get statistics of the work done by the connector during the run, for the run report."""
+        return {}
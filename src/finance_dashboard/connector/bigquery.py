@@ -1,74 +1,465 @@
 import contextlib
+import functools
 import logging
-from datetime import datetime
+import threading
+from collections.abc import Iterable
+from concurrent.futures import Future, ThreadPoolExecutor
+from datetime import date, datetime, timedelta
 
-import pandas_gbq
+import pyarrow as pa
+import pyarrow.parquet as pq
 from google.cloud import bigquery
 from google.oauth2 import service_account
-from pandas import DataFrame
+from pandas import DataFrame, concat
 
-from finance_dashboard import schema
+from finance_dashboard import schema, tracing
 from finance_dashboard.connector import Connector
+from finance_dashboard.connector.instrumentation import JobRecorder
+from finance_dashboard.connector.metadata_cache import MetadataCache
+from finance_dashboard.connector.snapshot_hashes import SnapshotHashes
+from finance_dashboard.exceptions import StorageError
 
+# BigQuery types of the schema column types
+BIGQUERY_TYPES = {
+    "STRING": "STRING",
+    "FLOAT": "FLOAT64",
+    "INTEGER": "INTEGER",
+    "DATE": "DATE",
+}
+
+
+@functools.cache
+def bigquery_schema(table_name: str) -> tuple[bigquery.SchemaField, ...]:
+    """Get the BigQuery schema fields of a table, translated once per table."""
+    return tuple(
+        bigquery.SchemaField(column.name, BIGQUERY_TYPES[column.type], mode="NULLABLE")
+        for column in schema.get(table_name).columns
+    )
 
-class BigQueryConnector(Connector):
-    """BigQuery connector for storing and retrieving financial data."""
 
-    def __init__(self, credentials_path: str, project_id: str, schema_id: str, location: str):
+class BigQueryConnector(Connector):
+    """BigQuery connector for storing and retrieving financial data.
+
+    In ``immediate`` write mode every ``store_data`` call is upserted right away. In ``buffered`` write mode
+    the DataFrames are accumulated per table and written with a single upload and MERGE per table on
+    ``flush``, or as soon as a table's buffer reaches ``buffer_max_rows`` rows. In ``async`` write mode
+    every ``store_data`` call is queued and written in the background, so the caller continues right
+    away; ``flush`` waits for all queued writes. In ``transaction`` write mode the DataFrames are
+    buffered like in ``buffered`` mode, and ``flush`` writes all tables in a single transaction.
+    """
+
+    WRITE_MODES = ("immediate", "buffered", "async", "transaction")
+    KEY_COLUMNS = ("date", "source", "name")
+    FACT_TABLES = ("bank", "stock", "crypto")
+    CLUSTERING_FIELDS = ("source", "name")
+    TOTALS_TABLE = "daily_totals"
+    TOTALS_VIEW = "total"
+    # Number of days before the report date searched for the latest date with data
+    SUMMARY_WINDOW_DAYS = 7
+
+    def __init__(
+        self,
+        credentials_path: str,
+        project_id: str,
+        schema_id: str,
+        location: str,
+        metadata_cache_path: str | None = None,
+        metadata_cache_ttl: int = 86400,
+        write_mode: str = "immediate",
+        buffer_max_rows: int = 10000,
+        max_pending_writes: int = 8,
+        query_budget_bytes: int | None = None,
+        skip_unchanged: bool = False,
+        snapshot_hashes_path: str | None = None,
+    ):
         self.credentials = service_account.Credentials.from_service_account_file(credentials_path)
 
         self.project_id = project_id
         self.schema_id = schema_id
         self.location = location
         self.logger = logging.getLogger(__name__)
+        self.metadata_cache = MetadataCache(metadata_cache_path, metadata_cache_ttl)
+        self._client = None
+        self.jobs = JobRecorder(query_budget_bytes)
+        self.snapshot_hashes = SnapshotHashes(self._dataset_id(), snapshot_hashes_path) if skip_unchanged else None
+
+        if write_mode not in self.WRITE_MODES:
+            raise ValueError(f"Unknown write mode: {write_mode}")
+        self.write_mode = write_mode
+        self.buffer_max_rows = buffer_max_rows
+        self._buffers: dict[str, list[DataFrame]] = {}
+        self._buffered_rows: dict[str, int] = {}
+
+        # Async writes: one worker per table keeps the writes of a table in order, while tables are
+        # written in parallel. The backlog bounds the number of queued DataFrames held in memory.
+        self._executors: dict[str, ThreadPoolExecutor] = {}
+        self._pending_writes: list[tuple[str, Future]] = []
+        self._backlog = threading.BoundedSemaphore(max_pending_writes)
+        # Metadata checks share the cache files, and every MERGE script also updates the daily totals
+        # table, so these steps are serialized across tables to avoid conflicting concurrent DML.
+        self._metadata_lock = threading.Lock()
+        self._script_lock = threading.Lock()
+
+        # Category names used as `source` in the daily totals, configured by setup_database
+        self.category_names = {"bank": "bank-accounts", "stock": "stocks", "crypto": "crypto"}
+
+    @property
+    def client(self) -> bigquery.Client:
+        """Get the BigQuery client, creating it on first use and reusing it afterwards."""
+        if self._client is None:
+            self._client = bigquery.Client(
+                credentials=self.credentials, project=self.project_id, location=self.location
+            )
+        return self._client
+
+    def run_statistics(self) -> dict:
+        """Get the cost and latency statistics of the BigQuery jobs run so far."""
+        jobs = self.jobs.summary()
+        self.logger.info(
+            f"BigQuery: {jobs['jobs']} jobs, {jobs['bytes_billed']} bytes billed, {jobs['slot_ms']} slot ms"
+        )
+        if self.snapshot_hashes:
+            jobs["unchanged"] = self.snapshot_hashes.statistics()
+        return jobs
+
+    def _run_query(
+        self,
+        operation: str,
+        sql: str,
+        job_config: bigquery.QueryJobConfig | None = None,
+        budgeted: bool = True,
+    ):
+        """Run a query job, wait for it to finish and record its cost and latency.
+
+        When a query budget is configured the query is dry-run first and refused when its estimate
+        exceeds the budget.
+
+        Args:
+            operation: Name of the operation the job belongs to, used in the run report
+            sql: SQL query or script to run
+            job_config: Optional query job configuration
+            budgeted: Whether the query budget applies, one-off maintenance jobs are exempt
+
+        Returns:
+            The finished QueryJob
+
+        """
+        with tracing.span("bigquery.query", operation=operation):
+            estimated_bytes = None
+            if budgeted and self.jobs.query_budget_bytes is not None:
+                dry_run_config = bigquery.QueryJobConfig(
+                    dry_run=True,
+                    use_query_cache=False,
+                    query_parameters=job_config.query_parameters if job_config else [],
+                )
+                estimated_bytes = self.jobs.check_budget(operation, self.client.query(sql, job_config=dry_run_config))
+
+            query_job = self.client.query(sql, job_config=job_config)
+            query_job.result()
+            self.jobs.record(operation, query_job, estimated_bytes)
+            return query_job
 
     def store_data(self, df: DataFrame, table_name: str):
         """Upsert data into BigQuery table based on unique combination of date, source, and name.
 
         If a record with the same date, source, and name exists, it will be updated.
-        Otherwise, a new record will be inserted.
+        Otherwise, a new record will be inserted. In buffered write mode the data is only
+        written when the buffer is flushed. The DataFrame is coerced to the table's dtypes first.
         """
         if df.empty:
             return
 
-        client = bigquery.Client(credentials=self.credentials, project=self.project_id, location=self.location)
+        df = schema.get(table_name).coerce(df)
 
-        # Ensure the dataset exists before creating tables
-        self._ensure_dataset_exists(client)
+        if self.write_mode in ("buffered", "transaction"):
+            self._buffers.setdefault(table_name, []).append(df)
+            self._buffered_rows[table_name] = self._buffered_rows.get(table_name, 0) + len(df)
+            # All tables of a transaction are written together, so its buffers are never flushed early
+            if self.write_mode == "buffered" and self._buffered_rows[table_name] >= self.buffer_max_rows:
+                self.logger.info(f"Buffer for `{table_name}` reached {self._buffered_rows[table_name]} rows, flushing")
+                self._flush_table(table_name)
+            return
 
-        # Check if the target table exists, create it if it doesn't
-        self._ensure_table_exists(client, table_name)
+        if self.write_mode == "async":
+            self._submit_write(df, table_name)
+            return
 
-        # First, upload the data to a temporary table
-        temp_table_name = f"{table_name}_temp_{int(datetime.now().timestamp())}"
-        temp_table_id = f"{self.project_id}.{self.schema_id}.{temp_table_name}"
+        self._write(df, table_name)
 
-        try:
-            # Upload data to temporary table
-            pandas_gbq.to_gbq(
-                df,
-                destination_table=temp_table_id,
-                if_exists="replace",
-                project_id=self.project_id,
-                credentials=self.credentials,
-                table_schema=self.get_table_schema(table_name),
-                progress_bar=False,
-                location=self.location,
+    def _submit_write(self, df: DataFrame, table_name: str):
+        """Queue a write in the background, blocking only while the backlog is full."""
+        self._backlog.acquire()
+        if table_name not in self._executors:
+            self._executors[table_name] = ThreadPoolExecutor(max_workers=1, thread_name_prefix=f"bigquery-{table_name}")
+
+        future = self._executors[table_name].submit(self._write, df.copy(), table_name)
+        future.add_done_callback(lambda _: self._backlog.release())
+        self._pending_writes.append((table_name, future))
+
+    def flush(self):
+        """Write all buffered DataFrames, with one upload and MERGE per table, and wait for queued writes.
+
+        Every table is attempted, even when writing an earlier one fails. Failed tables are
+        reported together in a single StorageError.
+        """
+        if self.write_mode == "transaction":
+            self._flush_transaction()
+            return
+
+        failed_tables = []
+        for table_name in list(self._buffers):
+            try:
+                self._flush_table(table_name)
+            except Exception:
+                self.logger.exception(f"Failed to flush buffered data for `{table_name}`")
+                failed_tables.append(table_name)
+
+        pending_writes, self._pending_writes = self._pending_writes, []
+        for table_name, future in pending_writes:
+            try:
+                future.result()
+            except Exception:
+                self.logger.exception(f"Failed to write queued data for `{table_name}`")
+                if table_name not in failed_tables:
+                    failed_tables.append(table_name)
+
+        if failed_tables:
+            raise StorageError(f"Failed to write data for tables: {', '.join(failed_tables)}")
+
+    def close(self):
+        """Wait for the queued writes, stop the background writers and close the client.
+
+        Errors of the queued writes are reported by ``flush``, not here.
+        """
+        executors, self._executors = self._executors, {}
+        for executor in executors.values():
+            executor.shutdown(wait=True)
+        self._pending_writes = []
+
+        if self._client is not None:
+            self._client.close()
+            self._client = None
+
+    def _flush_transaction(self):
+        """Combine the buffered DataFrames of every table and write them in a single transaction."""
+        table_names = list(self._buffers)
+        frames = {}
+        for table_name in table_names:
+            df = concat(self._buffers.pop(table_name), ignore_index=True).drop_duplicates(
+                subset=list(self.KEY_COLUMNS), keep="last"
             )
+            # Concatenating categoricals with different categories falls back to object columns
+            frames[table_name] = schema.get(table_name).coerce(df)
+            self._buffered_rows.pop(table_name, None)
+
+        if not frames:
+            return
+
+        self.logger.info(f"Writing {sum(len(df) for df in frames.values())} buffered rows in a single transaction")
+        try:
+            self._write_transaction(frames)
+        except Exception as e:
+            self.logger.exception("Failed to write the transaction")
+            raise StorageError(f"Failed to write data for tables: {', '.join(table_names)}") from e
+
+    def _flush_table(self, table_name: str):
+        """Combine and write the buffered DataFrames of a single table."""
+        frames = self._buffers.pop(table_name, [])
+        rows = self._buffered_rows.pop(table_name, 0)
+        if not frames:
+            return
+
+        # Later writes for the same key win, like they would with sequential upserts. MERGE also
+        # requires every target row to match at most one source row.
+        df = concat(frames, ignore_index=True).drop_duplicates(subset=list(self.KEY_COLUMNS), keep="last")
+        # Concatenating categoricals with different categories falls back to object columns
+        df = schema.get(table_name).coerce(df)
+        self.logger.info(f"Writing {len(df)} buffered rows ({rows} received) to `{table_name}`")
+        self._write(df, table_name)
+
+    def _write(self, df: DataFrame, table_name: str):
+        """Upsert a DataFrame into the target table through a temporary table and a MERGE.
 
-            # Perform upsert using MERGE statement
-            merge_query = self._build_merge_query(table_name, temp_table_name)
-            query_job = client.query(merge_query)
-            query_job.result()  # Wait for the query to complete
+        The daily totals of the written dates are refreshed in the same script job. When unchanged
+        rows are skipped, only rows that differ from the last written snapshot are uploaded, and
+        nothing is written when no row changed.
+        """
+        with self._metadata_lock:
+            df, pending_hashes = self._prepare_write(df, table_name)
+        if df.empty:
+            return
+
+        client = self.client
+        temp_table_name = self._temp_table_name(table_name)
+
+        try:
+            script = self._stage_write(client, df, table_name, temp_table_name)
+            with self._script_lock:
+                self._run_query(f"merge_{table_name}", script)
+            if self.snapshot_hashes:
+                with self._metadata_lock:
+                    self.snapshot_hashes.commit(pending_hashes)
+
+        except Exception:
+            # The tables may have been dropped behind our back, verify them again on the next write
+            self._invalidate_written_objects([table_name])
+            raise
 
         finally:
             # Clean up temporary table
             with contextlib.suppress(Exception):
-                client.delete_table(temp_table_id)
+                client.delete_table(self._table_id(temp_table_name))
+
+    def _invalidate_written_objects(self, table_names: list[str]):
+        """Forget the verified tables and view a failed write script touched.
+
+        Besides the target tables, the script refreshes the daily totals table that the totals
+        view reads from, so all of them are checked again on the next write.
+        """
+        with self._metadata_lock:
+            for table_name in [*table_names, self.TOTALS_TABLE]:
+                self.metadata_cache.invalidate(MetadataCache.TABLE, self._table_id(table_name))
+            self.metadata_cache.invalidate(MetadataCache.VIEW, self._table_id(self.TOTALS_VIEW))
+
+    def _write_transaction(self, frames: dict[str, DataFrame]):
+        """Upsert the DataFrames of several tables in a single multi-statement transaction.
+
+        Every table is uploaded to its own temporary table first, after which one script merges all
+        of them and refreshes the daily totals between BEGIN TRANSACTION and COMMIT TRANSACTION. Either
+        all tables are updated or, when any statement fails, none of them.
+        """
+        client = self.client
+        staged: dict[str, tuple[str, dict]] = {}
+        statements = []
+
+        try:
+            for table_name, df in frames.items():
+                with self._metadata_lock:
+                    changed_df, pending_hashes = self._prepare_write(df, table_name)
+                if changed_df.empty:
+                    continue
+
+                temp_table_name = self._temp_table_name(table_name)
+                staged[table_name] = (temp_table_name, pending_hashes)
+                statements.append(self._stage_write(client, changed_df, table_name, temp_table_name))
+
+            if not statements:
+                return
+
+            script = f"""
+            BEGIN
+              BEGIN TRANSACTION;
+              {"".join(statements)}
+              COMMIT TRANSACTION;
+            EXCEPTION WHEN ERROR THEN
+              ROLLBACK TRANSACTION;
+              RAISE USING MESSAGE = @@error.message;
+            END;
+            """
+            with self._script_lock:
+                self._run_query("merge_transaction", script)
+            if self.snapshot_hashes:
+                with self._metadata_lock:
+                    for _, pending_hashes in staged.values():
+                        self.snapshot_hashes.commit(pending_hashes)
+
+        except Exception:
+            self._invalidate_written_objects(list(frames))
+            raise
+
+        finally:
+            for temp_table_name, _ in staged.values():
+                with contextlib.suppress(Exception):
+                    client.delete_table(self._table_id(temp_table_name))
+
+    def _prepare_write(self, df: DataFrame, table_name: str) -> tuple[DataFrame, dict]:
+        """Drop unchanged rows and ensure the dataset and tables of a write exist.
+
+        Must be called while holding the metadata lock.
+
+        Returns:
+            Tuple of the rows to write and the snapshot hashes to commit once they have been written
+
+        """
+        pending_hashes = {}
+        if self.snapshot_hashes:
+            df, pending_hashes = self.snapshot_hashes.changed_rows(df, table_name)
+            if df.empty:
+                self.logger.info(f"No changes for `{table_name}`, skipping write")
+                return df, pending_hashes
+
+        # Ensure the dataset and tables exist, all are answered from the metadata cache when possible
+        client = self.client
+        self._ensure_dataset_exists(client)
+        self._ensure_table_exists(client, table_name)
+        self._ensure_totals_table(client)
+        return df, pending_hashes
+
+    @staticmethod
+    def _temp_table_name(table_name: str) -> str:
+        return f"{table_name}_temp_{int(datetime.now().timestamp())}"
+
+    def _stage_write(self, client: bigquery.Client, df: DataFrame, table_name: str, temp_table_name: str) -> str:
+        """Upload a DataFrame to a temporary table and build the statements that merge it.
+
+        Returns:
+            The MERGE into the target table followed by the refresh of the affected daily totals
+
+        """
+        columns = self._load_to_temp_table(client, df, table_name, self._table_id(temp_table_name))
+
+        dates = df["date"].unique()
+        merge_query = self._build_merge_query(table_name, temp_table_name, columns, dates)
+        totals_query = self._build_totals_refresh_query(table_name, dates)
+        return f"{merge_query};\n{totals_query};\n"
+
+    def _load_to_temp_table(self, client: bigquery.Client, df: DataFrame, table_name: str, temp_table_id: str):
+        """Upload a DataFrame to a temporary table with a load job from an in-memory Parquet buffer.
+
+        The DataFrame must already be coerced to the table's dtypes, which store_data and the
+        buffer flushes do, so it is converted to an Arrow table with the explicit target schema
+        without another copy or type inference.
+
+        Returns:
+            List of the uploaded column names
+
+        """
+        table_schema = schema.get(table_name)
+        columns = list(df.columns)
+        schema_fields = [field for field in bigquery_schema(table_name) if field.name in columns]
+        arrow_schema = pa.schema([table_schema.arrow_schema.field(column) for column in columns])
+        arrow_table = pa.Table.from_pandas(df, schema=arrow_schema, preserve_index=False)
+
+        sink = pa.BufferOutputStream()
+        pq.write_table(arrow_table, sink)
+        buffer = sink.getvalue()
+
+        job_config = bigquery.LoadJobConfig(
+            source_format=bigquery.SourceFormat.PARQUET,
+            schema=schema_fields,
+            write_disposition=bigquery.WriteDisposition.WRITE_TRUNCATE,
+        )
+        # Passing the size makes the client upload the buffer in a single request instead of a resumable upload
+        with tracing.span("bigquery.load", table=table_name, rows=len(df), bytes=buffer.size):
+            load_job = client.load_table_from_file(
+                pa.BufferReader(buffer), temp_table_id, size=buffer.size, job_config=job_config
+            )
+            load_job.result()
+        self.jobs.record(f"load_{table_name}", load_job)
+
+        return columns
+
+    def _dataset_id(self) -> str:
+        return f"{self.project_id}.{self.schema_id}"
+
+    def _table_id(self, table_name: str) -> str:
+        return f"{self.project_id}.{self.schema_id}.{table_name}"
 
     def _ensure_dataset_exists(self, client: bigquery.Client):
         """Check if the dataset exists, and create it if it doesn't."""
-        dataset_id = f"{self.project_id}.{self.schema_id}"
+        dataset_id = self._dataset_id()
+        if self.metadata_cache.is_verified(MetadataCache.DATASET, dataset_id):
+            return
 
         try:
             # Try to get the dataset - this will raise NotFound if it doesn't exist
@@ -81,104 +472,150 @@ class BigQueryConnector(Connector):
             client.create_dataset(dataset, exists_ok=True)
             self.logger.info(f"Dataset `{dataset_id}` created successfully")
 
+        self.metadata_cache.mark_verified(MetadataCache.DATASET, dataset_id)
+
     def _ensure_table_exists(self, client: bigquery.Client, table_name: str):
         """Check if the table exists, and create it if it doesn't."""
-        table_id = f"{self.project_id}.{self.schema_id}.{table_name}"
+        table_id = self._table_id(table_name)
+        if self.metadata_cache.is_verified(MetadataCache.TABLE, table_id):
+            return
 
         try:
             # Try to get the table - this will raise NotFound if it doesn't exist
-            client.get_table(table_id)
-            # Table exists, no need to log
+            table = client.get_table(table_id)
         except Exception:
             # Table doesn't exist, create it
             self._create_table(client, table_name)
+        else:
+            # Tables created before date partitioning was introduced are only migrated on request,
+            # as the migration replaces the table
+            if table_name in self.FACT_TABLES and not self._is_date_partitioned(table):
+                self.logger.warning(
+                    f"Table `{table_id}` is not partitioned by date, so queries scan the whole table. "
+                    "Run `finance-dashboard --migrate-partitioning` to migrate it"
+                )
+
+        self.metadata_cache.mark_verified(MetadataCache.TABLE, table_id)
 
     def _create_table(self, client: bigquery.Client, table_name: str):
-        """Create a BigQuery table with the appropriate schema."""
+        """Create a BigQuery table with the appropriate schema.
+
+        Fact tables are partitioned by day on `date`, so queries filtering on a date only scan the
+        matching partitions, and clustered on the upsert key within each partition.
+        """
         table_id = f"{self.project_id}.{self.schema_id}.{table_name}"
         schema_fields = self._get_bigquery_schema(table_name)
 
         self.logger.info(f"Table `{table_id}` does not exist, creating it now")
         table = bigquery.Table(table_id, schema=schema_fields)
 
-        # Set table clustering for better performance
-        if table_name in ["bank", "stock", "crypto"]:
-            table.clustering_fields = ["date", "source"]
+        if table_name in self.FACT_TABLES:
+            table.time_partitioning = bigquery.TimePartitioning(type_=bigquery.TimePartitioningType.DAY, field="date")
+            table.clustering_fields = list(self.CLUSTERING_FIELDS)
+        elif table_name == self.TOTALS_TABLE:
+            table.time_partitioning = bigquery.TimePartitioning(type_=bigquery.TimePartitioningType.DAY, field="date")
+            table.clustering_fields = ["source"]
 
         client.create_table(table)
+        if self.snapshot_hashes:
+            # Rows hashed before the table was (re)created are no longer in it
+            self.snapshot_hashes.invalidate(table_name)
         self.logger.info(f"Table `{table_id}` created successfully")
 
+    @staticmethod
+    def _is_date_partitioned(table: bigquery.Table) -> bool:
+        """Check whether a table is partitioned on its `date` column."""
+        return table.time_partitioning is not None and table.time_partitioning.field == "date"
+
+    def _migrate_to_partitioned_table(self, client: bigquery.Client, table_name: str):
+        """Recreate an existing table as a date-partitioned table, keeping all rows.
+
+        BigQuery can't change the partitioning of an existing table, so the rows are copied into a
+        new partitioned table which then replaces the original one. The copy is made first, so the
+        original table is left untouched when it fails. The replacement is not atomic: when the
+        rename fails after the original table was dropped, the rows are in `<table>_partitioned`.
+        """
+        table_id = self._table_id(table_name)
+        partitioned_table_name = f"{table_name}_partitioned"
+        partitioned_table_id = self._table_id(partitioned_table_name)
+        clustering = ", ".join(self.CLUSTERING_FIELDS)
+
+        self.logger.info(f"Table `{table_id}` is not partitioned by date, migrating it now")
+        migrate_sql = f"""
+        CREATE OR REPLACE TABLE `{partitioned_table_id}`
+        PARTITION BY date
+        CLUSTER BY {clustering}
+        AS SELECT * FROM `{table_id}`;
+
+        DROP TABLE `{table_id}`;
+
+        ALTER TABLE `{partitioned_table_id}` RENAME TO `{table_name}`;
+        """
+        self._run_query(f"migrate_{table_name}", migrate_sql, budgeted=False)
+        self.logger.info(f"Table `{table_id}` migrated to a date-partitioned table")
+
+    def migrate_to_partitioned_tables(self):
+        """Migrate all fact tables that are not yet partitioned by date.
+
+        Tables that are already partitioned are left as they are. Nothing else may write to the
+        tables while they are migrated.
+        """
+        client = self.client
+
+        for table_name in self.FACT_TABLES:
+            table = client.get_table(self._table_id(table_name))
+            if not self._is_date_partitioned(table):
+                self._migrate_to_partitioned_table(client, table_name)
+
     def _get_bigquery_schema(self, table_name: str):
-        """Convert the schema dictionary to BigQuery schema fields."""
-        schema_dict = self.get_table_schema(table_name)
-        schema_fields = []
-
-        for field in schema_dict:
-            field_type = field["type"]
-            field_mode = field.get("mode", "NULLABLE")
-
-            # Convert pandas_gbq types to BigQuery types
-            if field_type.upper() in ["STRING"]:
-                bq_type = "STRING"
-            elif field_type.upper() in ["FLOAT", "FLOAT64"]:
-                bq_type = "FLOAT64"
-            elif field_type.upper() in ["INTEGER", "INT64"]:
-                bq_type = "INTEGER"
-            elif field_type.upper() == "DATE":
-                bq_type = "DATE"
-            elif field_type.upper() == "DATETIME":
-                bq_type = "DATETIME"
-            elif field_type.upper() == "BOOLEAN":
-                bq_type = "BOOLEAN"
-            else:
-                bq_type = "STRING"  # Default fallback
-
-            schema_fields.append(bigquery.SchemaField(field["name"], bq_type, mode=field_mode))
-
-        return schema_fields
+        """Get the BigQuery schema fields of a table."""
+        return list(bigquery_schema(table_name))
 
     @staticmethod
     def get_table_schema(table_name: str):
         """Get schema definition for a given table name."""
-        if table_name == "bank":
-            return schema.bank()
-        elif table_name == "stock":
-            return schema.stock()
-        elif table_name == "crypto":
-            return schema.crypto()
-        else:
-            raise ValueError(f"Unknown table name: {table_name}")
+        return schema.get(table_name).as_dicts()
 
     def dataset_exists(self) -> bool:
         """Check if the dataset exists."""
-        client = bigquery.Client(credentials=self.credentials, project=self.project_id, location=self.location)
-        dataset_id = f"{self.project_id}.{self.schema_id}"
-        try:
-            client.get_dataset(dataset_id)
+        dataset_id = self._dataset_id()
+        if self.metadata_cache.is_verified(MetadataCache.DATASET, dataset_id):
             return True
+
+        try:
+            self.client.get_dataset(dataset_id)
         except Exception:
             return False
 
-    def table_exists(self, table_name: str) -> bool:
+        self.metadata_cache.mark_verified(MetadataCache.DATASET, dataset_id)
+        return True
+
+    def table_exists(self, table_name: str, kind: str = MetadataCache.TABLE) -> bool:
         """Check if a table exists."""
-        client = bigquery.Client(credentials=self.credentials, project=self.project_id, location=self.location)
-        table_id = f"{self.project_id}.{self.schema_id}.{table_name}"
-        try:
-            client.get_table(table_id)
+        table_id = self._table_id(table_name)
+        if self.metadata_cache.is_verified(kind, table_id):
             return True
+
+        try:
+            self.client.get_table(table_id)
         except Exception:
             return False
 
+        self.metadata_cache.mark_verified(kind, table_id)
+        return True
+
     def view_exists(self, view_name: str) -> bool:
         """Check if a view exists."""
-        return self.table_exists(view_name)  # Views are treated as tables in BigQuery API
+        return self.table_exists(view_name, MetadataCache.VIEW)  # Views are treated as tables in BigQuery API
 
     def setup_database(self, account_name: str, stock_name: str, crypto_name: str):
         """Set up the database schema (dataset, tables, and view) if they don't exist.
 
         This should be called once at startup to ensure the database structure is in place.
+        Objects recorded in the metadata cache are not checked again until their entry expires.
         """
-        client = bigquery.Client(credentials=self.credentials, project=self.project_id, location=self.location)
+        client = self.client
+        self.category_names = {"bank": account_name, "stock": stock_name, "crypto": crypto_name}
 
         self.logger.info("Starting database setup check")
 
@@ -193,7 +630,10 @@ class BigQueryConnector(Connector):
         self.logger.info("Checking required tables (bank, stock, crypto)")
         self.ensure_all_tables_exist()
 
-        # 3. Ensure view exists
+        # 3. Ensure the daily totals table exists, it is filled from the tables above when it is created
+        self._ensure_totals_table(client)
+
+        # 4. Ensure view exists
         if not self.view_exists("total"):
             self.logger.info("Creating totals view")
             self.create_totals_view(account_name, stock_name, crypto_name)
@@ -202,17 +642,108 @@ class BigQueryConnector(Connector):
 
         self.logger.info("Database setup completed successfully")
 
+    def _ensure_totals_table(self, client: bigquery.Client):
+        """Check if the daily totals table exists, and create and fill it if it doesn't.
+
+        When the table is created, it is backfilled from the full history of the fact tables once
+        and the `total` view is redefined to read from it, replacing the view that aggregated the
+        fact tables on every read.
+        """
+        table_id = self._table_id(self.TOTALS_TABLE)
+        if self.metadata_cache.is_verified(MetadataCache.TABLE, table_id):
+            return
+
+        try:
+            client.get_table(table_id)
+        except Exception:
+            # The backfill reads all fact tables, so they have to exist first
+            for table_name in self.FACT_TABLES:
+                self._ensure_table_exists(client, table_name)
+
+            self._create_table(client, self.TOTALS_TABLE)
+            self._backfill_daily_totals(client)
+            self._replace_totals_view(client)
+
+        self.metadata_cache.mark_verified(MetadataCache.TABLE, table_id)
+
+    def _backfill_daily_totals(self, client: bigquery.Client):
+        """Fill the daily totals table from the full history of the fact tables."""
+        selects = [
+            f"""
+            SELECT
+                date,
+                '{self.category_names[table_name]}' AS source,
+                ROUND(SUM({schema.TOTAL_COLUMNS[table_name]}), 2) AS total_balance
+            FROM `{self._table_id(table_name)}`
+            GROUP BY date
+            """
+            for table_name in self.FACT_TABLES
+        ]
+
+        self.logger.info(f"Backfilling `{self._table_id(self.TOTALS_TABLE)}` from the full history")
+        backfill_sql = f"""
+        INSERT INTO `{self._table_id(self.TOTALS_TABLE)}` (date, source, total_balance)
+        {"UNION ALL".join(selects)}
+        """
+        self._run_query("backfill_daily_totals", backfill_sql, budgeted=False)
+
+    def _build_totals_refresh_query(self, table_name: str, dates: Iterable[date]) -> str:
+        """Build a MERGE that recalculates the daily totals of a fact table for the given dates only."""
+        partition_dates = ", ".join(sorted(f"DATE '{d:%Y-%m-%d}'" for d in dates))
+
+        return f"""
+        MERGE `{self._table_id(self.TOTALS_TABLE)}` AS target
+        USING (
+            SELECT
+                date,
+                '{self.category_names[table_name]}' AS source,
+                ROUND(SUM({schema.TOTAL_COLUMNS[table_name]}), 2) AS total_balance
+            FROM `{self._table_id(table_name)}`
+            WHERE date IN ({partition_dates})
+            GROUP BY date
+        ) AS source
+        ON target.date = source.date
+           AND target.date IN ({partition_dates})
+           AND target.source = source.source
+        WHEN MATCHED THEN
+          UPDATE SET total_balance = source.total_balance
+        WHEN NOT MATCHED THEN
+          INSERT (date, source, total_balance)
+          VALUES (source.date, source.source, source.total_balance)
+        """
+
+    def _totals_view_sql(self, create_statement: str) -> str:
+        return f"""
+        {create_statement} `{self._table_id(self.TOTALS_VIEW)}`
+        AS
+        SELECT
+            date,
+            total_balance,
+            source
+        FROM `{self._table_id(self.TOTALS_TABLE)}`
+        """
+
+    def _replace_totals_view(self, client: bigquery.Client):
+        """Redefine the `total` view to read from the daily totals table."""
+        view_id = self._table_id(self.TOTALS_VIEW)
+        self._run_query("replace_totals_view", self._totals_view_sql("CREATE OR REPLACE VIEW"))
+        self.metadata_cache.mark_verified(MetadataCache.VIEW, view_id)
+        self.logger.info(f"View `{view_id}` now reads from `{self._table_id(self.TOTALS_TABLE)}`")
+
     def create_totals_view(self, account_name: str, stock_name: str, crypto_name: str):
-        """Create a regular view that automatically calculates totals from bank, stock, and crypto tables.
+        """Create a regular view over the daily totals table.
 
-        This view will automatically reflect changes when the underlying tables are updated.
-        Regular views don't have the same restrictions as materialized views.
+        The view keeps the columns of the original totals view, so existing dashboards keep working,
+        while reads only touch the small daily totals table instead of the full fact tables.
         Only creates the view if it doesn't already exist.
         """
-        client = bigquery.Client(credentials=self.credentials, project=self.project_id, location=self.location)
+        client = self.client
+        self.category_names = {"bank": account_name, "stock": stock_name, "crypto": crypto_name}
 
-        # Ensure the dataset exists before creating the view
+        # Ensure the dataset and the daily totals table exist before creating the view. Creating the
+        # daily totals table also defines the view.
         self._ensure_dataset_exists(client)
+        self._ensure_totals_table(client)
 
         # Check if view already exists
         if self.view_exists("total"):
@@ -221,44 +752,16 @@ class BigQueryConnector(Connector):
         view_id = f"{self.project_id}.{self.schema_id}.total"
         self.logger.info(f"View `{view_id}` does not exist, creating it now")
 
-        # Create the regular view that unions all totals
-        # ruff: noqa: S608  # SQL injection is not a concern here as we control the values
-        create_view_sql = f"""
-        CREATE VIEW `{self.project_id}.{self.schema_id}.total`
-        AS
-        SELECT
-            date,
-            ROUND(SUM(balance), 2) AS total_balance,
-            '{account_name}' AS source
-        FROM `{self.project_id}.{self.schema_id}.bank`
-        GROUP BY date
-
-        UNION ALL
-
-        SELECT
-            date,
-            ROUND(SUM(portfolio_value), 2) AS total_balance,
-            '{stock_name}' AS source
-        FROM `{self.project_id}.{self.schema_id}.stock`
-        GROUP BY date
-
-        UNION ALL
-
-        SELECT
-            date,
-            ROUND(SUM(portfolio_value), 2) AS total_balance,
-            '{crypto_name}' AS source
-        FROM `{self.project_id}.{self.schema_id}.crypto`
-        GROUP BY date
-        """
+        # Create the regular view on top of the daily totals table
+        create_view_sql = self._totals_view_sql("CREATE VIEW")
 
         # Create the new view
-        query_job = client.query(create_view_sql)
-        query_job.result()
+        self._run_query("create_totals_view", create_view_sql)
+        self.metadata_cache.mark_verified(MetadataCache.VIEW, view_id)
         self.logger.info(f"View `{view_id}` created successfully")
 
     def get_totals(self, start_date: str | None = None, end_date: str | None = None):
-        """Query the totals view with optional date filtering.
+        """Query the daily totals table with optional date filtering.
 
         Args:
             start_date: Optional start date in 'YYYY-MM-DD' format
@@ -268,8 +771,6 @@ class BigQueryConnector(Connector):
             DataFrame with the totals data
 
         """
-        client = bigquery.Client(credentials=self.credentials, project=self.project_id, location=self.location)
-
         where_clause = ""
         query_parameters = []
 
@@ -294,33 +795,32 @@ class BigQueryConnector(Connector):
             date,
             source,
             total_balance
-        FROM `{self.project_id}.{self.schema_id}.total`
+        FROM `{self._table_id(self.TOTALS_TABLE)}`
         {where_clause}
         ORDER BY date DESC, source
         """
 
         job_config = bigquery.QueryJobConfig(query_parameters=query_parameters)
-        return client.query(query, job_config=job_config).to_dataframe()
+        return self._run_query("get_totals", query, job_config).to_dataframe()
 
-    def _build_merge_query(self, table_name: str, temp_table_name: str) -> str:
-        """Build a MERGE query for upsert operations based on the actual columns in the temp table.
+    def _build_merge_query(
+        self, table_name: str, temp_table_name: str, source_columns: Iterable[str], dates: Iterable[date]
+    ) -> str:
+        """Build a MERGE query for upsert operations based on the columns uploaded to the temp table.
 
         The unique key is the combination of date, source, and name.
-        Only uses columns that exist in both target and source tables.
+        Only uses columns that exist in both target and source tables. The source columns are the
+        columns of the uploaded DataFrame, so no metadata lookup of the temp table is needed.
+        The written dates are added as constants to the join condition, so only their partitions
+        of the target table are scanned.
         """
-        client = bigquery.Client(credentials=self.credentials, project=self.project_id, location=self.location)
-
-        # Get the actual columns from the temporary table
-        temp_table_id = f"{self.project_id}.{self.schema_id}.{temp_table_name}"
-        temp_table = client.get_table(temp_table_id)
-        source_columns = [field.name for field in temp_table.schema]
-
         # Get target table schema columns
-        target_schema = self.get_table_schema(table_name)
-        target_columns = [field["name"] for field in target_schema]
+        target_columns = schema.get(table_name).column_names
 
         # Only use columns that exist in both source and target
-        common_columns = [col for col in source_columns if col in target_columns]
+        source_columns = set(source_columns)
+        common_columns = [col for col in target_columns if col in source_columns]
+        partition_dates = ", ".join(sorted(f"DATE '{d:%Y-%m-%d}'" for d in dates))
 
         # Build column lists for the MERGE statement
         columns_list = ", ".join(common_columns)
@@ -335,6 +835,7 @@ class BigQueryConnector(Connector):
         MERGE `{self.project_id}.{self.schema_id}.{table_name}` AS target
         USING `{self.project_id}.{self.schema_id}.{temp_table_name}` AS source
         ON target.date = source.date
+           AND target.date IN ({partition_dates})
            AND target.source = source.source
            AND target.name = source.name
         WHEN MATCHED THEN
@@ -351,72 +852,91 @@ class BigQueryConnector(Connector):
 
         Creates them if they don't exist.
         """
-        client = bigquery.Client(credentials=self.credentials, project=self.project_id, location=self.location)
-        required_tables = ["bank", "stock", "crypto"]
-
-        for table_name in required_tables:
-            table_id = f"{self.project_id}.{self.schema_id}.{table_name}"
-            if self.table_exists(table_name):
-                self.logger.info(f"Table `{table_id}` already exists")
-            else:
-                self._ensure_table_exists(client, table_name)
+        client = self.client
+
+        for table_name in self.FACT_TABLES:
+            self._ensure_table_exists(client, table_name)
 
     def migrate_from_materialized_view(self):
         """Migrate from the old materialized view to the new regular view.
 
         This will drop the old materialized view if it exists.
         """
-        client = bigquery.Client(credentials=self.credentials, project=self.project_id, location=self.location)
-
         with contextlib.suppress(Exception):
             drop_materialized_view_sql = f"""
             DROP MATERIALIZED VIEW IF EXISTS `{self.project_id}.{self.schema_id}.total_materialized_view`
             """
-            query_job = client.query(drop_materialized_view_sql)
-            query_job.result()
+            self._run_query("drop_materialized_view", drop_materialized_view_sql)
 
-    def get_daily_summary(self):
-        """Get a summary of today's totals compared to yesterday's totals.
+    def get_category_totals(self, day: date) -> dict[str, float]:
+        """Get the total balance per category for a single date from the daily totals table.
+
+        Returns:
+            Mapping of category name to total balance, empty when there is no data for the date
+
+        """
+        query = f"""
+        SELECT
+            source,
+            SUM(total_balance) AS total_balance
+        FROM `{self._table_id(self.TOTALS_TABLE)}`
+        WHERE date = @day
+        GROUP BY source
+        """
+
+        job_config = bigquery.QueryJobConfig(query_parameters=[bigquery.ScalarQueryParameter("day", "DATE", day)])
+        rows = self._run_query("get_category_totals", query, job_config).result()
+        return {row["source"]: float(row["total_balance"]) for row in rows}
+
+    def get_daily_summary(self, report_date: date | None = None):
+        """Get a summary of the latest date with data compared to the day before.
+
+        The totals are read from the daily totals table. The latest date with data is searched for
+        in the SUMMARY_WINDOW_DAYS days up to the report date, which are passed as constant query
+        parameters, so only the partitions of that window are scanned.
+
+        Args:
+            report_date: Last date to report on, defaults to today
 
         Returns:
             dict with:
-                - total_today: Total balance today across all categories
-                - total_yesterday: Total balance yesterday
+                - total_today: Total balance on the latest date with data across all categories
+                - total_yesterday: Total balance the day before
                 - total_change: Change in total balance
                 - total_change_pct: Percentage change in total balance
                 - categories: List of dicts with per-category breakdown
                   - name: Category name (e.g., 'Bank', 'Stock', 'Crypto')
-                  - today: Balance today
-                  - yesterday: Balance yesterday
+                  - today: Balance on the latest date with data
+                  - yesterday: Balance the day before
                   - change: Change in balance
                   - change_pct: Percentage change
 
         """
-        client = bigquery.Client(credentials=self.credentials, project=self.project_id, location=self.location)
+        end_date = report_date or date.today()
 
-        # Query to get today's and yesterday's totals per category
+        # Query to get the totals per category of the latest date with data and the day before
         query = f"""
         WITH dates AS (
             SELECT
                 MAX(date) AS today,
                 DATE_SUB(MAX(date), INTERVAL 1 DAY) AS yesterday
-            FROM `{self.project_id}.{self.schema_id}.total`
+            FROM `{self._table_id(self.TOTALS_TABLE)}`
+            WHERE date > @start_date AND date <= @end_date
         ),
-        today_data AS (
+        daily AS (
             SELECT
+                date,
                 source,
                 SUM(total_balance) AS balance
-            FROM `{self.project_id}.{self.schema_id}.total`
-            WHERE date = (SELECT today FROM dates)
-            GROUP BY source
+            FROM `{self._table_id(self.TOTALS_TABLE)}`
+            WHERE date BETWEEN @start_date AND @end_date
+            GROUP BY date, source
+        ),
+        today_data AS (
+            SELECT source, balance FROM daily WHERE date = (SELECT today FROM dates)
         ),
         yesterday_data AS (
-            SELECT
-                source,
-                SUM(total_balance) AS balance
-            FROM `{self.project_id}.{self.schema_id}.total`
-            WHERE date = (SELECT yesterday FROM dates)
-            GROUP BY source
+            SELECT source, balance FROM daily WHERE date = (SELECT yesterday FROM dates)
         )
         SELECT
             COALESCE(t.source, y.source) AS source,
@@ -433,7 +953,15 @@ class BigQueryConnector(Connector):
         ORDER BY source
         """
 
-        df = client.query(query).to_dataframe()
+        job_config = bigquery.QueryJobConfig(
+            query_parameters=[
+                bigquery.ScalarQueryParameter(
+                    "start_date", "DATE", end_date - timedelta(days=self.SUMMARY_WINDOW_DAYS)
+                ),
+                bigquery.ScalarQueryParameter("end_date", "DATE", end_date),
+            ]
+        )
+        df = self._run_query("get_daily_summary", query, job_config).to_dataframe()
 
         if df.empty:
             return None
@@ -0,0 +1,117 @@
+import logging
+from dataclasses import asdict, dataclass
+
+from finance_dashboard.exceptions import QueryBudgetExceededError
+
+
+@dataclass
+class JobStats:
+    """Cost and latency statistics of a single finished BigQuery job."""
+
+    operation: str
+    job_id: str
+    job_type: str
+    bytes_processed: int = 0
+    bytes_billed: int = 0
+    slot_ms: int = 0
+    queue_ms: float = 0.0
+    run_ms: float = 0.0
+    cache_hit: bool = False
+    estimated_bytes: int | None = None
+
+
+class JobRecorder:
+    """Records statistics of every BigQuery job and guards queries with an optional byte budget.
+
+    When a budget is configured, every query is dry-run first and refused when it would process
+    more bytes than the budget allows.
+    """
+
+    def __init__(self, query_budget_bytes: int | None = None):
+        self.query_budget_bytes = query_budget_bytes
+        self.logger = logging.getLogger(__name__)
+        self.jobs: list[JobStats] = []
+
+    def check_budget(self, operation: str, dry_run_job) -> int:
+        """Compare the estimate of a dry-run job against the budget.
+
+        Returns:
+            Estimated number of bytes processed
+
+        Raises:
+            QueryBudgetExceededError: When the estimate exceeds the budget
+
+        """
+        estimated_bytes = dry_run_job.total_bytes_processed or 0
+        if self.query_budget_bytes is not None and estimated_bytes > self.query_budget_bytes:
+            raise QueryBudgetExceededError(
+                f"Query for {operation} would process {estimated_bytes} bytes, "
+                f"which exceeds the budget of {self.query_budget_bytes} bytes"
+            )
+        return estimated_bytes
+
+    def record(self, operation: str, job, estimated_bytes: int | None = None) -> JobStats:
+        """Record the statistics of a finished job."""
+        stats = JobStats(
+            operation=operation,
+            job_id=job.job_id,
+            job_type=job.job_type,
+            bytes_processed=getattr(job, "total_bytes_processed", None) or 0,
+            bytes_billed=getattr(job, "total_bytes_billed", None) or 0,
+            slot_ms=getattr(job, "slot_millis", None) or 0,
+            queue_ms=self._elapsed_ms(job.created, job.started),
+            run_ms=self._elapsed_ms(job.started, job.ended),
+            cache_hit=bool(getattr(job, "cache_hit", False)),
+            estimated_bytes=estimated_bytes,
+        )
+        self.jobs.append(stats)
+
+        self.logger.debug(
+            f"BigQuery {stats.job_type} job for {operation}: {stats.bytes_billed} bytes billed, "
+            f"{stats.slot_ms} slot ms, queued {stats.queue_ms:.0f} ms, ran {stats.run_ms:.0f} ms"
+            f"{' (cached)' if stats.cache_hit else ''}"
+        )
+        return stats
+
+    @staticmethod
+    def _elapsed_ms(start, end) -> float:
+        if start is None or end is None:
+            return 0.0
+        return (end - start).total_seconds() * 1000
+
+    def summary(self) -> dict:
+        """Aggregate the recorded jobs per operation.
+
+        Returns:
+            dict with the totals over all jobs, the totals per operation and the individual jobs
+
+        """
+        operations: dict[str, dict] = {}
+        for stats in self.jobs:
+            totals = operations.setdefault(
+                stats.operation,
+                {
+                    "jobs": 0,
+                    "bytes_processed": 0,
+                    "bytes_billed": 0,
+                    "slot_ms": 0,
+                    "queue_ms": 0.0,
+                    "run_ms": 0.0,
+                    "cache_hits": 0,
+                },
+            )
+            totals["jobs"] += 1
+            totals["bytes_processed"] += stats.bytes_processed
+            totals["bytes_billed"] += stats.bytes_billed
+            totals["slot_ms"] += stats.slot_ms
+            totals["queue_ms"] += stats.queue_ms
+            totals["run_ms"] += stats.run_ms
+            totals["cache_hits"] += int(stats.cache_hit)
+
+        return {
+            "jobs": len(self.jobs),
+            "bytes_billed": sum(stats.bytes_billed for stats in self.jobs),
+            "slot_ms": sum(stats.slot_ms for stats in self.jobs),
+            "operations": operations,
+            "details": [asdict(stats) for stats in self.jobs],
+        }
@@ -0,0 +1,71 @@
+import json
+import logging
+import time
+from pathlib import Path
+
+
+class MetadataCache:
+    """Remembers which datasets, tables and views are known to exist.
+
+    Entries are kept in memory for the current run and optionally persisted to a JSON file, so that
+    subsequent runs can skip the metadata round trips until the entry is older than the TTL.
+    """
+
+    DATASET = "dataset"
+    TABLE = "table"
+    VIEW = "view"
+
+    def __init__(self, path: str | None = None, ttl: int = 86400):
+        self.path = Path(path) if path else None
+        self.ttl = ttl
+        self.logger = logging.getLogger(__name__)
+        self._entries: dict[str, float] = {}
+        self._load()
+
+    @staticmethod
+    def _key(kind: str, object_id: str) -> str:
+        return f"{kind}:{object_id}"
+
+    def _load(self):
+        """Load persisted entries that are still within the TTL."""
+        if not self.path or not self.path.is_file():
+            return
+
+        try:
+            with self.path.open(encoding="utf-8") as f:
+                entries = json.load(f)
+        except Exception as e:
+            self.logger.warning(f"Could not read metadata cache `{self.path}`: {e}")
+            return
+
+        now = time.time()
+        self._entries = {key: verified_at for key, verified_at in entries.items() if now - verified_at < self.ttl}
+
+    def save(self):
+        """Persist the current entries, replacing the cache file atomically."""
+        if not self.path:
+            return
+
+        try:
+            self.path.parent.mkdir(parents=True, exist_ok=True)
+            temp_path = self.path.with_suffix(f"{self.path.suffix}.tmp")
+            with temp_path.open("w", encoding="utf-8") as f:
+                json.dump(self._entries, f, indent=2, sort_keys=True)
+            temp_path.replace(self.path)
+        except Exception as e:
+            self.logger.warning(f"Could not write metadata cache `{self.path}`: {e}")
+
+    def is_verified(self, kind: str, object_id: str) -> bool:
+        """Check whether an object has been verified to exist within the TTL."""
+        verified_at = self._entries.get(self._key(kind, object_id))
+        return verified_at is not None and time.time() - verified_at < self.ttl
+
+    def mark_verified(self, kind: str, object_id: str):
+        """Record that an object exists."""
+        self._entries[self._key(kind, object_id)] = time.time()
+        self.save()
+
+    def invalidate(self, kind: str, object_id: str):
+        """Forget an object, so that its existence is checked again on next use."""
+        if self._entries.pop(self._key(kind, object_id), None) is not None:
+            self.save()
@@ -0,0 +1,115 @@
+import json
+import logging
+from datetime import date, timedelta
+from pathlib import Path
+
+from pandas import DataFrame
+from pandas.util import hash_pandas_object
+
+
+class SnapshotHashes:
+    """Remembers content hashes of the rows last written per destination, table, date and source.
+
+    For every (destination, table, date, source) the hash of each written row is kept by name. The
+    destination identifies the database, like the BigQuery dataset, so connectors writing to other
+    databases with the same file don't skip each other's rows. A DataFrame that is about to be
+    written is reduced to the rows whose hash differs from the last written one, so unchanged
+    snapshots, like cold wallets or positions on weekends, don't need an upload and MERGE. New
+    hashes are only committed once the write succeeded.
+    """
+
+    def __init__(self, destination: str, path: str | None = None, retention_days: int = 7):
+        self.destination = destination
+        self.path = Path(path) if path else None
+        self.retention_days = retention_days
+        self.logger = logging.getLogger(__name__)
+        self._hashes: dict[str, dict[str, str]] = {}
+        self.skipped_rows = 0
+        self.skipped_writes = 0
+        self._load()
+
+    def _key(self, table_name: str, day, source: str) -> str:
+        return f"{self.destination}|{table_name}|{day}|{source}"
+
+    @staticmethod
+    def _day(key: str) -> str:
+        return key.split("|")[2]
+
+    def _load(self):
+        if not self.path or not self.path.is_file():
+            return
+
+        try:
+            with self.path.open(encoding="utf-8") as f:
+                hashes = json.load(f)
+        except Exception as e:
+            self.logger.warning(f"Could not read snapshot hashes `{self.path}`: {e}")
+            return
+
+        # Hashes without a destination were written by an earlier version and are not trusted
+        self._hashes = {key: value for key, value in hashes.items() if key.count("|") == 3}
+
+    def _save(self):
+        """Persist the hashes of the retention period, replacing the file atomically."""
+        oldest = (date.today() - timedelta(days=self.retention_days)).isoformat()
+        self._hashes = {key: hashes for key, hashes in self._hashes.items() if self._day(key) >= oldest}
+
+        if not self.path:
+            return
+
+        try:
+            self.path.parent.mkdir(parents=True, exist_ok=True)
+            temp_path = self.path.with_suffix(f"{self.path.suffix}.tmp")
+            with temp_path.open("w", encoding="utf-8") as f:
+                json.dump(self._hashes, f, sort_keys=True)
+            temp_path.replace(self.path)
+        except Exception as e:
+            self.logger.warning(f"Could not write snapshot hashes `{self.path}`: {e}")
+
+    def changed_rows(self, df: DataFrame, table_name: str) -> tuple[DataFrame, dict[str, dict[str, str]]]:
+        """Reduce a DataFrame to the rows that differ from the last written snapshot.
+
+        Returns:
+            Tuple of the changed rows and the hashes to commit once they have been written
+
+        """
+        columns = [column for column in df.columns if column != "date"]
+        row_hashes = hash_pandas_object(df[columns], index=False).map("{:016x}".format)
+
+        changed = []
+        pending: dict[str, dict[str, str]] = {}
+        for day, source, name, row_hash in zip(df["date"], df["source"], df["name"], row_hashes, strict=True):
+            key = self._key(table_name, day, source)
+            is_changed = self._hashes.get(key, {}).get(name) != row_hash
+            changed.append(is_changed)
+            if is_changed:
+                pending.setdefault(key, {})[name] = row_hash
+
+        changed_df = df[changed]
+        skipped = len(df) - len(changed_df)
+        self.skipped_rows += skipped
+        if changed_df.empty:
+            self.skipped_writes += 1
+        if skipped:
+            self.logger.info(f"Skipping {skipped} unchanged rows of {len(df)} for `{table_name}`")
+
+        return changed_df, pending
+
+    def commit(self, pending: dict[str, dict[str, str]]):
+        """Record the hashes of rows that have been written."""
+        if not pending:
+            return
+
+        for key, hashes in pending.items():
+            self._hashes.setdefault(key, {}).update(hashes)
+        self._save()
+
+    def invalidate(self, table_name: str):
+        """Forget all hashes of a table, so that its next write is not skipped."""
+        prefix = f"{self.destination}|{table_name}|"
+        self._hashes = {key: hashes for key, hashes in self._hashes.items() if not key.startswith(prefix)}
+        self._save()
+
+    def statistics(self) -> dict:
+        """Get the number of skipped rows and writes."""
+        return {"skipped_rows": self.skipped_rows, "skipped_writes": self.skipped_writes}
@@ -0,0 +1,135 @@
+import contextlib
+import logging
+import os
+import time
+from pathlib import Path
+
+import pyarrow as pa
+import pyarrow.parquet as pq
+from pandas import DataFrame, concat
+
+from finance_dashboard import schema, tracing
+from finance_dashboard.connector import Connector
+from finance_dashboard.exceptions import StorageError
+
+
+class SpoolingConnector(Connector):
+    """Connector wrapper that makes stored data durable locally before it is written to the database.
+
+    Every DataFrame is written to a zstd compressed Parquet file in the spool directory and fsynced
+    before ``store_data`` returns, so collection doesn't wait for the database and no snapshot is
+    lost when the database is slow or unreachable. On ``flush`` all spooled files of a table,
+    including files left behind by earlier runs, are replayed into the wrapped connector in one
+    batch and removed once the write succeeded. Replaying is idempotent, as the connectors upsert
+    on (date, source, name).
+    """
+
+    KEY_COLUMNS = ("date", "source", "name")
+
+    def __init__(self, connector: Connector, spool_path: str = ".cache/spool"):
+        self.connector = connector
+        self.spool_path = Path(spool_path)
+        self.logger = logging.getLogger(__name__)
+        self._sequence = 0
+        self._spooled_batches = 0
+        self._replayed_rows = 0
+
+    def store_data(self, df: DataFrame, table_name: str):
+        """Append a DataFrame to the spool of a table, returning once it is safely on disk."""
+        if df.empty:
+            return
+
+        table_schema = schema.get(table_name)
+        df = table_schema.coerce(df)
+        arrow_schema = pa.schema([table_schema.arrow_schema.field(column) for column in df.columns])
+
+        table_path = self.spool_path / table_name
+        table_path.mkdir(parents=True, exist_ok=True)
+
+        # File names sort in the order the batches were stored, which is the order they are replayed in
+        self._sequence += 1
+        file_path = table_path / f"{time.time_ns()}_{self._sequence:06d}.parquet"
+        temp_path = file_path.with_suffix(".tmp")
+
+        with tracing.span("spool.store", table=table_name, rows=len(df)), temp_path.open("wb") as f:
+            pq.write_table(pa.Table.from_pandas(df, schema=arrow_schema, preserve_index=False), f, compression="zstd")
+            f.flush()
+            os.fsync(f.fileno())
+        temp_path.replace(file_path)
+        self._fsync_directory(table_path)
+
+        self._spooled_batches += 1
+        self.logger.debug(f"Spooled {len(df)} rows for table `{table_name}` to {file_path}")
+
+    @staticmethod
+    def _fsync_directory(path: Path):
+        """Persist the directory entry of a renamed file, not supported on every platform."""
+        with contextlib.suppress(OSError):
+            fd = os.open(path, os.O_RDONLY)
+            try:
+                os.fsync(fd)
+            finally:
+                os.close(fd)
+
+    def _spooled_files(self, table_name: str) -> list[Path]:
+        return sorted((self.spool_path / table_name).glob("*.parquet"))
+
+    def flush(self):
+        """Replay the spool of every table into the wrapped connector and flush it.
+
+        The batches of all tables are handed to the wrapped connector before it is flushed once, so
+        a connector that writes in the background can write the tables in parallel. The spooled
+        files are only removed when the flush succeeded, otherwise they are kept for the next run.
+
+        Raises:
+            StorageError: When the spooled data could not be written
+
+        """
+        if not self.spool_path.is_dir():
+            return
+
+        replayed_files = []
+        replayed_rows = 0
+        try:
+            for table_path in sorted(path for path in self.spool_path.iterdir() if path.is_dir()):
+                files = self._spooled_files(table_path.name)
+                if not files:
+                    continue
+
+                frames = [pq.read_table(file_path).to_pandas() for file_path in files]
+                df = concat(frames, ignore_index=True).drop_duplicates(subset=list(self.KEY_COLUMNS), keep="last")
+
+                self.logger.info(
+                    f"Replaying {len(files)} spooled batches ({len(df)} rows) into table `{table_path.name}`"
+                )
+                with tracing.span("spool.replay", table=table_path.name, rows=len(df)):
+                    self.connector.store_data(df, table_path.name)
+                replayed_files.extend(files)
+                replayed_rows += len(df)
+
+            self.connector.flush()
+        except Exception as e:
+            raise StorageError(f"Spooled data kept for the next run: {e}") from e
+
+        for file_path in replayed_files:
+            file_path.unlink()
+        self._replayed_rows += replayed_rows
+
+    def close(self):
+        """Close the wrapped connector."""
+        self.connector.close()
+
+    def get_category_totals(self, day):
+        """Get the category totals of a date from the wrapped connector."""
+        return self.connector.get_category_totals(day)
+
+    def get_daily_summary(self, report_date=None):
+        """Get the daily summary from the wrapped connector."""
+        return self.connector.get_daily_summary(report_date)
+
+    def run_statistics(self) -> dict:
+        """Get the statistics of the wrapped connector together with those of the spool."""
+        return {
+            **self.connector.run_statistics(),
+            "spool": {"spooled_batches": self._spooled_batches, "replayed_rows": self._replayed_rows},
+        }
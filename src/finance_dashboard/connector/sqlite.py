@@ -0,0 +1,175 @@
+import logging
+import sqlite3
+from datetime import date, timedelta
+from pathlib import Path
+
+from pandas import DataFrame, read_sql_query, to_datetime
+
+from finance_dashboard import schema, tracing
+from finance_dashboard.connector import Connector
+from finance_dashboard.summary import build_daily_summary
+
+# ruff: noqa: S608  # SQL injection is not a concern here as table and column names come from the schema
+
+# SQLite column types used for each schema column type
+SQLITE_TYPES = {
+    "STRING": "TEXT",
+    "FLOAT": "REAL",
+    "INTEGER": "INTEGER",
+    "DATE": "TEXT",
+}
+
+
+class SQLiteConnector(Connector):
+    """Local SQLite connector for storing and retrieving financial data without a cloud project.
+
+    It stores the same tables as the BigQuery connector in a single database file, upserting on
+    (date, source, name), and provides the same `total` view and read methods. Dates are stored as
+    ISO formatted text, so they sort and compare correctly.
+    """
+
+    KEY_COLUMNS = ("date", "source", "name")
+    FACT_TABLES = ("bank", "stock", "crypto")
+    TOTALS_VIEW = "total"
+    # Number of days before the report date searched for the latest date with data
+    SUMMARY_WINDOW_DAYS = 7
+
+    def __init__(self, database_path: str = "data/finance.db"):
+        self.database_path = database_path
+        self.logger = logging.getLogger(__name__)
+
+        if database_path != ":memory:":
+            Path(database_path).parent.mkdir(parents=True, exist_ok=True)
+        self.connection = sqlite3.connect(database_path)
+        self._tables_created = False
+
+        # Category names used as `source` in the total view, configured by setup_database
+        self.category_names = {"bank": "bank-accounts", "stock": "stocks", "crypto": "crypto"}
+
+    def close(self):
+        """Close the database connection."""
+        self.connection.close()
+
+    def setup_database(self, account_name: str, stock_name: str, crypto_name: str):
+        """Create the tables if they don't exist and (re)create the `total` view."""
+        self.category_names = {"bank": account_name, "stock": stock_name, "crypto": crypto_name}
+
+        self._ensure_tables_exist()
+        with self.connection:
+            self.connection.execute(f"DROP VIEW IF EXISTS {self.TOTALS_VIEW}")
+            self.connection.execute(self._totals_view_sql())
+
+        self.logger.info(f"SQLite database `{self.database_path}` set up")
+
+    def _ensure_tables_exist(self):
+        """Create the fact tables if they don't exist, once per connector."""
+        if self._tables_created:
+            return
+
+        with self.connection:
+            for table_name in self.FACT_TABLES:
+                columns = ", ".join(
+                    f"{column.name} {SQLITE_TYPES[column.type]}" for column in schema.get(table_name).columns
+                )
+                self.connection.execute(
+                    f"CREATE TABLE IF NOT EXISTS {table_name} ({columns}, PRIMARY KEY ({', '.join(self.KEY_COLUMNS)}))"
+                )
+
+        self._tables_created = True
+
+    def _totals_view_sql(self) -> str:
+        selects = []
+        for table_name in self.FACT_TABLES:
+            category = self.category_names[table_name].replace("'", "''")
+            selects.append(
+                f"SELECT date, ROUND(SUM({schema.TOTAL_COLUMNS[table_name]}), 2) AS total_balance, "
+                f"'{category}' AS source FROM {table_name} GROUP BY date"
+            )
+
+        return f"CREATE VIEW {self.TOTALS_VIEW} AS " + " UNION ALL ".join(selects)
+
+    def store_data(self, df: DataFrame, table_name: str):
+        """Upsert a DataFrame into a table, replacing rows with the same date, source and name."""
+        if df.empty:
+            return
+
+        self._ensure_tables_exist()
+
+        df = schema.get(table_name).coerce(df)
+        columns = list(df.columns)
+        updates = ", ".join(f"{column} = excluded.{column}" for column in columns if column not in self.KEY_COLUMNS)
+        query = (
+            f"INSERT INTO {table_name} ({', '.join(columns)}) VALUES ({', '.join('?' for _ in columns)}) "
+            f"ON CONFLICT ({', '.join(self.KEY_COLUMNS)}) DO UPDATE SET {updates}"
+        )
+
+        rows = df.astype(object).where(df.notna(), None)
+        rows["date"] = rows["date"].map(lambda value: value.isoformat() if value is not None else None)
+
+        with tracing.span("sqlite.store", table=table_name, rows=len(rows)), self.connection:
+            self.connection.executemany(query, rows.itertuples(index=False, name=None))
+
+        self.logger.info(f"Data stored successfully in SQLite table `{table_name}`")
+
+    def get_totals(self, start_date: str | None = None, end_date: str | None = None) -> DataFrame:
+        """Query the total view with optional date filtering.
+
+        Args:
+            start_date: Optional start date in 'YYYY-MM-DD' format
+            end_date: Optional end date in 'YYYY-MM-DD' format
+
+        Returns:
+            DataFrame with the totals data
+
+        """
+        conditions = []
+        parameters = []
+        if start_date:
+            conditions.append("date >= ?")
+            parameters.append(start_date)
+        if end_date:
+            conditions.append("date <= ?")
+            parameters.append(end_date)
+
+        where_clause = f"WHERE {' AND '.join(conditions)}" if conditions else ""
+        query = f"SELECT date, source, total_balance FROM {self.TOTALS_VIEW} {where_clause} ORDER BY date DESC, source"
+
+        df = read_sql_query(query, self.connection, params=parameters)
+        df["date"] = to_datetime(df["date"]).dt.date
+        return df
+
+    def get_category_totals(self, day: date) -> dict[str, float]:
+        """Get the total balance per category for a single date.
+
+        Returns:
+            Mapping of category name to total balance, empty when there is no data for the date
+
+        """
+        rows = self.connection.execute(
+            f"SELECT source, SUM(total_balance) FROM {self.TOTALS_VIEW} WHERE date = ? GROUP BY source",
+            (day.isoformat(),),
+        )
+        return {source: float(total_balance) for source, total_balance in rows}
+
+    def get_daily_summary(self, report_date: date | None = None):
+        """Get a summary of the latest date with data compared to the day before.
+
+        Args:
+            report_date: Last date to report on, defaults to today
+
+        Returns:
+            dict with the same structure as BigQueryConnector.get_daily_summary(), or None when
+            there is no data in the SUMMARY_WINDOW_DAYS days up to the report date
+
+        """
+        end_date = report_date or date.today()
+        start_date = end_date - timedelta(days=self.SUMMARY_WINDOW_DAYS)
+        (latest,) = self.connection.execute(
+            f"SELECT MAX(date) FROM {self.TOTALS_VIEW} WHERE date > ? AND date <= ?",
+            (start_date.isoformat(), end_date.isoformat()),
+        ).fetchone()
+        if latest is None:
+            return None
+
+        today = date.fromisoformat(latest)
+        return build_daily_summary(self.get_category_totals(today), self.get_category_totals(today - timedelta(days=1)))
@@ -24,6 +24,18 @@ class DataSourceError(FinanceDashboardError):
     pass
 
 
+class StorageError(FinanceDashboardError):
+    """Raised when storing data in the database fails."""
+
+    pass
+
+
+class QueryBudgetExceededError(FinanceDashboardError):
+    """Raised when a query is estimated to process more bytes than the configured budget."""
+
+    pass
+
+
 class ExceptionHandler:
     """Centralized exception handling utility."""
 
@@ -0,0 +1,57 @@
+"""DataFrame construction for Finance Dashboard.
+
+Batches of records are turned into a DataFrame with `build_frame`. The backend decides how the columns are stored:
+
+- ``numpy``: regular pandas dtypes
+- ``arrow``: pyarrow-backed pandas dtypes, built from a single Arrow table, so strings and numbers
+  stay in Arrow buffers from the record batch up to the Parquet and BigQuery writers instead of Python objects
+"""
+
+import pyarrow as pa
+from pandas import ArrowDtype, DataFrame
+
+BACKENDS = ("numpy", "arrow")
+
+_backend = "numpy"
+
+
+def set_backend(backend: str):
+    """Set the backend used by build_frame.
+
+    Raises:
+        ValueError: When the backend is unknown
+
+    """
+    global _backend
+
+    if backend not in BACKENDS:
+        raise ValueError(f"Unknown DataFrame backend: {backend}")
+    _backend = backend
+
+
+def get_backend() -> str:
+    """Get the backend used by build_frame."""
+    return _backend
+
+
+def build_frame(rows: list[dict], columns: list[str] | None = None) -> DataFrame:
+    """Build a DataFrame from a list of row dictionaries with the configured backend.
+
+    Rows don't need to have the same keys, like with the ``numpy`` backend the columns are the union of
+    the keys of all rows in order of appearance, and missing values are null.
+
+    Args:
+        rows: Rows as dictionaries of column name to value
+        columns: Columns of the DataFrame, used to build an empty DataFrame with the right columns
+
+    Returns:
+        DataFrame with one row per dictionary
+
+    """
+    if _backend == "arrow" and rows:
+        if columns is None:
+            columns = list(dict.fromkeys(key for row in rows for key in row))
+        table = pa.table({column: [row.get(column) for row in rows] for column in columns})
+        return table.to_pandas(types_mapper=ArrowDtype)
+
+    return DataFrame(rows, columns=columns)
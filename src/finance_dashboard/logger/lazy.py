@@ -0,0 +1,55 @@
+"""Lazy debug logging helpers.
+
+Debug output of the models includes full API responses, which are expensive to serialize. These
+helpers defer that work until a handler actually formats the record, so runs at INFO level skip it:
+
+- `debug_enabled` guards blocks of debug statements
+- `dump_payload` serializes a payload to indented JSON, bounded to a maximum length, when the
+  message is formatted
+
+`dump_payload` is passed as a %-style argument, as f-strings are formatted right away:
+
+    logger.debug("Accounts response: %s", dump_payload(accounts))
+"""
+
+import json
+import logging
+from typing import Any
+
+# Maximum number of characters of a dumped payload
+PAYLOAD_LIMIT = 2000
+
+
+def debug_enabled(logger: logging.Logger) -> bool:
+    """Check whether debug messages of a logger are handled."""
+    return logger.isEnabledFor(logging.DEBUG)
+
+
+def _bounded_json(payload: Any, limit: int) -> str:
+    """Serialize a payload to indented JSON, stopping once the limit has been reached."""
+    chunks = []
+    length = 0
+    for chunk in json.JSONEncoder(indent=2, default=str).iterencode(payload):
+        chunks.append(chunk)
+        length += len(chunk)
+        if length > limit:
+            return f"{''.join(chunks)[:limit]}... (truncated at {limit} characters)"
+    return "".join(chunks)
+
+
+class _Payload:
+    """Payload that is serialized when the log message is formatted."""
+
+    __slots__ = ("limit", "payload")
+
+    def __init__(self, payload: Any, limit: int):
+        self.payload = payload
+        self.limit = limit
+
+    def __str__(self) -> str:
+        return _bounded_json(self.payload, self.limit)
+
+
+def dump_payload(payload: Any, limit: int = PAYLOAD_LIMIT) -> _Payload:
+    """Get a payload as indented JSON of at most `limit` characters, serialized when it is logged."""
+    return _Payload(payload, limit)
@@ -1,9 +1,18 @@
+import atexit
+import html
 import logging
+import queue
+import re
+import threading
+import time
+from logging.handlers import QueueHandler, QueueListener
 
 import requests
 
 from finance_dashboard.logger import Logger
 
+TELEGRAM_API_URL = "https://api.telegram.org"
+
 
 class TelegramLogger(Logger):
     """Logger that sends error messages to Telegram in addition to file logging."""
@@ -16,6 +25,7 @@ class TelegramLogger(Logger):
         log_level=logging.INFO,
         telegram_log_level=logging.ERROR,
         table_names=None,
+        error_digest=True,
     ):
         super().__init__(log_file_name, log_level)
         self.bot_token = bot_token
@@ -27,6 +37,9 @@ class TelegramLogger(Logger):
             "total": "total",
         }
 
+        self._listener = None
+        self.error_digest = self.ErrorDigest() if error_digest else None
+
         # Only add Telegram handler if credentials are provided
         if bot_token and chat_id:
             telegram_handler = self.TelegramHandler(bot_token, chat_id)
@@ -35,7 +48,27 @@ class TelegramLogger(Logger):
             telegram_handler.setFormatter(formatter)
             telegram_handler.setLevel(telegram_log_level)  # Keep Telegram on ERROR level
 
-            self.log.addHandler(telegram_handler)
+            # Logging calls only enqueue the record, a background listener sends them to Telegram
+            log_queue = queue.SimpleQueue()
+            queue_handler = QueueHandler(log_queue)
+            queue_handler.setLevel(telegram_log_level)
+            if self.error_digest:
+                queue_handler.addFilter(self.error_digest)
+            self.log.addHandler(queue_handler)
+
+            self._listener = QueueListener(log_queue, telegram_handler, respect_handler_level=True)
+            self._listener.start()
+            atexit.register(self.close)
+
+    def close(self):
+        """Send all queued log records to Telegram and stop the background listener."""
+        if self._listener is None:
+            return
+
+        listener, self._listener = self._listener, None
+        listener.stop()
+        for handler in listener.handlers:
+            handler.close()
 
     def send_message(self, message: str, parse_mode: str = "HTML"):
         """Send a message to Telegram.
@@ -51,7 +84,7 @@ class TelegramLogger(Logger):
 
         try:
             response = requests.post(
-                f"https://api.telegram.org/bot{self.bot_token}/sendMessage",
+                f"{TELEGRAM_API_URL}/bot{self.bot_token}/sendMessage",
                 params={
                     "chat_id": self.chat_id,
                     "text": message,
@@ -64,11 +97,33 @@ class TelegramLogger(Logger):
         except Exception:
             self.log.exception("Failed to send Telegram message")
 
+    def send_error_digest(self):
+        """Send a digest of the errors that were repeated since the last digest.
+
+        The first occurrence of every error has already been sent as an alert, the digest lists
+        how often each error occurred once it was repeated.
+        """
+        if not self.error_digest:
+            return
+
+        errors = self.error_digest.reset()
+        repeated = {fingerprint: count for fingerprint, count in errors.items() if count > 1}
+        if not repeated:
+            return
+
+        message_parts = [f"<b>⚠️ Error Digest</b>\n{sum(errors.values())} errors, {len(errors)} distinct\n"]
+        for (error_type, source, function), count in sorted(repeated.items(), key=lambda item: -item[1]):
+            message_parts.append(
+                f"• {count}x <code>{html.escape(error_type)}</code> in {html.escape(source)} ({html.escape(function)})"
+            )
+
+        self.send_message("\n".join(message_parts), parse_mode="HTML")
+
     def send_daily_summary(self, summary_data: dict, dashboard_url: str = "", currency: str = "EUR"):
         """Send a formatted daily summary to Telegram.
 
         Args:
-            summary_data: Dictionary with summary data from BigQueryConnector.get_daily_summary()
+            summary_data: Dictionary with summary data from summary.build_daily_summary()
             dashboard_url: Optional URL to the dashboard
             currency: Currency symbol to display
 
@@ -134,21 +189,146 @@ class TelegramLogger(Logger):
         message = "\n".join(message_parts)
         self.send_message(message, parse_mode="HTML")
 
+    class ErrorDigest(logging.Filter):
+        """Filter that lets only the first occurrence of an error through and counts the repeats.
+
+        Errors are fingerprinted by exception type, source and function. The source is taken
+        from a `source` attribute of the record or from the `[source]` prefix of the message.
+        """
+
+        SOURCE_PATTERN = re.compile(r"^\[([^\]]+)\]")
+
+        def __init__(self):
+            super().__init__()
+            self._counts: dict[tuple[str, str, str], int] = {}
+            self._lock = threading.Lock()
+
+        def fingerprint(self, record: logging.LogRecord) -> tuple[str, str, str]:
+            """Get the exception type, source and function of a log record."""
+            error_type = record.exc_info[0].__name__ if record.exc_info and record.exc_info[0] else record.levelname
+            source = getattr(record, "source", None)
+            if source is None:
+                match = self.SOURCE_PATTERN.match(str(record.msg))
+                source = match.group(1) if match else record.name
+            return error_type, source, record.funcName
+
+        def filter(self, record: logging.LogRecord) -> bool:
+            """Count the error and only pass it on when it is the first occurrence."""
+            fingerprint = self.fingerprint(record)
+            with self._lock:
+                count = self._counts.get(fingerprint, 0) + 1
+                self._counts[fingerprint] = count
+            return count == 1
+
+        def reset(self) -> dict[tuple[str, str, str], int]:
+            """Get the number of occurrences of every error and start counting again."""
+            with self._lock:
+                counts, self._counts = self._counts, {}
+            return counts
+
+        def statistics(self) -> dict:
+            """Get the number of errors and of the alerts that were not sent."""
+            with self._lock:
+                total = sum(self._counts.values())
+                return {"errors": total, "distinct": len(self._counts), "suppressed": total - len(self._counts)}
+
     class TelegramHandler(logging.Handler):
-        def __init__(self, bot_token, chat_id):
+        """Handler that sends log records to Telegram in batches.
+
+        Records are collected for up to `linger` seconds and sent together, split in messages of
+        at most MAX_MESSAGE_LENGTH characters. Messages are sent at most once every `min_interval`
+        seconds, and a rate limited message is retried after the delay Telegram asks for. The
+        handler runs on the QueueListener thread, so sending never blocks a logging call.
+        """
+
+        # Maximum length of a Telegram message
+        MAX_MESSAGE_LENGTH = 4096
+
+        def __init__(self, bot_token, chat_id, linger: float = 2.0, min_interval: float = 1.0):
             super().__init__()
             self.bot_token = bot_token
             self.chat_id = chat_id
+            self.linger = linger
+            self.min_interval = min_interval
+            self._pending: list[str] = []
+            self._timer = None
+            self._last_sent = 0.0
+            # Serializes sending, separate from the handler lock, so logging never waits for the network
+            self._send_lock = threading.Lock()
 
         def emit(self, record):
-            """Send log record to Telegram."""
-            log_entry = self.format(record)
+            """Add a log record to the next batch."""
+            try:
+                log_entry = self.format(record)
+            except Exception:
+                self.handleError(record)
+                return
 
-            requests.post(
-                f"https://api.telegram.org/bot{self.bot_token}/sendMessage",
-                params={
-                    "chat_id": self.chat_id,
-                    "text": log_entry,
-                },
-                timeout=10,
-            )
+            with self.lock:
+                self._pending.append(log_entry)
+                if self._timer is None:
+                    self._timer = threading.Timer(self.linger, self.flush)
+                    self._timer.daemon = True
+                    self._timer.start()
+
+        def flush(self):
+            """Send all pending log records."""
+            with self._send_lock:
+                with self.lock:
+                    if self._timer is not None:
+                        self._timer.cancel()
+                        self._timer = None
+                    pending, self._pending = self._pending, []
+
+                for message in self._batch(pending):
+                    self._send(message)
+
+        def close(self):
+            """Send the pending log records and close the handler."""
+            self.flush()
+            super().close()
+
+        def _batch(self, entries: list[str]) -> list[str]:
+            """Join log entries into messages that fit in a Telegram message."""
+            messages = []
+            current = ""
+            for entry in entries:
+                for start in range(0, max(len(entry), 1), self.MAX_MESSAGE_LENGTH):
+                    chunk = entry[start : start + self.MAX_MESSAGE_LENGTH]
+                    if current and len(current) + 2 + len(chunk) <= self.MAX_MESSAGE_LENGTH:
+                        current = f"{current}\n\n{chunk}"
+                    else:
+                        if current:
+                            messages.append(current)
+                        current = chunk
+            if current:
+                messages.append(current)
+            return messages
+
+        def _send(self, message: str, retries: int = 1):
+            """Send a message, waiting for the rate limit."""
+            delay = self._last_sent + self.min_interval - time.monotonic()
+            if delay > 0:
+                time.sleep(delay)
+
+            try:
+                response = requests.post(
+                    f"{TELEGRAM_API_URL}/bot{self.bot_token}/sendMessage",
+                    params={
+                        "chat_id": self.chat_id,
+                        "text": message,
+                    },
+                    timeout=10,
+                )
+                self._last_sent = time.monotonic()
+
+                if response.status_code == 429 and retries > 0:
+                    retry_after = response.json().get("parameters", {}).get("retry_after", self.min_interval)
+                    self._last_sent = time.monotonic() + retry_after - self.min_interval
+                    self._send(message, retries - 1)
+                    return
+                response.raise_for_status()
+            except Exception as e:
+                self._last_sent = time.monotonic()
+                # Logged outside of the TelegramLogger hierarchy, so the failure doesn't loop back here
+                logging.getLogger(__name__).warning(f"Failed to send log message to Telegram: {e}")
@@ -3,51 +3,106 @@
 Orchestrates data collection from multiple sources based on pipeline configuration.
 """
 
+import contextlib
 import logging
+import threading
+from datetime import date, timedelta
 
-from currency_converter import CurrencyConverter
-
-from finance_dashboard.connector.bigquery import BigQueryConnector
+from finance_dashboard import frames, memory, sources, tracing
+from finance_dashboard.connector import Connector
+from finance_dashboard.connector.spool import SpoolingConnector
 from finance_dashboard.logger.telegram import TelegramLogger
 from finance_dashboard.pipeline_config import PipelineConfig
-from finance_dashboard.repository.bank.bunq_repository import BunqRepository
-from finance_dashboard.repository.crypto.coinbase_repository import CoinbaseRepository
-from finance_dashboard.repository.crypto.cosmos_repository import CosmosRepository
-from finance_dashboard.repository.crypto.web3_repository import Web3Repository
-from finance_dashboard.repository.stock.degiro_repository import DeGiroRepository
+from finance_dashboard.profiling import Profiler
+from finance_dashboard.report import RunReport
+from finance_dashboard.summary import RecordingConnector, RunTotals, TotalsHistory, build_daily_summary
+
+
+class _ErrorFlag(logging.Handler):
+    """Flags the errors that the thread that created it logs while it is attached to a logger."""
+
+    def __init__(self):
+        super().__init__(logging.ERROR)
+        self.thread = threading.get_ident()
+        self.raised = False
+
+    def emit(self, record: logging.LogRecord):
+        """Flag the error when it was logged by the thread of the flag."""
+        if record.thread == self.thread:
+            self.raised = True
 
 
 class FinanceDashboard:
     """Main application class for the Finance Dashboard."""
 
-    def __init__(self, pipeline_config: PipelineConfig):
+    def __init__(self, pipeline_config: PipelineConfig, profiler: Profiler | None = None):
         """Initialize Finance Dashboard with pipeline configuration.
 
         Args:
             pipeline_config: Pipeline configuration loaded from YAML
+            profiler: Optional profiler, the collection of every account is profiled separately
 
         """
         self.config = pipeline_config
+        self.profiler = profiler
         self.logger = logging.getLogger(__name__)
 
-        # Initialize components
-        self._setup_components()
+        # Trace the run from the start, so the connector creation and database setup are included
+        tracing.reset()
 
-        # Set up database schema on initialization
-        self._setup_database()
+        # Measure the memory of the stages of the run from the start, so the SDK clients are included
+        if self.config.reporting_memory:
+            memory.start(top=self.config.reporting_memory_top)
+
+        try:
+            # Initialize components
+            self._setup_components()
+
+            # Set up database schema on initialization
+            with (
+                tracing.span("connector.setup", connector=self.config.database_connector),
+                memory.stage("connector.setup", connector=self.config.database_connector),
+            ):
+                self._setup_database()
+        except Exception:
+            # The memory is otherwise only measured until the run report is written
+            memory.stop()
+            raise
 
     def _setup_components(self):
         """Initialize the main application components."""
+        frames.set_backend(self.config.dataframe_backend)
+
+        table_names = self.config.table_names
+        self.category_names = {
+            "bank": table_names.get("accounts", "bank-accounts"),
+            "stock": table_names.get("stocks", "stocks"),
+            "crypto": table_names.get("crypto", "crypto"),
+        }
+
+        # Report with the metrics of this run, written when the run finishes
+        self.report = RunReport(self.config.reporting_directory if self.config.reporting_enabled else None)
+
         # Database connector
-        self.connector = BigQueryConnector(
-            self.config.database_credentials_path,
-            self.config.database_project_id,
-            self.config.database_schema_id,
-            self.config.database_location,
-        )
+        with (
+            tracing.span("connector.create", connector=self.config.database_connector),
+            memory.stage("connector.create", connector=self.config.database_connector),
+        ):
+            self.connector = self._create_connector()
+
+        # Totals of the data stored during this run, used for the daily summary
+        self.run_totals = RunTotals(self.category_names)
+        # Accounts of an unknown type or whose collection logged an error, which makes the run totals
+        # incomplete. Accounts skipped for missing credentials are not counted, no run stores their data.
+        self.uncollected_accounts: list[str] = []
+        self.totals_history = TotalsHistory(self.config.database_totals_history_path)
+        self.sink = RecordingConnector(self._create_spool(self.connector), self.run_totals)
 
         # Currency converter
-        self.converter = CurrencyConverter(ref_currency=self.config.preferred_currency)
+        from currency_converter import CurrencyConverter
+
+        with tracing.span("currency_converter"), memory.stage("currency_converter"):
+            self.converter = CurrencyConverter(ref_currency=self.config.preferred_currency)
 
         # Logger (Telegram if configured, otherwise console)
         if self.config.logging_type == "telegram" and self.config.telegram_bot_token:
@@ -59,45 +114,100 @@ class FinanceDashboard:
                 self.config.telegram_chat_id,
                 log_level=log_level,
                 table_names=self.config.table_names,
+                error_digest=self.config.telegram_error_digest,
             )
         else:
             self.telegram_logger = None
 
+        # Context the collectors of the sources are called with
+        self.source_context = self._create_source_context()
+
         self.logger.info("Components initialized successfully")
 
+    def _create_connector(self) -> Connector:
+        """Create the database connector selected in the pipeline configuration.
+
+        Returns:
+            SQLiteConnector for the `sqlite` connector, otherwise BigQueryConnector
+
+        """
+        if self.config.database_connector == "sqlite":
+            from finance_dashboard.connector.sqlite import SQLiteConnector
+
+            return SQLiteConnector(self.config.database_sqlite_path)
+
+        # Imported here, so google-cloud-bigquery is only loaded when it is used
+        from finance_dashboard.connector.bigquery import BigQueryConnector
+
+        return BigQueryConnector(
+            self.config.database_credentials_path,
+            self.config.database_project_id,
+            self.config.database_schema_id,
+            self.config.database_location,
+            metadata_cache_path=self.config.database_metadata_cache_path,
+            metadata_cache_ttl=self.config.database_metadata_cache_ttl,
+            write_mode=self.config.database_write_mode,
+            buffer_max_rows=self.config.database_buffer_max_rows,
+            max_pending_writes=self.config.database_max_pending_writes,
+            query_budget_bytes=self.config.database_query_budget_bytes,
+            skip_unchanged=self.config.database_skip_unchanged,
+            snapshot_hashes_path=self.config.database_snapshot_hashes_path,
+        )
+
+    def _create_spool(self, connector: Connector) -> Connector:
+        """Wrap the connector in a local write-ahead spool when enabled in the pipeline configuration."""
+        if not self.config.database_spool_enabled:
+            return connector
+
+        return SpoolingConnector(connector, self.config.database_spool_path)
+
     def _setup_database(self):
         """Ensure database schema (dataset, tables, and views) exists."""
         try:
             self.logger.info("Checking database setup")
-            table_names = self.config.table_names
             self.connector.setup_database(
-                table_names.get("accounts", "bank-accounts"),
-                table_names.get("stocks", "stocks"),
-                table_names.get("crypto", "crypto"),
+                self.category_names["bank"],
+                self.category_names["stock"],
+                self.category_names["crypto"],
             )
             self.logger.info("Database setup complete")
         except Exception as e:
             self.logger.warning(f"Database setup check failed: {e}")
 
-    def _get_legacy_config(self) -> dict:
-        """Create legacy config format for repositories.
+    def migrate_partitioning(self):
+        """Migrate the BigQuery fact tables that are not partitioned by date yet."""
+        if self.config.database_connector != "bigquery":
+            self.logger.info(f"The {self.config.database_connector} connector doesn't partition tables")
+            return
+
+        self.logger.info("Migrating fact tables to date-partitioned tables")
+        try:
+            self.connector.migrate_to_partitioned_tables()
+        finally:
+            self.sink.close()
+        self.logger.info("Fact tables migrated")
+
+    def _create_source_context(self) -> sources.SourceContext:
+        """Create the context the collectors of the sources are called with.
 
         Returns:
-            Dictionary with legacy configuration format
+            SourceContext with the connector, converter, logger and API keys of this run
 
         """
-        return {
-            "connector": self.connector,
-            "converter": self.converter,
-            "logger": self.telegram_logger if self.telegram_logger else logging.getLogger(),
-            "coinmarketcap_api_key": self.config.crypto_coinmarketcap_api_key,
-        }
+        return sources.SourceContext(
+            connector=self.sink,
+            converter=self.converter,
+            logger=self.telegram_logger if self.telegram_logger else logging.getLogger(),
+            coinmarketcap_api_key=self.config.crypto_coinmarketcap_api_key,
+            moralis_api_key=self.config.crypto_moralis_api_key,
+        )
 
     def run(self):
         """Run all data collection processes based on pipeline configuration."""
         self.logger.info("=" * 60)
         self.logger.info("Starting Finance Dashboard data collection")
         self.logger.info("=" * 60)
+        self.uncollected_accounts = []
 
         try:
             # Run each enabled data source
@@ -110,6 +220,18 @@ class FinanceDashboard:
             if self.config.crypto_enabled:
                 self._collect_crypto_data()
 
+            # Write everything the connector buffered during collection
+            self.logger.info("Flushing collected data to the database")
+            with tracing.span("flush"), memory.stage("flush"):
+                self.sink.flush()
+
+            # Keep today's totals locally, they are yesterday's totals for tomorrow's summary. They are
+            # only complete when every account stored its data.
+            if not self.uncollected_accounts:
+                today_totals = self.run_totals.totals(date.today())
+                if today_totals:
+                    self.totals_history.set(date.today(), today_totals)
+
             self.logger.info("=" * 60)
             self.logger.info("Finance Dashboard data collection completed successfully")
             self.logger.info("=" * 60)
@@ -121,6 +243,63 @@ class FinanceDashboard:
             self.logger.exception("Finance Dashboard run failed")
             raise
 
+        finally:
+            # Waits for writes still running in the background, so they are included in the report
+            self.sink.close()
+            self._write_report()
+            self._send_error_digest()
+
+    def _write_report(self):
+        """Add the database, error and memory statistics to the run report and write it, with the run metrics."""
+        statistics = self.sink.run_statistics()
+        if statistics:
+            self.report.set(self.config.database_connector, statistics)
+        if self.telegram_logger and self.telegram_logger.error_digest:
+            self.report.set("errors", self.telegram_logger.error_digest.statistics())
+        memory_stages = memory.stop()
+        if memory_stages:
+            self.report.set("memory", memory_stages)
+        self.report.write()
+
+        trace_path = None
+        if self.report.directory:
+            trace_path = self.report.directory / f"trace_{self.report.started_at:%Y%m%d_%H%M%S}.json"
+        tracing.write(trace_path, self.config.reporting_prometheus_textfile)
+
+    @contextlib.contextmanager
+    def _source_scope(self, account_name: str, account_type: str):
+        """Trace and measure the memory of, and profile when profiling, the collection of an account.
+
+        Yields:
+            Flag that is raised when an error is logged during the collection
+
+        """
+        error_flag = _ErrorFlag()
+        root_logger = logging.getLogger()
+        root_logger.addHandler(error_flag)
+        try:
+            with (
+                tracing.span("collect", source=account_name, type=account_type),
+                memory.stage("collect", source=account_name, type=account_type),
+            ):
+                if self.profiler is None:
+                    yield error_flag
+                    return
+                with self.profiler.scope(account_name):
+                    yield error_flag
+        finally:
+            root_logger.removeHandler(error_flag)
+
+    def _send_error_digest(self):
+        """Send the repeated errors of the run to Telegram as one digest."""
+        if not self.telegram_logger:
+            return
+
+        try:
+            self.telegram_logger.send_error_digest()
+        except Exception:
+            self.logger.exception("Failed to send error digest")
+
     def _send_daily_summary(self):
         """Send daily summary to Telegram if enabled."""
         if not self.config.telegram_send_summary:
@@ -133,7 +312,14 @@ class FinanceDashboard:
 
         try:
             self.logger.info("Generating daily summary for Telegram")
-            summary_data = self.connector.get_daily_summary()
+            today = date.today()
+            today_totals = self._get_today_totals(today)
+            if today_totals:
+                summary_data = build_daily_summary(today_totals, self._get_totals(today - timedelta(days=1)))
+            else:
+                # Nothing is stored for today, report the latest stored date instead of a total of zero
+                self.logger.info("No totals for today, summarizing the latest stored date from the database")
+                summary_data = self.sink.get_daily_summary(today)
 
             if summary_data:
                 self.telegram_logger.send_daily_summary(
@@ -147,220 +333,99 @@ class FinanceDashboard:
         except Exception:
             self.logger.exception("Failed to send daily summary")
 
-    # Bank Data Collection
-    def _collect_bank_data(self):
-        """Collect data from all configured bank accounts."""
-        self.logger.info("-" * 60)
-        self.logger.info("BANK ACCOUNTS")
-        self.logger.info("-" * 60)
+    def _get_today_totals(self, day: date) -> dict[str, float]:
+        """Get today's category totals from the rows stored during this run, or the database when incomplete.
 
-        for account_config in self.config.bank_accounts:
-            account_name = account_config.get("name", "Unknown")
-            account_type = account_config.get("type", "").lower()
-
-            if account_type == "bunq":
-                self._collect_bunq_account(account_name, account_config)
-            else:
-                self.logger.warning(f"Unknown bank account type: {account_type} for {account_name}")
-
-    def _collect_bunq_account(self, account_name: str, account_config: dict):
-        """Collect Bunq bank account data.
+        When an account has an unknown type or its collection logged an error during this run, the
+        database is read instead, as it also has the rows that earlier runs of the day stored for that
+        account. Accounts skipped for missing credentials don't store data in any run, so they don't
+        make the run totals incomplete.
 
         Args:
-            account_name: Name of the account
-            account_config: Account configuration dictionary
-
-        """
-        api_key = self.config.get_account_env_value(account_config, "api_key_env")
-        config_file = account_config.get("configuration_file", "")
-
-        if not api_key:
-            self.logger.info(f"Skipping {account_name} - no API key configured")
-            return
-
-        try:
-            self.logger.info(f"Collecting {account_name} account data")
-            repository = BunqRepository(self._get_legacy_config(), api_key, config_file)
-            repository.get_and_store_accounts(account_name)
-            self.logger.info(f"{account_name} data collection completed")
-        except Exception:
-            self.logger.exception(f"{account_name} data collection failed")
-
-    # Stock Data Collection
-    def _collect_stock_data(self):
-        """Collect data from all configured stock accounts."""
-        self.logger.info("-" * 60)
-        self.logger.info("STOCK ACCOUNTS")
-        self.logger.info("-" * 60)
+            day: Today's date
 
-        for account_config in self.config.stock_accounts:
-            account_name = account_config.get("name", "Unknown")
-            account_type = account_config.get("type", "").lower()
-
-            if account_type == "degiro":
-                self._collect_degiro_account(account_name, account_config)
-            else:
-                self.logger.warning(f"Unknown stock account type: {account_type} for {account_name}")
-
-    def _collect_degiro_account(self, account_name: str, account_config: dict):
-        """Collect DeGiro stock data.
-
-        Args:
-            account_name: Name of the account
-            account_config: Account configuration dictionary
+        Returns:
+            Mapping of category name to total balance
 
         """
-        username = self.config.get_account_env_value(account_config, "username_env")
-        password = self.config.get_account_env_value(account_config, "password_env")
-        int_account = self.config.get_account_env_value(account_config, "int_account_env")
-        totp = self.config.get_account_env_value(account_config, "totp_env")
-
-        if not username:
-            self.logger.info(f"Skipping {account_name} - no credentials configured")
-            return
-
-        try:
-            self.logger.info(f"Collecting {account_name} stock data")
-            repository = DeGiroRepository(self._get_legacy_config(), username, password, int_account, totp)
-            repository.get_and_store_stocks(account_name)
-            repository.get_and_store_account(account_name)
-            repository.logout()
-            self.logger.info(f"{account_name} data collection completed")
-        except Exception:
-            self.logger.exception(f"{account_name} data collection failed")
-
-    # Crypto Data Collection
-    def _collect_crypto_data(self):
-        """Collect data from all configured crypto accounts."""
-        self.logger.info("-" * 60)
-        self.logger.info("CRYPTO ACCOUNTS")
-        self.logger.info("-" * 60)
+        if not self.uncollected_accounts:
+            return self.run_totals.totals(day)
 
-        moralis_api_key = self.config.crypto_moralis_api_key
-
-        for account_config in self.config.crypto_accounts:
-            account_name = account_config.get("name", "Unknown")
-            account_type = account_config.get("type", "").lower()
-
-            if account_type == "coinbase":
-                self._collect_coinbase_account(account_name, account_config)
-            elif account_type == "web3":
-                self._collect_web3_account(account_name, account_config, moralis_api_key)
-            elif account_type == "web3-solana":
-                self._collect_web3_solana_account(account_name, account_config, moralis_api_key)
-            elif account_type == "cosmos":
-                self._collect_cosmos_account(account_name, account_config)
-            else:
-                self.logger.warning(f"Unknown crypto account type: {account_type} for {account_name}")
+        self.logger.info(
+            f"No complete data for {', '.join(self.uncollected_accounts)}, reading today's totals from the database"
+        )
+        return self.sink.get_category_totals(day)
 
-    def _collect_coinbase_account(self, account_name: str, account_config: dict):
-        """Collect Coinbase exchange data.
+    def _get_totals(self, day: date) -> dict[str, float]:
+        """Get the category totals of a previous day from the local history, or the database when missing.
 
         Args:
-            account_name: Name of the account
-            account_config: Account configuration dictionary
-
-        """
-        key_file = account_config.get("key_file", "")
-
-        if not key_file:
-            self.logger.info(f"Skipping {account_name} - no key file configured")
-            return
+            day: Date to get the totals for
 
-        try:
-            self.logger.info(f"Collecting {account_name} account data")
-            repository = CoinbaseRepository(self._get_legacy_config(), key_file)
-            repository.get_and_store_wallets(account_name)
-            self.logger.info(f"{account_name} data collection completed")
-        except Exception:
-            self.logger.exception(f"{account_name} data collection failed")
-
-    def _collect_web3_account(self, account_name: str, account_config: dict, moralis_api_key: str):
-        """Collect Web3 EVM wallet data.
-
-        Args:
-            account_name: Name of the account
-            account_config: Account configuration dictionary
-            moralis_api_key: Moralis API key for Web3 data
+        Returns:
+            Mapping of category name to total balance
 
         """
-        wallet_address = self.config.get_account_env_value(account_config, "wallet_address_env")
-        chains = account_config.get("chains", [])
+        totals = self.totals_history.get(day)
+        if totals is None:
+            self.logger.info(f"No local totals for {day}, reading them from the database")
+            totals = self.sink.get_category_totals(day)
+            # An empty result is not kept, the data may still be stored later that day
+            if totals:
+                self.totals_history.set(day, totals)
 
-        if not wallet_address:
-            self.logger.info(f"Skipping {account_name} - no wallet address configured")
-            return
+        return totals
 
-        if not moralis_api_key:
-            self.logger.info(f"Skipping {account_name} - no Moralis API key configured")
-            return
-
-        try:
-            self.logger.info(f"Collecting {account_name} wallet data")
-            repository = Web3Repository(self._get_legacy_config(), moralis_api_key)
-
-            for chain in chains:
-                chain_name = f"{account_name} {chain.upper()}"
-                repository.get_and_store_evm_wallet(chain_name, wallet_address, chain)
-
-            self.logger.info(f"{account_name} data collection completed")
-        except Exception:
-            self.logger.exception(f"{account_name} data collection failed")
-
-    def _collect_web3_solana_account(self, account_name: str, account_config: dict, moralis_api_key: str):
-        """Collect Web3 Solana wallet data.
+    def _collect_accounts(self, category: str, accounts: list[dict]):
+        """Collect the data of all accounts of a category with the collector registered for their type.
 
         Args:
-            account_name: Name of the account
-            account_config: Account configuration dictionary
-            moralis_api_key: Moralis API key for Web3 data
+            category: Category of the accounts (bank, stock or crypto)
+            accounts: Account configuration dictionaries
 
         """
-        wallet_address = self.config.get_account_env_value(account_config, "wallet_address_env")
-        network = account_config.get("network", "mainnet")
-
-        if not wallet_address:
-            self.logger.info(f"Skipping {account_name} - no wallet address configured")
-            return
-
-        if not moralis_api_key:
-            self.logger.info(f"Skipping {account_name} - no Moralis API key configured")
-            return
+        for account_config in accounts:
+            account_name = account_config.get("name", "Unknown")
+            account_type = account_config.get("type", "").lower()
 
-        try:
-            self.logger.info(f"Collecting {account_name} wallet data")
-            repository = Web3Repository(self._get_legacy_config(), moralis_api_key)
-            repository.get_and_store_sol_wallet(account_name, wallet_address, network)
-            self.logger.info(f"{account_name} data collection completed")
-        except Exception:
-            self.logger.exception(f"{account_name} data collection failed")
+            collector = sources.get_collector(category, account_type)
+            if collector is None:
+                self.logger.warning(
+                    f"Unknown {category} account type: {account_type} for {account_name} "
+                    f"(available: {', '.join(sources.source_types(category))})"
+                )
+                self.uncollected_accounts.append(account_name)
+                continue
 
-    def _collect_cosmos_account(self, account_name: str, account_config: dict):
-        """Collect Cosmos-based wallet data.
+            # Collectors log their errors instead of raising them, an account that logged an error is incomplete
+            with self._source_scope(account_name, account_type) as error_flag:
+                collector(self.source_context, account_name, account_config)
+            if error_flag.raised:
+                self.uncollected_accounts.append(account_name)
 
-        Args:
-            account_name: Name of the account
-            account_config: Account configuration dictionary
+    # Bank Data Collection
+    def _collect_bank_data(self):
+        """Collect data from all configured bank accounts."""
+        self.logger.info("-" * 60)
+        self.logger.info("BANK ACCOUNTS")
+        self.logger.info("-" * 60)
 
-        """
-        wallet_address = self.config.get_account_env_value(account_config, "wallet_address_env")
-        network = account_config.get("network", "osmosis")
+        self._collect_accounts("bank", self.config.bank_accounts)
 
-        if not wallet_address:
-            self.logger.info(f"Skipping {account_name} - no wallet address configured")
-            return
+    # Stock Data Collection
+    def _collect_stock_data(self):
+        """Collect data from all configured stock accounts."""
+        self.logger.info("-" * 60)
+        self.logger.info("STOCK ACCOUNTS")
+        self.logger.info("-" * 60)
 
-        try:
-            self.logger.info(f"Collecting {account_name} wallet data")
-            repository = CosmosRepository(self._get_legacy_config())
+        self._collect_accounts("stock", self.config.stock_accounts)
 
-            if network.lower() == "osmosis":
-                repository.get_and_store_wallet(account_name, wallet_address)
-                repository.get_and_store_pools(account_name, wallet_address)
-            else:
-                self.logger.warning(f"Unsupported Cosmos network: {network}")
-                return
+    # Crypto Data Collection
+    def _collect_crypto_data(self):
+        """Collect data from all configured crypto accounts."""
+        self.logger.info("-" * 60)
+        self.logger.info("CRYPTO ACCOUNTS")
+        self.logger.info("-" * 60)
 
-            self.logger.info(f"{account_name} data collection completed")
-        except Exception:
-            self.logger.exception(f"{account_name} data collection failed")
+        self._collect_accounts("crypto", self.config.crypto_accounts)
@@ -0,0 +1,167 @@
+"""Memory instrumentation of Finance Dashboard runs.
+
+When enabled, stages of a run, like constructing an SDK client or collecting a source, are measured
+with tracemalloc:
+
+    with memory.stage("sdk.bunq"):
+        repository = BunqRepository(...)
+
+For every stage the peak of traced memory above the start of the stage, the memory still retained
+at its end, the process RSS and the allocation sites that grew the most are recorded, so the run
+report shows which SDK or DataFrame copy drives the peak. Stages may be nested. When not enabled,
+`stage` does nothing.
+"""
+
+import contextlib
+import sys
+import tracemalloc
+from collections.abc import Iterator
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Any
+
+try:
+    import resource
+except ImportError:  # Not available on Windows
+    resource = None
+
+
+def _rss_bytes() -> int | None:
+    """Get the current resident set size of the process, where /proc is available."""
+    if resource is None:
+        return None
+    try:
+        pages = int(Path("/proc/self/statm").read_text().split()[1])
+    except (OSError, IndexError, ValueError):
+        return None
+    return pages * resource.getpagesize()
+
+
+def _max_rss_bytes() -> int | None:
+    """Get the peak resident set size of the process."""
+    if resource is None:
+        return None
+    max_rss = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # Reported in bytes on macOS and in kilobytes elsewhere
+    return max_rss if sys.platform == "darwin" else max_rss * 1024
+
+
+def _take_snapshot() -> tracemalloc.Snapshot:
+    """Take a snapshot of the traced allocations, leaving out those of the measuring itself."""
+    return tracemalloc.take_snapshot().filter_traces(
+        (tracemalloc.Filter(False, tracemalloc.__file__), tracemalloc.Filter(False, __file__))
+    )
+
+
+@dataclass
+class _ActiveStage:
+    name: str
+    attributes: dict[str, Any]
+    start: int
+    peak: int
+    snapshot: tracemalloc.Snapshot | None = None
+
+
+@dataclass
+class MemoryTracker:
+    """Measures the memory of the stages of a run with tracemalloc."""
+
+    top: int = 10
+    frames: int = 1
+    stages: list[dict[str, Any]] = field(default_factory=list)
+    _active: list[_ActiveStage] = field(default_factory=list)
+    _started_tracing: bool = False
+
+    def start(self):
+        """Start tracing memory allocations, unless they are traced already."""
+        if not tracemalloc.is_tracing():
+            tracemalloc.start(self.frames)
+            self._started_tracing = True
+
+    def stop(self):
+        """Stop tracing memory allocations, when the tracker started tracing them."""
+        self._active.clear()
+        if self._started_tracing:
+            tracemalloc.stop()
+            self._started_tracing = False
+
+    def _update_peaks(self):
+        """Carry the peak since the last reset over to the active stages before it is reset."""
+        _, peak = tracemalloc.get_traced_memory()
+        for active in self._active:
+            active.peak = max(active.peak, peak)
+
+    @contextlib.contextmanager
+    def stage(self, name: str, **attributes: Any) -> Iterator[None]:
+        """Measure the memory of the enclosed block."""
+        if not tracemalloc.is_tracing():
+            yield
+            return
+
+        self._update_peaks()
+        tracemalloc.reset_peak()
+        current, _ = tracemalloc.get_traced_memory()
+        active = _ActiveStage(name, attributes, current, current, _take_snapshot() if self.top else None)
+        self._active.append(active)
+        try:
+            yield
+        finally:
+            self._active.remove(active)
+            current, peak = tracemalloc.get_traced_memory()
+            active.peak = max(active.peak, peak)
+            for parent in self._active:
+                parent.peak = max(parent.peak, active.peak)
+            self.stages.append(self._result(active, current))
+
+    def _result(self, active: _ActiveStage, current: int) -> dict[str, Any]:
+        result = {
+            "stage": active.name,
+            **active.attributes,
+            "peak_bytes": active.peak - active.start,
+            "retained_bytes": current - active.start,
+            "rss_bytes": _rss_bytes(),
+            "max_rss_bytes": _max_rss_bytes(),
+        }
+        if active.snapshot is not None:
+            statistics = _take_snapshot().compare_to(active.snapshot, "lineno")
+            result["top_allocations"] = [
+                {"site": str(statistic.traceback), "size_bytes": statistic.size_diff, "count": statistic.count_diff}
+                for statistic in statistics[: self.top]
+                if statistic.size_diff > 0
+            ]
+        return result
+
+
+_tracker: MemoryTracker | None = None
+
+
+def start(top: int = 10) -> MemoryTracker:
+    """Start measuring the memory of stages."""
+    global _tracker
+
+    _tracker = MemoryTracker(top=top)
+    _tracker.start()
+    return _tracker
+
+
+def stop() -> list[dict[str, Any]]:
+    """Stop measuring memory.
+
+    Returns:
+        Measurements of the stages, in the order they finished
+
+    """
+    global _tracker
+
+    if _tracker is None:
+        return []
+    tracker, _tracker = _tracker, None
+    tracker.stop()
+    return tracker.stages
+
+
+def stage(name: str, **attributes: Any):
+    """Measure the memory of the enclosed block, when memory measuring has been started."""
+    if _tracker is None:
+        return contextlib.nullcontext()
+    return _tracker.stage(name, **attributes)
@@ -4,12 +4,15 @@ import traceback
 import warnings
 from pathlib import Path
 
-import pandas as pd
 from bunq import ApiEnvironmentType
 from bunq.sdk.context.api_context import ApiContext
 from bunq.sdk.context.bunq_context import BunqContext
 from bunq.sdk.model.generated.endpoint import MonetaryAccountApiObject
 
+from finance_dashboard import tracing
+from finance_dashboard.frames import build_frame
+from finance_dashboard.logger.lazy import dump_payload
+
 
 class Bunq:
     """Bunq banking API client for retrieving account information."""
@@ -50,17 +53,19 @@ class Bunq:
 
                 # Try to get accounts with error handling for malformed API responses
                 try:
-                    monetary_accounts = MonetaryAccountApiObject.list(params={"count": "100"})
-                    self.logger.debug(f"Retrieved {len(monetary_accounts.value)} monetary accounts from API")
+                    with tracing.span("api.bunq", endpoint="monetary_accounts"):
+                        monetary_accounts = MonetaryAccountApiObject.list(params={"count": "100"})
+                    self.logger.debug("Retrieved %d monetary accounts from API", len(monetary_accounts.value))
                 except TypeError as e:
                     if "float() argument must be a string or a real number, not 'NoneType'" in str(e):
                         self.logger.warning(
                             "Bunq API returned malformed data with null values. Trying with smaller batch size..."
                         )
                         # Try with smaller batch size to see if it helps
-                        monetary_accounts = MonetaryAccountApiObject.list(params={"count": "50"})
+                        with tracing.span("api.bunq", endpoint="monetary_accounts"):
+                            monetary_accounts = MonetaryAccountApiObject.list(params={"count": "50"})
                         self.logger.debug(
-                            f"Retrieved {len(monetary_accounts.value)} monetary accounts with smaller batch"
+                            "Retrieved %d monetary accounts with smaller batch", len(monetary_accounts.value)
                         )
                     else:
                         raise
@@ -69,12 +74,12 @@ class Bunq:
 
                 for i, monetary_account in enumerate(monetary_accounts.value):
                     try:
-                        self.logger.debug(f"Processing account {i + 1}/{len(monetary_accounts.value)}")
+                        self.logger.debug("Processing account %d/%d", i + 1, len(monetary_accounts.value))
                         account = self.get_account_from_type(monetary_account)
 
                         if account is not None and account.status == "ACTIVE":
                             iban = self.get_alias(account)
-                            self.logger.debug(f"Found active account: {account.description} (IBAN: {iban})")
+                            self.logger.debug("Found active account: %s (IBAN: %s)", account.description, iban)
 
                             # Handle potential null values in balance and currency
                             balance_value = 0.0
@@ -110,7 +115,9 @@ class Bunq:
                                 "NOK",
                                 "DKK",
                             ]:
-                                self.logger.debug(f"Found foreign currency account: {account.description} ({currency})")
+                                self.logger.debug(
+                                    "Found foreign currency account: %s (%s)", account.description, currency
+                                )
 
                             account_data = {
                                 "name": account.description
@@ -121,11 +128,11 @@ class Bunq:
                                 "currency": currency,
                             }
 
-                            self.logger.debug(f"Adding account to results: {account_data}")
+                            self.logger.debug("Adding account to results: %s", dump_payload(account_data))
                             rows.append(account_data)
                         else:
                             status = account.status if account and hasattr(account, "status") else "None"
-                            self.logger.debug(f"Skipping inactive or invalid account (status: {status})")
+                            self.logger.debug("Skipping inactive or invalid account (status: %s)", status)
 
                     except Exception as e:
                         error_details = {
@@ -141,7 +148,7 @@ class Bunq:
                         continue  # Continue with next account
 
                 self.logger.info(f"Successfully processed {len(rows)} active accounts")
-                return pd.DataFrame(rows)
+                return build_frame(rows)
 
         except Exception as e:
             error_details = {
@@ -159,15 +166,15 @@ class Bunq:
         """Create or restore Bunq API context from configuration file."""
         try:
             if Path(self.configuration_file).is_file():
-                self.logger.debug(f"Configuration file exists, restoring API context from: {self.configuration_file}")
+                self.logger.debug("Configuration file exists, restoring API context from: %s", self.configuration_file)
                 api_context = ApiContext.restore(self.configuration_file)
                 self.logger.info("API context restored successfully from existing configuration")
             else:
                 self.logger.debug("Configuration file not found, creating new API context")
                 hostname = socket.gethostname()
-                self.logger.debug(f"Using hostname: {hostname}")
+                self.logger.debug("Using hostname: %s", hostname)
                 api_context = ApiContext.create(ApiEnvironmentType.PRODUCTION, self.api_key, hostname)  # type: ignore[arg-type]
-                self.logger.debug(f"Saving new API context to: {self.configuration_file}")
+                self.logger.debug("Saving new API context to: %s", self.configuration_file)
                 api_context.save(self.configuration_file)
                 self.logger.info("New API context created and saved successfully")
 
@@ -199,11 +206,19 @@ class Bunq:
         except Exception:
             self.logger.exception("Account retrieval failed")
             # Return empty DataFrame as fallback
-            return pd.DataFrame(columns=["name", "iban", "balance", "currency"])
+            return build_frame([], columns=["name", "iban", "balance", "currency"])
         finally:
             # Restore original float adapter
             self._restore_bunq_float_adapter()
 
+    def iter_accounts(self):
+        """Yield the active bank accounts as records.
+
+        The Bunq SDK returns all accounts of a page in one response, so they are retrieved at once
+        and only passed on record by record.
+        """
+        yield from self.retrieve_accounts_safe().to_dict("records")
+
     def _patch_bunq_float_adapter(self):
         """Monkey patch the Bunq SDK's float adapter to handle null values."""
         try:
@@ -2,8 +2,13 @@ import time
 
 import requests
 
+from finance_dashboard import tracing
+
 COINMARKETCAP_BASE_URL = "https://pro-api.coinmarketcap.com"
 
+# Seconds to wait before every CoinMarketCap request, to stay within the rate limit of the API plan
+COINMARKETCAP_REQUEST_INTERVAL = 3
+
 
 class Crypto:
     """Base class for cryptocurrency data retrieval and processing."""
@@ -11,6 +16,7 @@ class Crypto:
     def __init__(self, coinmarketcap_api_key: str):
         self.coinmarketcap_api_key = coinmarketcap_api_key
         self.base_url = COINMARKETCAP_BASE_URL
+        self.request_interval = COINMARKETCAP_REQUEST_INTERVAL
 
     def get_crypto_currency_metadata(self, symbol: str, currency: str):
         """Get cryptocurrency metadata including price from CoinMarketCap API."""
@@ -19,9 +25,10 @@ class Crypto:
 
         try:
             endpoint = "/v1/cryptocurrency/quotes/latest"
-            time.sleep(3)
-            response = requests.get(self.base_url + endpoint, params=params, headers=headers, timeout=30)
-            data = response.json()
+            time.sleep(self.request_interval)
+            with tracing.span("api.coinmarketcap", symbol=symbol):
+                response = requests.get(self.base_url + endpoint, params=params, headers=headers, timeout=30)
+                data = response.json()
 
             if "data" in data and symbol in data["data"]:
                 return {
@@ -1,6 +1,9 @@
-import pandas as pd
+import logging
+
 from coinbase.rest import RESTClient
 
+from finance_dashboard import tracing
+from finance_dashboard.logger.lazy import debug_enabled, dump_payload
 from finance_dashboard.model.crypto import Crypto
 
 
@@ -11,44 +14,32 @@ class Coinbase(Crypto):
         super().__init__(coinmarketcap_api_key)
         self.client = RESTClient(key_file=coinbase_key_file)
 
-    def retrieve_wallet(self, currency: str):
-        """Retrieve wallet balances from Coinbase."""
-        accounts = self.client.get_accounts(250)["accounts"]
-
-        import json
-        import logging
+    def iter_wallet(self, currency: str):
+        """Yield the wallet balances of the Coinbase account that have a price in the given currency."""
+        with tracing.span("api.coinbase", endpoint="accounts"):
+            accounts = self.client.get_accounts(250)["accounts"]
 
         logger = logging.getLogger(__name__)
 
         # Raw data logging
-        logger.debug("=== FULL COINBASE API RESPONSE ===")
-        logger.debug(f"Complete accounts response: {json.dumps(accounts, indent=2, default=str)}")
-        logger.debug("=" * 50)
-
-        rows = []
+        if debug_enabled(logger):
+            logger.debug("=== FULL COINBASE API RESPONSE ===")
+            logger.debug("Complete accounts response: %s", dump_payload(accounts))
+            logger.debug("=" * 50)
 
         for account in accounts:
-            logger.debug(f"Processing account: {json.dumps(account, indent=2, default=str)}")
-            amount = float(account["available_balance"]["value"])
+            logger.debug("Processing account: %s", dump_payload(account))
             symbol = account["available_balance"]["currency"]
             metadata = self.get_crypto_currency_metadata(symbol, currency)
-            logger.debug(f"Metadata for {symbol}: {json.dumps(metadata, indent=2, default=str)}")
-
-            if metadata is not None:
-                price = float(metadata.get("price") or 0)
-                portfolio_value = amount * price
-
-                if portfolio_value > 1:
-                    rows.append(
-                        {
-                            "name": metadata["name"],
-                            "type": "Balance",
-                            "symbol": symbol,
-                            "amount": amount,
-                            "current_value": price,
-                            "portfolio_value": round(portfolio_value, 2),
-                            "currency": currency,
-                        }
-                    )
-
-        return pd.DataFrame(rows)
+            logger.debug("Metadata for %s: %s", symbol, dump_payload(metadata))
+            if metadata is None:
+                continue
+
+            yield {
+                "name": metadata["name"],
+                "type": "Balance",
+                "symbol": symbol,
+                "amount": float(account["available_balance"]["value"]),
+                "current_value": float(metadata.get("price") or 0),
+                "currency": currency,
+            }
@@ -1,10 +1,10 @@
 import json
 import math
-from urllib.parse import quote
+from urllib.parse import quote, urlsplit
 
-import pandas as pd
 import requests
 
+from finance_dashboard import tracing
 from finance_dashboard.model.crypto import Crypto
 
 
@@ -17,93 +17,66 @@ class Cosmos(Crypto):
         self.lcd_url = lcd_url
         self.rpc_url = rpc_url
 
-    def retrieve_wallet(self, address: str, currency: str):
-        """Retrieve wallet balances from Cosmos address."""
-        balances = self.get_balances_from_address(address)
-        rows = []
-
-        for balance in balances:
+    def iter_wallet(self, address: str, currency: str):
+        """Yield the balances of a Cosmos address that have a price in the given currency."""
+        for balance in self.get_balances_from_address(address):
             metadata = self.get_coin_metadata(denom=balance["denom"])
-            amount = balance["amount"]
-
-            if metadata:
-                currency_metadata = self.get_crypto_currency_metadata(metadata["symbol"], currency)
-
-                if currency_metadata is not None:
-                    current_value = currency_metadata.get("price", 0)
-                    if current_value is None:
-                        current_value = 0
-                    exponent = metadata.get("exponent", 0)
-                    amount = float(amount) / math.pow(10, exponent)
-                    portfolio_value = amount * current_value
-
-                    if portfolio_value > 1:
-                        rows.append(
-                            {
-                                "name": metadata["name"],
-                                "type": "Balance",
-                                "symbol": metadata["symbol"],
-                                "amount": amount,
-                                "current_value": current_value,
-                                "portfolio_value": round(portfolio_value, 2),
-                                "currency": currency,
-                            }
-                        )
-
-        return pd.DataFrame(rows)
-
-    def retrieve_osmosis_pools(self, address: str, currency: str):
-        """Retrieve staking pool balances from Osmosis."""
-        defis = self.get_balances_from_pool(address)
-        rows = []
-
-        for defi in defis:
+            if not metadata:
+                continue
+
+            currency_metadata = self.get_crypto_currency_metadata(metadata["symbol"], currency)
+            if currency_metadata is None:
+                continue
+
+            exponent = metadata.get("exponent", 0)
+            yield {
+                "name": metadata["name"],
+                "type": "Balance",
+                "symbol": metadata["symbol"],
+                "amount": float(balance["amount"]) / math.pow(10, exponent),
+                "current_value": currency_metadata.get("price") or 0,
+                "currency": currency,
+            }
+
+    def iter_osmosis_pools(self, address: str, currency: str):
+        """Yield the staking pool balances of an Osmosis address that have a price in the given currency."""
+        for defi in self.get_balances_from_pool(address):
             pool_id = defi["denom"].split("/")[-1]
             metadata = self.get_osmosis_pool_metadata(pool_id)
             amount = self.calculate_pool_amount(defi["denom"], defi["amount"])
+            if not metadata:
+                continue
+
+            currency_metadata = self.get_crypto_currency_metadata(metadata["secondary_symbol"], currency)
+            if currency_metadata is None:
+                continue
+
+            exponent = metadata.get("exponent", 0)
+            yield {
+                "name": f"{metadata['primary_symbol']} / {metadata['secondary_symbol']} Pool",
+                "type": "DeFi",
+                "symbol": f"{metadata['primary_symbol']}/{metadata['secondary_symbol']}",
+                "amount": float(amount) / math.pow(10, exponent),
+                "current_value": currency_metadata.get("price") or 0,
+                "currency": currency,
+            }
 
-            if metadata:
-                currency_metadata = self.get_crypto_currency_metadata(metadata["secondary_symbol"], currency)
-
-                if currency_metadata is not None:
-                    current_value = currency_metadata.get("price", 0)
-                    if current_value is None:
-                        current_value = 0
-                    exponent = metadata.get("exponent", 0)
-                    amount = float(amount) / math.pow(10, exponent)
-                    portfolio_value = amount * current_value
-
-                    if portfolio_value > 1:
-                        rows.append(
-                            {
-                                "name": f"{metadata['primary_symbol']} / {metadata['secondary_symbol']} Pool",
-                                "type": "DeFi",
-                                "symbol": f"{metadata['primary_symbol']}/{metadata['secondary_symbol']}",
-                                "amount": amount,
-                                "current_value": current_value,
-                                "portfolio_value": round(portfolio_value, 2),
-                                "currency": currency,
-                            }
-                        )
-
-        return pd.DataFrame(rows)
+    def _get_json(self, url: str):
+        """Get the JSON response of an Osmosis API or LCD endpoint."""
+        with tracing.span("api.osmosis", endpoint=urlsplit(url).path):
+            return json.loads(requests.get(url, timeout=60).content)
 
     def get_balances_from_address(self, address: str):
         """Get balance data from a Cosmos address via LCD API."""
         responses = []
 
         endpoint = "/cosmos/bank/v1beta1/balances/"
-        results = json.loads(requests.get(self.lcd_url + endpoint + address, timeout=60).content)
+        results = self._get_json(self.lcd_url + endpoint + address)
         responses += results["balances"]
         pagination = results["pagination"]["next_key"]
 
         while pagination is not None:
-            results = json.loads(
-                requests.get(
-                    self.lcd_url + endpoint + "?pagination.key=" + quote(str(pagination)),
-                    timeout=60,
-                ).content
-            )
+            results = self._get_json(self.lcd_url + endpoint + "?pagination.key=" + quote(str(pagination)))
             responses += results["balances"]
             pagination = results["pagination"]["next_key"]
 
@@ -112,25 +85,25 @@ class Cosmos(Crypto):
     def get_balances_from_pool(self, address: str):
         """Get staking pool delegation balances from Osmosis."""
         endpoint = "/osmosis/superfluid/v1beta1/total_delegation_by_delegator/"
-        results = json.loads(requests.get(self.lcd_url + endpoint + address, timeout=60).content)
+        results = self._get_json(self.lcd_url + endpoint + address)
         return results["total_delegated_coins"]
 
     def get_coin_metadata(self, symbol: str | None = None, denom: str | None = None):
         """Get coin metadata from symbol or denomination."""
         if denom:
             endpoint = "/search/v1/symbol?denom="
-            response = json.loads(requests.get(self.api_url + endpoint + denom, timeout=60).content)
+            response = self._get_json(self.api_url + endpoint + denom)
             symbol = response.get("symbol", None)
         if symbol:
             endpoint = f"/tokens/v2/{symbol}"
-            return json.loads(requests.get(self.api_url + endpoint, timeout=60).content)[0]
+            return self._get_json(self.api_url + endpoint)[0]
         return None
 
     def get_osmosis_pool_metadata(self, pool_id: str | None = None):
         """Get Osmosis pool metadata by pool ID."""
         if pool_id:
             endpoint = f"/pools/v2/{pool_id}"
-            response = json.loads(requests.get(self.api_url + endpoint, timeout=60).content)
+            response = self._get_json(self.api_url + endpoint)
 
             metadata_primary_coin = response[0]
             metadata_secondary_coin = response[1]
@@ -145,6 +118,6 @@ class Cosmos(Crypto):
     def calculate_pool_amount(self, denom: str, amount: str):
         """Calculate actual pool amount using asset multiplier."""
         endpoint = "/osmosis/superfluid/v1beta1/asset_multiplier?denom="
-        response = json.loads(requests.get(self.lcd_url + endpoint + denom, timeout=60).content)
+        response = self._get_json(self.lcd_url + endpoint + denom)
         multiplier = response["osmo_equivalent_multiplier"]["multiplier"]
         return float(amount) * float(multiplier) * 2
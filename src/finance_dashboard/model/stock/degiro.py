@@ -1,11 +1,12 @@
-import json
 import logging
 
-import pandas as pd
 from degiro_connector.trading.api import API
 from degiro_connector.trading.models.account import UpdateOption, UpdateRequest
 from degiro_connector.trading.models.credentials import Credentials
 
+from finance_dashboard import tracing
+from finance_dashboard.logger.lazy import debug_enabled, dump_payload
+
 
 class DeGiro:
     """DeGiro trading platform connector for retrieving stock and account data."""
@@ -24,42 +25,48 @@ class DeGiro:
 
     def search_stock(self, product_id: str):
         """Search for stock information by product ID."""
-        products_info = self.trading_api.get_products_info(
-            product_list=[product_id],
-            raw=True,
-        )
+        with tracing.span("api.degiro", endpoint="products_info"):
+            products_info = self.trading_api.get_products_info(
+                product_list=[product_id],
+                raw=True,
+            )
 
         logger = logging.getLogger(__name__)
-        logger.debug("=== FULL DEGIRO PRODUCT INFO API RESPONSE ===")
-        logger.debug(f"Product ID: {product_id}")
-        logger.debug(f"Full API Response: {json.dumps(products_info, indent=2, default=str)}")
-        logger.debug("=" * 50)
+        if debug_enabled(logger):
+            logger.debug("=== FULL DEGIRO PRODUCT INFO API RESPONSE ===")
+            logger.debug(f"Product ID: {product_id}")
+            logger.debug("Full API Response: %s", dump_payload(products_info))
+            logger.debug("=" * 50)
 
         return products_info
 
-    def retrieve_stocks(self):
-        """Retrieve current stock portfolio holdings."""
-        update = self.trading_api.get_update(
-            request_list=[
-                UpdateRequest(
-                    option=UpdateOption.PORTFOLIO,
-                    last_updated=0,
-                ),
-            ],
-            raw=True,
-        )
+    def iter_stocks(self):
+        """Yield the current stock portfolio holdings."""
+        with tracing.span("api.degiro", endpoint="portfolio"):
+            update = self.trading_api.get_update(
+                request_list=[
+                    UpdateRequest(
+                        option=UpdateOption.PORTFOLIO,
+                        last_updated=0,
+                    ),
+                ],
+                raw=True,
+            )
 
         logger = logging.getLogger(__name__)
+        debug = debug_enabled(logger)
 
-        portfolio_df = pd.DataFrame(update["portfolio"]["value"])
-        rows = []
+        # Running totals for the portfolio summary, so the holdings don't need to be kept
+        total_stocks = 0
+        total_portfolio_eur = 0.0
+        market_values = {"USD": 0.0, "EUR": 0.0}
 
-        for item in portfolio_df.index:
-            item_metadata = {entry["name"]: entry.get("value", None) for entry in portfolio_df["value"][item]}
+        for position in update["portfolio"]["value"]:
+            item_metadata = {entry["name"]: entry.get("value", None) for entry in position["value"]}
             item_amount = int(item_metadata["size"])
 
             if item_metadata["positionType"] == "PRODUCT" and item_amount > 0:
-                product_id = str(portfolio_df["id"][item])
+                product_id = str(position["id"])
                 stock_metadata = self.search_stock(product_id)
 
                 currency = stock_metadata["data"][product_id]["currency"]
@@ -88,73 +95,66 @@ class DeGiro:
                     converted_currency = original_currency
 
                 # Show parsed values without override
-                stock_name = stock_metadata["data"][product_id]["name"]
-
-                logger.debug(f"DeGiro Stock: {stock_name}")
-                logger.debug(f"  API Currency: {currency}")
-                logger.debug(f"  Purchase Value: {purchase_value}")
-                logger.debug(f"  Current Value: {current_value}")
-                logger.debug(f"  Portfolio Value: {portfolio_value}")
-                logger.debug(f"  Real Market Value: {original_market_value} {original_currency}")
-                logger.debug(f"  Converted Value: {converted_value:.2f} {converted_currency}")
-                logger.debug(f"  Product ID: {product_id}")
-
-                rows.append(
-                    {
-                        "name": stock_metadata["data"][product_id]["name"],
-                        "symbol": stock_metadata["data"][product_id]["symbol"],
-                        "amount": item_amount,
-                        "purchase_value": purchase_value,
-                        "current_value": current_value,
-                        "portfolio_value": round(converted_value, 2),  # Gebruik geconverteerde waarde
-                        "original_portfolio_value": round(original_market_value, 2),
-                        "original_currency": original_currency,
-                        "currency": converted_currency,  # Nu altijd EUR (of origineel als conversie faalt)
-                    }
-                )
+                if debug:
+                    logger.debug(f"DeGiro Stock: {stock_metadata['data'][product_id]['name']}")
+                    logger.debug(f"  API Currency: {currency}")
+                    logger.debug(f"  Purchase Value: {purchase_value}")
+                    logger.debug(f"  Current Value: {current_value}")
+                    logger.debug(f"  Portfolio Value: {portfolio_value}")
+                    logger.debug(f"  Real Market Value: {original_market_value} {original_currency}")
+                    logger.debug(f"  Converted Value: {converted_value:.2f} {converted_currency}")
+                    logger.debug(f"  Product ID: {product_id}")
+
+                total_stocks += 1
+                total_portfolio_eur += round(converted_value, 2)
+                if original_currency in market_values:
+                    market_values[original_currency] += round(original_market_value, 2)
+
+                yield {
+                    "name": stock_metadata["data"][product_id]["name"],
+                    "symbol": stock_metadata["data"][product_id]["symbol"],
+                    "amount": item_amount,
+                    "purchase_value": purchase_value,
+                    "current_value": current_value,
+                    "portfolio_value": round(converted_value, 2),  # Gebruik geconverteerde waarde
+                    "original_portfolio_value": round(original_market_value, 2),
+                    "original_currency": original_currency,
+                    "currency": converted_currency,  # Nu altijd EUR (of origineel als conversie faalt)
+                }
 
         # Toon totaal portfolio overzicht
-        total_stocks = len(rows)
-
-        # Groepeer per originele valuta voor details
-        usd_stocks = [row for row in rows if row["original_currency"] == "USD"]
-        eur_stocks = [row for row in rows if row["original_currency"] == "EUR"]
-
-        total_usd_market_value = sum(row["original_portfolio_value"] for row in usd_stocks)
-        total_eur_market_value = sum(row["original_portfolio_value"] for row in eur_stocks)
-
-        # Totaal portfolio waarde in EUR (na conversie)
-        total_portfolio_eur = sum(row["portfolio_value"] for row in rows)
-
-        logger.debug("=" * 80)
-        logger.debug("COMPLETE DEGIRO PORTFOLIO SUMMARY:")
-        logger.debug(f"Total number of different stocks: {total_stocks}")
-        logger.debug(f"TOTAL PORTFOLIO VALUE (EUR): {total_portfolio_eur:,.2f} EUR")
-        logger.debug(f"USD Market Value: {total_usd_market_value:,.2f} USD")
-        logger.debug(f"EUR Market Value: {total_eur_market_value:,.2f} EUR")
-        logger.debug("=" * 80)
-
-        logger.info(f"DeGiro retrieved {len(rows)} stocks")
-        return pd.DataFrame(rows)
-
-    def retrieve_account(self):
-        """Retrieve account balance information."""
-        update = self.trading_api.get_update(
-            request_list=[
-                UpdateRequest(
-                    option=UpdateOption.TOTAL_PORTFOLIO,
-                    last_updated=0,
-                ),
-            ],
-            raw=True,
-        )
+        if debug:
+            logger.debug("=" * 80)
+            logger.debug("COMPLETE DEGIRO PORTFOLIO SUMMARY:")
+            logger.debug(f"Total number of different stocks: {total_stocks}")
+            logger.debug(f"TOTAL PORTFOLIO VALUE (EUR): {total_portfolio_eur:,.2f} EUR")
+            logger.debug(f"USD Market Value: {market_values['USD']:,.2f} USD")
+            logger.debug(f"EUR Market Value: {market_values['EUR']:,.2f} EUR")
+            logger.debug("=" * 80)
+
+        logger.info(f"DeGiro retrieved {total_stocks} stocks")
+
+    def iter_account(self):
+        """Yield the account balance information."""
+        with tracing.span("api.degiro", endpoint="total_portfolio"):
+            update = self.trading_api.get_update(
+                request_list=[
+                    UpdateRequest(
+                        option=UpdateOption.TOTAL_PORTFOLIO,
+                        last_updated=0,
+                    ),
+                ],
+                raw=True,
+            )
 
-        client_details_table = self.trading_api.get_client_details()
+        with tracing.span("api.degiro", endpoint="client_details"):
+            client_details_table = self.trading_api.get_client_details()
 
         logger = logging.getLogger(__name__)
 
-        total_portfolio_df = pd.DataFrame(update["totalPortfolio"])
-        total_portfolio_metadata = {entry["name"]: entry.get("value", None) for entry in total_portfolio_df["value"]}
+        total_portfolio_metadata = {
+            entry["name"]: entry.get("value", None) for entry in update["totalPortfolio"]["value"]
+        }
 
         logger.debug("Total portfolio metadata retrieved for DeGiro account")
 
@@ -164,17 +164,13 @@ class DeGiro:
         logger.debug(f"DeGiro Account - Currency: {account_currency}, Total Cash: {account_balance}")
         logger.debug(f"  IBAN: {client_details_table['data']['flatexBankAccount']['iban']}")
 
-        rows = [
-            {
-                "name": "Flatex",
-                "iban": client_details_table["data"]["flatexBankAccount"]["iban"],
-                "balance": account_balance,
-                "currency": account_currency,
-            }
-        ]
-
         logger.info(f"DeGiro account data retrieved with currency: {account_currency}")
-        return pd.DataFrame(rows)
+        yield {
+            "name": "Flatex",
+            "iban": client_details_table["data"]["flatexBankAccount"]["iban"],
+            "balance": account_balance,
+            "currency": account_currency,
+        }
 
     def logout(self):
         """Logout from DeGiro session."""
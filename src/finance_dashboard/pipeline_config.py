@@ -57,12 +57,22 @@ class PipelineConfig:
         """Get preferred currency."""
         return self._config.get("global", {}).get("preferred_currency", "EUR")
 
+    @property
+    def dataframe_backend(self) -> str:
+        """Get the backend of the DataFrames built by the models (numpy, arrow)."""
+        return self._config.get("global", {}).get("dataframe_backend", "numpy")
+
     # Database Configuration
     @property
     def database_connector(self) -> str:
-        """Get database connector type."""
+        """Get database connector type (bigquery, sqlite)."""
         return self._config.get("database", {}).get("connector", "bigquery")
 
+    @property
+    def database_sqlite_path(self) -> str:
+        """Get path of the SQLite database file used by the sqlite connector."""
+        return self._config.get("database", {}).get("sqlite_path", "data/finance.db")
+
     @property
     def database_credentials_path(self) -> str:
         """Get database credentials path."""
@@ -83,6 +93,62 @@ class PipelineConfig:
         """Get database location."""
         return self._config.get("database", {}).get("location", "europe-west4")
 
+    @property
+    def database_metadata_cache_path(self) -> str:
+        """Get path of the file persisting verified datasets, tables and views between runs."""
+        return self._config.get("database", {}).get("metadata_cache_path", ".cache/bigquery_metadata.json")
+
+    @property
+    def database_metadata_cache_ttl(self) -> int:
+        """Get number of seconds a verified dataset, table or view is trusted without checking again."""
+        return int(self._config.get("database", {}).get("metadata_cache_ttl", 86400))
+
+    @property
+    def database_write_mode(self) -> str:
+        """Get database write mode (immediate, buffered, async, transaction)."""
+        return self._config.get("database", {}).get("write_mode", "immediate")
+
+    @property
+    def database_buffer_max_rows(self) -> int:
+        """Get number of buffered rows per table that triggers an early write."""
+        return int(self._config.get("database", {}).get("buffer_max_rows", 10000))
+
+    @property
+    def database_max_pending_writes(self) -> int:
+        """Get number of writes that may be queued in async write mode before store_data blocks."""
+        return int(self._config.get("database", {}).get("max_pending_writes", 8))
+
+    @property
+    def database_totals_history_path(self) -> str:
+        """Get path of the local history of daily totals used for the daily summary."""
+        return self._config.get("database", {}).get("totals_history_path", ".cache/daily_totals.json")
+
+    @property
+    def database_spool_enabled(self) -> bool:
+        """Get flag to write collected data to a local spool before writing it to the database."""
+        return self._config.get("database", {}).get("spool_enabled", False)
+
+    @property
+    def database_spool_path(self) -> str:
+        """Get directory of the local write-ahead spool."""
+        return self._config.get("database", {}).get("spool_path", ".cache/spool")
+
+    @property
+    def database_skip_unchanged(self) -> bool:
+        """Get flag to skip writing rows that are unchanged since they were last written."""
+        return self._config.get("database", {}).get("skip_unchanged", False)
+
+    @property
+    def database_snapshot_hashes_path(self) -> str:
+        """Get path of the file with the content hashes of the last written rows."""
+        return self._config.get("database", {}).get("snapshot_hashes_path", ".cache/snapshot_hashes.json")
+
+    @property
+    def database_query_budget_bytes(self) -> int | None:
+        """Get maximum number of bytes a single query may process, None disables the dry-run check."""
+        budget = self._config.get("database", {}).get("query_budget_bytes")
+        return int(budget) if budget is not None else None
+
     @property
     def table_names(self) -> dict[str, str]:
         """Get table names configuration."""
@@ -90,6 +156,32 @@ class PipelineConfig:
             "table_names", {"accounts": "bank-accounts", "stocks": "stocks", "crypto": "crypto", "total": "total"}
         )
 
+    # Reporting Configuration
+    @property
+    def reporting_enabled(self) -> bool:
+        """Get run report enabled flag."""
+        return self._config.get("reporting", {}).get("enabled", False)
+
+    @property
+    def reporting_directory(self) -> str:
+        """Get directory the run reports are written to."""
+        return self._config.get("reporting", {}).get("directory", "reports")
+
+    @property
+    def reporting_memory(self) -> bool:
+        """Get whether the memory of the run stages is measured and added to the run report."""
+        return self._config.get("reporting", {}).get("memory", False)
+
+    @property
+    def reporting_memory_top(self) -> int:
+        """Get number of allocation sites reported per measured stage."""
+        return int(self._config.get("reporting", {}).get("memory_top", 10))
+
+    @property
+    def reporting_prometheus_textfile(self) -> str | None:
+        """Get path of the Prometheus textfile the run metrics are written to, None when disabled."""
+        return self._config.get("reporting", {}).get("prometheus_textfile")
+
     # Logging Configuration
     @property
     def logging_type(self) -> str:
@@ -113,6 +205,11 @@ class PipelineConfig:
         """Get Telegram send summary flag."""
         return self._config.get("logging", {}).get("telegram", {}).get("send_summary", False)
 
+    @property
+    def telegram_error_digest(self) -> bool:
+        """Get whether repeated errors are sent as one digest at the end of the run."""
+        return self._config.get("logging", {}).get("telegram", {}).get("error_digest", True)
+
     @property
     def telegram_dashboard_url(self) -> str:
         """Get Telegram dashboard URL."""
@@ -190,12 +287,21 @@ class PipelineConfig:
         errors = []
 
         # Validate database configuration
-        if not self.database_project_id:
+        if self.database_connector not in ("bigquery", "sqlite"):
+            errors.append(f"Unknown database connector: {self.database_connector}")
+
+        if self.database_connector == "bigquery" and not self.database_project_id:
             errors.append("Database project ID not configured in pipeline YAML")
 
-        if not self.database_schema_id:
+        if self.database_connector == "bigquery" and not self.database_schema_id:
             errors.append("Database schema ID not configured in pipeline YAML")
 
+        if self.dataframe_backend not in ("numpy", "arrow"):
+            errors.append(f"Unknown DataFrame backend: {self.dataframe_backend}")
+
+        if self.database_write_mode not in ("immediate", "buffered", "async", "transaction"):
+            errors.append(f"Unknown database write mode: {self.database_write_mode}")
+
         # Validate at least one data source is enabled
         if not (self.bank_enabled or self.stock_enabled or self.crypto_enabled):
             errors.append("No data sources enabled (enable at least bank, stock, or crypto)")
@@ -0,0 +1,244 @@
+"""Profiling of Finance Dashboard runs, scoped per source.
+
+The pipeline calls `Profiler.scope(source)` around the collection of every account, so each source
+gets its own profile. Two profilers are available:
+
+- ``sampling``: samples the stacks of all threads at a fixed interval with little overhead. Writes
+  collapsed stacks per source (`<source>.collapsed`), which flamegraph.pl and speedscope read
+- ``cprofile``: deterministic profiling with cProfile, which counts every call but slows down the
+  run. Writes a pstats file per source (`<source>.prof`), which snakeviz and gprof2dot read
+
+Both also write a report with the top functions per source, and the sampling profiler adds the
+time per top-level package, so SDK deserialization, pandas and network time are told apart.
+"""
+
+import io
+import re
+import sys
+import threading
+import time
+from abc import ABC, abstractmethod
+from collections import Counter
+from collections.abc import Iterator
+from contextlib import AbstractContextManager, contextmanager
+from pathlib import Path
+from typing import TYPE_CHECKING
+
+if TYPE_CHECKING:
+    # Imported when profiling starts, so cProfile is not loaded by runs that are not profiled
+    import cProfile
+
+PROFILERS = ("sampling", "cprofile")
+
+# Scope of everything that runs outside of a source, like setup and the final flush
+MAIN_SCOPE = "main"
+
+# Scope of the samples of other threads, like background database writes
+BACKGROUND_SCOPE = "background"
+
+
+def _file_name(scope: str) -> str:
+    return re.sub(r"[^\w.-]+", "_", scope).strip("_") or "unnamed"
+
+
+class Profiler(ABC):
+    """Base class of the profilers."""
+
+    def __init__(self, top: int = 20):
+        self.top = top
+
+    @abstractmethod
+    def start(self):
+        """Start profiling, attributing to the main scope."""
+
+    @abstractmethod
+    def stop(self):
+        """Stop profiling."""
+
+    @abstractmethod
+    def scope(self, source: str) -> AbstractContextManager[None]:
+        """Attribute everything that runs in the enclosed block to a source."""
+
+    @abstractmethod
+    def write(self, directory: str | Path) -> list[Path]:
+        """Write the profiles to a directory.
+
+        Returns:
+            Paths of the written files
+
+        """
+
+
+class SamplingProfiler(Profiler):
+    """Samples the stacks of all threads from a background thread."""
+
+    def __init__(self, interval: float = 0.005, top: int = 20):
+        super().__init__(top)
+        self.interval = interval
+        self._scope = MAIN_SCOPE
+        self._stacks: dict[str, Counter] = {}
+        self._stop = threading.Event()
+        self._thread = None
+        self._main_thread_id = threading.main_thread().ident
+
+    def start(self):
+        """Start sampling."""
+        self._stop.clear()
+        self._thread = threading.Thread(target=self._sample, name="profiler", daemon=True)
+        self._thread.start()
+
+    def stop(self):
+        """Stop sampling."""
+        if self._thread is None:
+            return
+        self._stop.set()
+        self._thread.join()
+        self._thread = None
+
+    @contextmanager
+    def scope(self, source: str) -> Iterator[None]:
+        """Attribute the samples of the main thread in the enclosed block to a source."""
+        previous, self._scope = self._scope, source
+        try:
+            yield
+        finally:
+            self._scope = previous
+
+    @staticmethod
+    def _frame_name(frame) -> str:
+        code = frame.f_code
+        return f"{frame.f_globals.get('__name__', '?')}:{code.co_qualname}"
+
+    def _sample(self):
+        own_id = threading.get_ident()
+        while not self._stop.wait(self.interval):
+            for thread_id, frame in sys._current_frames().items():
+                if thread_id == own_id:
+                    continue
+
+                stack = []
+                while frame is not None:
+                    stack.append(self._frame_name(frame))
+                    frame = frame.f_back
+                scope = self._scope if thread_id == self._main_thread_id else BACKGROUND_SCOPE
+                self._stacks.setdefault(scope, Counter())[";".join(reversed(stack))] += 1
+
+    def _report(self, scope: str, stacks: Counter) -> str:
+        total = sum(stacks.values())
+        own: Counter = Counter()
+        cumulative: Counter = Counter()
+        packages: Counter = Counter()
+        for stack, samples in stacks.items():
+            frames = stack.split(";")
+            own[frames[-1]] += samples
+            packages[frames[-1].split(".", 1)[0].split(":", 1)[0]] += samples
+            for name in set(frames):
+                cumulative[name] += samples
+
+        lines = [
+            f"{scope}: {total} samples, {total * self.interval:.2f}s",
+            "",
+            f"{'own %':>7} {'total %':>8}  function",
+        ]
+        for name, samples in own.most_common(self.top):
+            lines.append(f"{samples / total:7.1%} {cumulative[name] / total:8.1%}  {name}")
+        lines += ["", f"{'own %':>7}  package"]
+        for package, samples in packages.most_common(self.top):
+            lines.append(f"{samples / total:7.1%}  {package}")
+        return "\n".join(lines)
+
+    def write(self, directory: str | Path) -> list[Path]:
+        """Write collapsed stacks and a report of the top functions and packages per source."""
+        directory = Path(directory)
+        directory.mkdir(parents=True, exist_ok=True)
+
+        paths = []
+        reports = []
+        for scope, stacks in sorted(self._stacks.items()):
+            path = directory / f"{_file_name(scope)}.collapsed"
+            path.write_text("".join(f"{stack} {samples}\n" for stack, samples in stacks.items()), encoding="utf-8")
+            paths.append(path)
+            reports.append(self._report(scope, stacks))
+
+        report_path = directory / "report.txt"
+        report_path.write_text("\n\n\n".join(reports) + "\n", encoding="utf-8")
+        paths.append(report_path)
+        return paths
+
+
+class DeterministicProfiler(Profiler):
+    """Profiles every call of the main thread with cProfile, one profile per source."""
+
+    def __init__(self, top: int = 20):
+        super().__init__(top)
+        self._profiles: dict[str, cProfile.Profile] = {}
+        self._current: cProfile.Profile | None = None
+
+    def _switch(self, scope: str | None):
+        import cProfile
+
+        if self._current is not None:
+            self._current.disable()
+        self._current = None if scope is None else self._profiles.setdefault(scope, cProfile.Profile())
+        if self._current is not None:
+            self._current.enable()
+
+    def start(self):
+        """Start profiling the main scope."""
+        self._switch(MAIN_SCOPE)
+
+    def stop(self):
+        """Stop profiling."""
+        self._switch(None)
+
+    @contextmanager
+    def scope(self, source: str) -> Iterator[None]:
+        """Profile the enclosed block in the profile of a source."""
+        previous = next((scope for scope, profile in self._profiles.items() if profile is self._current), None)
+        self._switch(source)
+        try:
+            yield
+        finally:
+            self._switch(previous)
+
+    def write(self, directory: str | Path) -> list[Path]:
+        """Write a pstats file and a report of the top functions per source."""
+        import pstats
+
+        directory = Path(directory)
+        directory.mkdir(parents=True, exist_ok=True)
+
+        paths = []
+        reports = []
+        for scope, profile in sorted(self._profiles.items()):
+            path = directory / f"{_file_name(scope)}.prof"
+            profile.dump_stats(path)
+            paths.append(path)
+
+            output = io.StringIO()
+            pstats.Stats(profile, stream=output).sort_stats(pstats.SortKey.TIME).print_stats(self.top)
+            reports.append(f"{scope}:\n{output.getvalue().strip()}")
+
+        report_path = directory / "report.txt"
+        report_path.write_text("\n\n\n".join(reports) + "\n", encoding="utf-8")
+        paths.append(report_path)
+        return paths
+
+
+def create_profiler(name: str, top: int = 20) -> Profiler:
+    """Create a profiler by name.
+
+    Raises:
+        ValueError: When the profiler is unknown
+
+    """
+    if name == "sampling":
+        return SamplingProfiler(top=top)
+    if name == "cprofile":
+        return DeterministicProfiler(top=top)
+    raise ValueError(f"Unknown profiler: {name}")
+
+
+def output_directory(base: str | Path) -> Path:
+    """Get a new directory for the profiles of this run."""
+    return Path(base) / time.strftime("%Y%m%d_%H%M%S")
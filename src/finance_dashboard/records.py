@@ -0,0 +1,125 @@
+"""Streaming record pipeline for Finance Dashboard.
+
+Models yield their holdings as records (dictionaries of column name to value). The repositories
+pass these records through shared generator stages that log, convert and annotate them one at a
+time, and a sink stores them in batches. Only one batch is held in memory, however many holdings
+a source has.
+"""
+
+import logging
+from collections.abc import Callable, Iterable, Iterator
+from datetime import date
+from itertools import islice
+from typing import Any
+
+from finance_dashboard import tracing
+from finance_dashboard.connector import Connector
+from finance_dashboard.frames import build_frame
+
+Record = dict[str, Any]
+
+
+def filter_records(records: Iterable[Record], predicate: Callable[[Record], bool]) -> Iterator[Record]:
+    """Keep the records for which the predicate is true."""
+    return (record for record in records if predicate(record))
+
+
+def is_significant(record: Record) -> bool:
+    """Check whether a holding is worth more than 1 unit of its currency, to leave out dust."""
+    return record["amount"] * record["current_value"] > 1
+
+
+def is_significant_or_unpriced(record: Record) -> bool:
+    """Check whether a holding is significant or has no price, which keeps tokens that can't be valued."""
+    return is_significant(record) or record["current_value"] == 0
+
+
+def value_records(records: Iterable[Record]) -> Iterator[Record]:
+    """Add the portfolio value, the amount times the current value, to every record."""
+    for record in records:
+        record["portfolio_value"] = round(record["amount"] * record["current_value"], 2)
+        yield record
+
+
+def log_records(records: Iterable[Record], logger: logging.Logger, prefix: str) -> Iterator[Record]:
+    """Log every record at debug level while passing it on."""
+    debug = logger.isEnabledFor(logging.DEBUG)
+    for record in records:
+        if debug:
+            logger.debug(f"{prefix} {' | '.join(f'{key}: {value}' for key, value in record.items())}")
+        yield record
+
+
+def convert_records(records: Iterable[Record], converter, columns: list[str]) -> Iterator[Record]:
+    """Convert the value columns of every record to the converter's reference currency.
+
+    Each currency's rate is looked up once. Records in an unsupported currency keep their values,
+    and for every record that is not in the preferred currency the original values and currency
+    are kept in `original_*` columns.
+    """
+    logger = logging.getLogger(__name__)
+    preferred_currency = converter.ref_currency
+    rates: dict[str, float] = {}
+
+    for record in records:
+        currency = record.get("currency")
+        if currency != preferred_currency:
+            supported = currency in converter.currencies
+            if supported and currency not in rates:
+                with tracing.span("fx.rate", currency=currency):
+                    rates[currency] = converter.convert(1.0, currency, preferred_currency)
+                logger.debug(f"Rate {currency} -> {preferred_currency}: {rates[currency]}")
+            elif not supported:
+                logger.warning(
+                    f"Currency {currency} is not supported by the currency converter. "
+                    f"Skipping conversion for '{record.get('name', 'Unknown')}'"
+                )
+
+            for column in columns:
+                value = record.get(column)
+                if value is None:
+                    continue
+                record[f"original_{column}"] = value
+                if supported:
+                    record[column] = round(value * rates[currency], 2)
+
+            record["original_currency"] = currency
+            if supported:
+                record["currency"] = preferred_currency
+
+        yield record
+
+
+def annotate_records(records: Iterable[Record], source: str, day: date) -> Iterator[Record]:
+    """Add the date and source to every record."""
+    for record in records:
+        yield {"date": day, "source": source, **record}
+
+
+def batched(records: Iterable[Record], size: int) -> Iterator[list[Record]]:
+    """Group records in lists of at most `size` records."""
+    iterator = iter(records)
+    while batch := list(islice(iterator, size)):
+        yield batch
+
+
+class RecordSink:
+    """Stores records with a connector, one DataFrame per batch."""
+
+    def __init__(self, connector: Connector, table_name: str, batch_size: int = 500):
+        self.connector = connector
+        self.table_name = table_name
+        self.batch_size = batch_size
+
+    def consume(self, records: Iterable[Record]) -> int:
+        """Store all records in batches.
+
+        Returns:
+            Number of stored records
+
+        """
+        count = 0
+        for batch in batched(records, self.batch_size):
+            self.connector.store_data(build_frame(batch), self.table_name)
+            count += len(batch)
+        return count
@@ -0,0 +1,53 @@
+"""Per-run report for Finance Dashboard.
+
+Components add their metrics to named sections during the run, and the report is written as a
+single JSON file at the end of the run.
+"""
+
+import json
+import logging
+from datetime import datetime
+from pathlib import Path
+from typing import Any
+
+
+class RunReport:
+    """Collects metrics of a single run and writes them to a JSON file."""
+
+    def __init__(self, directory: str | None = "reports"):
+        self.directory = Path(directory) if directory else None
+        self.started_at = datetime.now()
+        self.logger = logging.getLogger(__name__)
+        self.sections: dict[str, Any] = {}
+
+    def set(self, section: str, data: Any):
+        """Set the data of a section, replacing any previous data."""
+        self.sections[section] = data
+
+    def write(self) -> Path | None:
+        """Write the report to `run_<timestamp>.json` in the report directory.
+
+        Returns:
+            Path of the written report, or None when reporting is disabled or writing failed
+
+        """
+        if not self.directory:
+            return None
+
+        report = {
+            "started_at": self.started_at.isoformat(),
+            "finished_at": datetime.now().isoformat(),
+            **self.sections,
+        }
+
+        try:
+            self.directory.mkdir(parents=True, exist_ok=True)
+            path = self.directory / f"run_{self.started_at:%Y%m%d_%H%M%S}.json"
+            with path.open("w", encoding="utf-8") as f:
+                json.dump(report, f, indent=2, default=str)
+        except Exception as e:
+            self.logger.warning(f"Could not write run report: {e}")
+            return None
+
+        self.logger.info(f"Run report written to {path}")
+        return path
@@ -1,5 +1,4 @@
 import traceback
-from datetime import datetime
 
 from finance_dashboard.model.bank.bunq import Bunq
 from finance_dashboard.repository import Repository
@@ -33,35 +32,8 @@ class BunqRepository(Repository):
         self.logger.info(f"[{source}] Starting account retrieval and storage process")
         try:
             self.logger.debug(f"[{source}] Retrieving accounts from Bunq")
-            df = self.bunq.retrieve_accounts_safe()
-            self.logger.debug(f"[{source}] Successfully retrieved {len(df)} accounts from Bunq")
-
-            # Debug log the raw data received
-            if not df.empty:
-                self.logger.debug(f"[{source}] Raw account data columns: {df.columns.tolist()}")
-                for idx, row in df.iterrows():
-                    self.logger.debug(
-                        f"[{source}] Account {idx}: {row['name']} | Balance: {row['balance']} {row['currency']} | IBAN: {row['iban']}"
-                    )
-
-            self.logger.debug(f"[{source}] Converting currencies for balance columns")
-            df = self.convert_currencies(df, ["balance"])
-
-            # Debug log after currency conversion
-            if not df.empty:
-                for idx, row in df.iterrows():
-                    original_balance = row.get("original_balance", "N/A")
-                    original_currency = row.get("original_currency", "N/A")
-                    self.logger.debug(
-                        f"[{source}] After conversion {idx}: {row['name']} | Balance: {row['balance']} {row['currency']} | Original: {original_balance} {original_currency}"
-                    )
-
-            df.insert(0, "source", source)
-            df.insert(0, "date", datetime.now().date())
-
-            self.logger.debug(f"[{source}] Storing data to {self.BANK} table")
-            self.connector.store_data(df, self.BANK)
-            self.logger.info(f"[{source}] Accounts retrieved and stored successfully")
+            count = self.store_records(self.bunq.iter_accounts(), source, self.BANK, ["balance"])
+            self.logger.info(f"[{source}] Accounts retrieved and stored successfully ({count} accounts)")
         except Exception as e:
             error_details = {
                 "error_type": type(e).__name__,
@@ -73,4 +45,4 @@ class BunqRepository(Repository):
                 "stack_trace": traceback.format_exc(),
             }
             self.logger.exception(f"[{source}] Error while retrieving and storing accounts: {error_details}")
-            self.logger.warning(f"[{source}] Failed to retrieve new data, no data will be stored")
+            self.logger.warning(f"[{source}] Failed to retrieve new data, partial data may have been stored")
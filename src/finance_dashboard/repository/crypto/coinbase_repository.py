@@ -1,6 +1,5 @@
-from datetime import datetime
-
 from finance_dashboard.model.crypto.coinbase import Coinbase
+from finance_dashboard.records import filter_records, is_significant, value_records
 from finance_dashboard.repository import Repository
 
 
@@ -20,42 +19,10 @@ class CoinbaseRepository(Repository):
         """Retrieve and store Coinbase wallet data."""
         try:
             self.logger.debug(f"[{source}] Starting Coinbase wallet retrieval")
-            df = self.coinbase.retrieve_wallet(self.converter.ref_currency)
-
-            # Enhanced debug logging for Coinbase wallet data
-            if not df.empty:
-                self.logger.debug(f"[{source}] Retrieved {len(df)} Coinbase wallets:")
-                for _, row in df.iterrows():
-                    self.logger.debug(
-                        f"[{source}]   {row['name']} ({row['symbol']}) | "
-                        f"Amount: {row['amount']} | "
-                        f"Current Value: {row['current_value']} {row['currency']} | "
-                        f"Portfolio Value: {row['portfolio_value']} {row['currency']}"
-                    )
-
-            # Convert currencies and log after conversion
-            self.logger.debug(f"[{source}] Converting currencies for Coinbase wallet data")
-            df = self.convert_currencies(df, ["purchase_value", "current_value", "portfolio_value"])
-
-            # Log after conversion
-            if not df.empty:
-                self.logger.debug(f"[{source}] After conversion:")
-                for _, row in df.iterrows():
-                    original_cv = row.get("original_current_value", "N/A")
-                    original_portfolio_v = row.get("original_portfolio_value", "N/A")
-                    original_currency = row.get("original_currency", "N/A")
-                    self.logger.debug(
-                        f"[{source}]   {row['name']} | "
-                        f"Current Value: {row['current_value']} {row['currency']} | "
-                        f"Portfolio Value: {row['portfolio_value']} {row['currency']} | "
-                        f"Original: CV={original_cv}, PortV={original_portfolio_v} {original_currency}"
-                    )
-
-            df.insert(0, "source", source)
-            df.insert(0, "date", datetime.now().date())
-
-            self.connector.store_data(df, self.CRYPTO)
-            self.logger.info(f"[{source}] Wallets retrieved and stored")
+            records = value_records(self.coinbase.iter_wallet(self.converter.ref_currency))
+            records = filter_records(records, is_significant)
+            count = self.store_records(records, source, self.CRYPTO, ["current_value", "portfolio_value"])
+            self.logger.info(f"[{source}] Wallets retrieved and stored ({count} wallets)")
         except Exception:
             self.logger.exception(f"[{source}] Error while retrieving and storing wallets")
-            self.logger.warning(f"[{source}] Failed to retrieve new wallet data, no data will be stored")
+            self.logger.warning(f"[{source}] Failed to retrieve new wallet data, partial data may have been stored")
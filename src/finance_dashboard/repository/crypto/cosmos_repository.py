@@ -1,6 +1,5 @@
-from datetime import datetime
-
 from finance_dashboard.model.crypto.cosmos import Cosmos
+from finance_dashboard.records import filter_records, is_significant, value_records
 from finance_dashboard.repository import Repository
 
 OSMOSIS_ZONE_API_URL = "https://api-osmosis.imperator.co"
@@ -25,86 +24,22 @@ class CosmosRepository(Repository):
         """Retrieve and store Cosmos wallet data."""
         try:
             self.logger.debug(f"[{source}] Starting Cosmos wallet retrieval - Address: {address}")
-            df = self.cosmos.retrieve_wallet(address, self.converter.ref_currency)
-
-            # Enhanced debug logging for Cosmos wallet data
-            if not df.empty:
-                self.logger.debug(f"[{source}] Retrieved {len(df)} Cosmos assets:")
-                for _, row in df.iterrows():
-                    self.logger.debug(
-                        f"[{source}]   {row['name']} ({row['symbol']}) | "
-                        f"Amount: {row['amount']} | "
-                        f"Current Value: {row['current_value']} {row['currency']} | "
-                        f"Portfolio Value: {row['portfolio_value']} {row['currency']}"
-                    )
-
-            # Convert currencies and log after conversion
-            self.logger.debug(f"[{source}] Converting currencies for Cosmos wallet data")
-            df = self.convert_currencies(df, ["current_value", "portfolio_value"])
-
-            # Log after conversion
-            if not df.empty:
-                self.logger.debug(f"[{source}] After conversion:")
-                for _, row in df.iterrows():
-                    original_cv = row.get("original_current_value", "N/A")
-                    original_pv = row.get("original_portfolio_value", "N/A")
-                    original_currency = row.get("original_currency", "N/A")
-                    self.logger.debug(
-                        f"[{source}]   {row['name']} | "
-                        f"Current Value: {row['current_value']} {row['currency']} | "
-                        f"Portfolio Value: {row['portfolio_value']} {row['currency']} | "
-                        f"Original: CV={original_cv}, PV={original_pv} {original_currency}"
-                    )
-
-            df.insert(0, "source", source)
-            df.insert(0, "date", datetime.now().date())
-
-            self.connector.store_data(df, self.CRYPTO)
-            self.logger.info(f"[{source}] Wallet retrieved and stored")
+            records = value_records(self.cosmos.iter_wallet(address, self.converter.ref_currency))
+            records = filter_records(records, is_significant)
+            count = self.store_records(records, source, self.CRYPTO, ["current_value", "portfolio_value"])
+            self.logger.info(f"[{source}] Wallet retrieved and stored ({count} assets)")
         except Exception:
             self.logger.exception(f"[{source}] Error while retrieving and storing wallet")
-            self.logger.warning(f"[{source}] Failed to retrieve new wallet data, no data will be stored")
+            self.logger.warning(f"[{source}] Failed to retrieve new wallet data, partial data may have been stored")
 
     def get_and_store_pools(self, source: str, address: str):
         """Retrieve and store Osmosis pool data."""
         try:
             self.logger.debug(f"[{source}] Starting Osmosis pools retrieval - Address: {address}")
-            df = self.cosmos.retrieve_osmosis_pools(address, self.converter.ref_currency)
-
-            # Enhanced debug logging for Osmosis pool data
-            if not df.empty:
-                self.logger.debug(f"[{source}] Retrieved {len(df)} Osmosis pools:")
-                for _, row in df.iterrows():
-                    self.logger.debug(
-                        f"[{source}]   {row['name']} ({row['symbol']}) | "
-                        f"Amount: {row['amount']} | "
-                        f"Current Value: {row['current_value']} {row['currency']} | "
-                        f"Portfolio Value: {row['portfolio_value']} {row['currency']}"
-                    )
-
-            # Convert currencies and log after conversion
-            self.logger.debug(f"[{source}] Converting currencies for Osmosis pool data")
-            df = self.convert_currencies(df, ["current_value", "portfolio_value"])
-
-            # Log after conversion
-            if not df.empty:
-                self.logger.debug(f"[{source}] After conversion:")
-                for _, row in df.iterrows():
-                    original_cv = row.get("original_current_value", "N/A")
-                    original_pv = row.get("original_portfolio_value", "N/A")
-                    original_currency = row.get("original_currency", "N/A")
-                    self.logger.debug(
-                        f"[{source}]   {row['name']} | "
-                        f"Current Value: {row['current_value']} {row['currency']} | "
-                        f"Portfolio Value: {row['portfolio_value']} {row['currency']} | "
-                        f"Original: CV={original_cv}, PV={original_pv} {original_currency}"
-                    )
-
-            df.insert(0, "source", source)
-            df.insert(0, "date", datetime.now().date())
-
-            self.connector.store_data(df, self.CRYPTO)
-            self.logger.info(f"[{source}] Pools retrieved and stored")
+            records = value_records(self.cosmos.iter_osmosis_pools(address, self.converter.ref_currency))
+            records = filter_records(records, is_significant)
+            count = self.store_records(records, source, self.CRYPTO, ["current_value", "portfolio_value"])
+            self.logger.info(f"[{source}] Pools retrieved and stored ({count} pools)")
         except Exception:
             self.logger.exception(f"[{source}] Error while retrieving and storing pools")
-            self.logger.warning(f"[{source}] Failed to retrieve new pool data, no data will be stored")
+            self.logger.warning(f"[{source}] Failed to retrieve new pool data, partial data may have been stored")
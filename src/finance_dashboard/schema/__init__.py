@@ -1,49 +1,176 @@
+from dataclasses import dataclass
+from functools import cached_property
+
+import pyarrow as pa
+from pandas import ArrowDtype, DataFrame
+
+# Arrow types used for each schema column type
+ARROW_TYPES = {
+    "STRING": pa.string(),
+    "FLOAT": pa.float64(),
+    "INTEGER": pa.int64(),
+    "DATE": pa.date32(),
+}
+
+# pandas dtypes DataFrames are coerced to before they are stored, categorical columns use "category".
+# String columns are kept as they are, so Arrow-backed strings are not copied into Python objects.
+PANDAS_DTYPES = {
+    "STRING": None,
+    "FLOAT": "float64",
+    "INTEGER": "Int64",
+    "DATE": ArrowDtype(pa.date32()),
+}
+
+
+@dataclass(frozen=True)
+class Column:
+    """Definition of a single table column."""
+
+    name: str
+    type: str
+    categorical: bool = False
+
+    @property
+    def dtype(self):
+        """Get the pandas dtype of the column, None when the column keeps its dtype."""
+        return "category" if self.categorical else PANDAS_DTYPES[self.type]
+
+
+@dataclass(frozen=True)
+class TableSchema:
+    """Immutable definition of a table, with its derived Arrow schema and pandas dtypes computed once."""
+
+    name: str
+    columns: tuple[Column, ...]
+
+    @cached_property
+    def column_names(self) -> tuple[str, ...]:
+        """Get the column names in table order."""
+        return tuple(column.name for column in self.columns)
+
+    @cached_property
+    def arrow_schema(self) -> pa.Schema:
+        """Get the Arrow schema of the table."""
+        return pa.schema([(column.name, ARROW_TYPES[column.type]) for column in self.columns])
+
+    @cached_property
+    def dtypes(self) -> dict:
+        """Get the pandas dtype of every column."""
+        return {column.name: column.dtype for column in self.columns}
+
+    def as_dicts(self) -> list[dict]:
+        """Get the schema as a list of column dictionaries."""
+        return [{"name": column.name, "type": column.type} for column in self.columns]
+
+    def coerce(self, df: DataFrame) -> DataFrame:
+        """Coerce a DataFrame to the compact dtypes of the table.
+
+        Columns that are not part of the table are dropped and the remaining columns are put in
+        table order, so the result can be serialized with the Arrow schema without type inference.
+        """
+        names = [name for name in self.column_names if name in df.columns]
+        return df[names].astype({name: self.dtypes[name] for name in names if self.dtypes[name] is not None})
+
+
+BANK = TableSchema(
+    "bank",
+    (
+        Column("date", "DATE"),
+        Column("source", "STRING", categorical=True),
+        Column("name", "STRING"),
+        Column("iban", "STRING"),
+        Column("balance", "FLOAT"),
+        Column("currency", "STRING", categorical=True),
+        Column("original_balance", "FLOAT"),
+        Column("original_currency", "STRING", categorical=True),
+    ),
+)
+
+STOCK = TableSchema(
+    "stock",
+    (
+        Column("date", "DATE"),
+        Column("source", "STRING", categorical=True),
+        Column("name", "STRING"),
+        Column("symbol", "STRING"),
+        Column("amount", "INTEGER"),
+        Column("purchase_value", "FLOAT"),
+        Column("current_value", "FLOAT"),
+        Column("portfolio_value", "FLOAT"),
+        Column("currency", "STRING", categorical=True),
+        Column("original_purchase_value", "FLOAT"),
+        Column("original_current_value", "FLOAT"),
+        Column("original_portfolio_value", "FLOAT"),
+        Column("original_currency", "STRING", categorical=True),
+    ),
+)
+
+CRYPTO = TableSchema(
+    "crypto",
+    (
+        Column("date", "DATE"),
+        Column("source", "STRING", categorical=True),
+        Column("name", "STRING"),
+        Column("type", "STRING"),
+        Column("symbol", "STRING"),
+        Column("amount", "FLOAT"),
+        Column("current_value", "FLOAT"),
+        Column("portfolio_value", "FLOAT"),
+        Column("currency", "STRING", categorical=True),
+        Column("original_current_value", "FLOAT"),
+        Column("original_portfolio_value", "FLOAT"),
+        Column("original_currency", "STRING", categorical=True),
+    ),
+)
+
+DAILY_TOTALS = TableSchema(
+    "daily_totals",
+    (
+        Column("date", "DATE"),
+        Column("source", "STRING", categorical=True),
+        Column("total_balance", "FLOAT"),
+    ),
+)
+
+TABLES = {table.name: table for table in (BANK, STOCK, CRYPTO, DAILY_TOTALS)}
+
+
+def get(table_name: str) -> TableSchema:
+    """Get the schema of a table.
+
+    Raises:
+        ValueError: When the table is unknown
+
+    """
+    try:
+        return TABLES[table_name]
+    except KeyError:
+        raise ValueError(f"Unknown table name: {table_name}") from None
+
+
 def bank():
     """Return the schema definition for bank data tables."""
-    return [
-        {"name": "date", "type": "DATE"},
-        {"name": "source", "type": "STRING"},
-        {"name": "name", "type": "STRING"},
-        {"name": "iban", "type": "STRING"},
-        {"name": "balance", "type": "FLOAT"},
-        {"name": "currency", "type": "STRING"},
-        {"name": "original_balance", "type": "FLOAT"},
-        {"name": "original_currency", "type": "STRING"},
-    ]
+    return BANK.as_dicts()
 
 
 def stock():
     """Return the schema definition for stock data tables."""
-    return [
-        {"name": "date", "type": "DATE"},
-        {"name": "source", "type": "STRING"},
-        {"name": "name", "type": "STRING"},
-        {"name": "symbol", "type": "STRING"},
-        {"name": "amount", "type": "INTEGER"},
-        {"name": "purchase_value", "type": "FLOAT"},
-        {"name": "current_value", "type": "FLOAT"},
-        {"name": "portfolio_value", "type": "FLOAT"},
-        {"name": "currency", "type": "STRING"},
-        {"name": "original_purchase_value", "type": "FLOAT"},
-        {"name": "original_current_value", "type": "FLOAT"},
-        {"name": "original_portfolio_value", "type": "FLOAT"},
-        {"name": "original_currency", "type": "STRING"},
-    ]
+    return STOCK.as_dicts()
 
 
 def crypto():
     """Return the schema definition for crypto data tables."""
-    return [
-        {"name": "date", "type": "DATE"},
-        {"name": "source", "type": "STRING"},
-        {"name": "name", "type": "STRING"},
-        {"name": "type", "type": "STRING"},
-        {"name": "symbol", "type": "STRING"},
-        {"name": "amount", "type": "FLOAT"},
-        {"name": "current_value", "type": "FLOAT"},
-        {"name": "portfolio_value", "type": "FLOAT"},
-        {"name": "currency", "type": "STRING"},
-        {"name": "original_current_value", "type": "FLOAT"},
-        {"name": "original_portfolio_value", "type": "FLOAT"},
-        {"name": "original_currency", "type": "STRING"},
-    ]
+    return CRYPTO.as_dicts()
+
+
+def daily_totals():
+    """Return the schema definition for the daily totals table."""
+    return DAILY_TOTALS.as_dicts()
+
+
+# Column summed per table to calculate the daily totals
+TOTAL_COLUMNS = {
+    "bank": "balance",
+    "stock": "portfolio_value",
+    "crypto": "portfolio_value",
+}
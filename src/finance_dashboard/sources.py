@@ -0,0 +1,121 @@
+"""Registry of the data source types of Finance Dashboard.
+
+Every account in the pipeline configuration has a category (bank, stock or crypto) and a `type`. The
+registry maps each category and type to the collector of its accounts, a callable that is called as
+`collector(context, account_name, account_config)` with a SourceContext that holds everything a
+collector needs from the run: the connector to store with, the currency converter, the logger of
+the repositories and the API keys. Collectors are registered by import path and
+only imported when a configured account needs them, so the SDK of a source is never imported when no
+account of that source is configured.
+
+Other packages can add source types with an entry point in the `finance_dashboard.sources` group,
+named `<category>.<type>`:
+
+    [project.entry-points."finance_dashboard.sources"]
+    "crypto.kraken" = "finance_dashboard_kraken:collect_account"
+"""
+
+import importlib
+import logging
+import os
+from collections.abc import Callable
+from dataclasses import dataclass
+from importlib.metadata import entry_points
+from typing import Any
+
+from finance_dashboard.connector import Connector
+
+ENTRY_POINT_GROUP = "finance_dashboard.sources"
+
+CATEGORIES = ("bank", "stock", "crypto")
+
+# Built-in collectors by category and type, as `module:qualified.name`
+BUILTIN_SOURCES = {
+    ("bank", "bunq"): "finance_dashboard.collectors:collect_bunq",
+    ("stock", "degiro"): "finance_dashboard.collectors:collect_degiro",
+    ("crypto", "coinbase"): "finance_dashboard.collectors:collect_coinbase",
+    ("crypto", "web3"): "finance_dashboard.collectors:collect_web3",
+    ("crypto", "web3-solana"): "finance_dashboard.collectors:collect_web3_solana",
+    ("crypto", "cosmos"): "finance_dashboard.collectors:collect_cosmos",
+}
+
+
+@dataclass(frozen=True)
+class SourceContext:
+    """Everything a collector needs from the run to collect and store the data of an account."""
+
+    connector: Connector
+    converter: Any
+    logger: Any
+    coinmarketcap_api_key: str = ""
+    moralis_api_key: str = ""
+
+    def account_env_value(self, account_config: dict[str, Any], key: str, default: str = "") -> str:
+        """Get the value of the environment variable named by an `*_env` key of an account configuration."""
+        env_var = account_config.get(key, "")
+        if not env_var:
+            return default
+        return os.getenv(env_var, default)
+
+    def repository_config(self) -> dict:
+        """Get the configuration dictionary the repositories are created with."""
+        return {
+            "connector": self.connector,
+            "converter": self.converter,
+            "logger": self.logger,
+            "coinmarketcap_api_key": self.coinmarketcap_api_key,
+        }
+
+
+_collectors: dict[tuple[str, str], Callable] = {}
+_plugins: dict[tuple[str, str], object] | None = None
+
+
+def _import(path: str) -> Callable:
+    """Import an object by its `module:qualified.name` path."""
+    module_name, _, qualified_name = path.partition(":")
+    target = importlib.import_module(module_name)
+    for name in qualified_name.split("."):
+        target = getattr(target, name)
+    return target
+
+
+def _plugin_entry_points() -> dict[tuple[str, str], object]:
+    """Get the source entry points of installed packages, read once on first use."""
+    global _plugins
+
+    if _plugins is None:
+        _plugins = {}
+        for entry_point in entry_points(group=ENTRY_POINT_GROUP):
+            category, _, source_type = entry_point.name.partition(".")
+            if category in CATEGORIES and source_type:
+                _plugins[(category, source_type.lower())] = entry_point
+            else:
+                logging.getLogger(__name__).warning(
+                    f"Ignoring source entry point with invalid name: {entry_point.name}"
+                )
+    return _plugins
+
+
+def source_types(category: str) -> list[str]:
+    """Get the built-in and installed source types of a category."""
+    keys = set(BUILTIN_SOURCES) | set(_plugin_entry_points())
+    return sorted(source_type for key_category, source_type in keys if key_category == category)
+
+
+def get_collector(category: str, source_type: str) -> Callable | None:
+    """Get the collector of a source type, importing it on first use.
+
+    Returns:
+        The collector, or None when the source type is unknown
+
+    """
+    key = (category, source_type.lower())
+    if key not in _collectors:
+        if key in BUILTIN_SOURCES:
+            _collectors[key] = _import(BUILTIN_SOURCES[key])
+        elif key in _plugin_entry_points():
+            _collectors[key] = _plugin_entry_points()[key].load()
+        else:
+            return None
+    return _collectors[key]
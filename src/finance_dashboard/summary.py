@@ -0,0 +1,176 @@
+"""Daily summary calculation for Finance Dashboard.
+
+Today's totals are calculated in memory from the data stored during the run, yesterday's totals
+are read from a small local history file and only fetched from the database when missing.
+"""
+
+import json
+import logging
+from datetime import date, timedelta
+from pathlib import Path
+
+from pandas import DataFrame, concat
+
+from finance_dashboard import schema
+from finance_dashboard.connector import Connector
+
+
+def build_daily_summary(today: dict[str, float], yesterday: dict[str, float]) -> dict | None:
+    """Build the daily summary from per-category totals of today and yesterday.
+
+    Args:
+        today: Mapping of category name to today's total balance
+        yesterday: Mapping of category name to yesterday's total balance
+
+    Returns:
+        dict with the same structure as BigQueryConnector.get_daily_summary(), or None when
+        there are no totals for either day
+
+    """
+    if not today and not yesterday:
+        return None
+
+    categories = []
+    for name in sorted(set(today) | set(yesterday)):
+        today_balance = today.get(name, 0.0)
+        yesterday_balance = yesterday.get(name, 0.0)
+        change = today_balance - yesterday_balance
+        categories.append(
+            {
+                "name": name,
+                "today": today_balance,
+                "yesterday": yesterday_balance,
+                "change": change,
+                "change_pct": (change / yesterday_balance) * 100 if yesterday_balance > 0 else 0,
+            }
+        )
+
+    total_today = sum(category["today"] for category in categories)
+    total_yesterday = sum(category["yesterday"] for category in categories)
+    total_change = total_today - total_yesterday
+
+    return {
+        "total_today": total_today,
+        "total_yesterday": total_yesterday,
+        "total_change": total_change,
+        "total_change_pct": (total_change / total_yesterday) * 100 if total_yesterday > 0 else 0,
+        "categories": categories,
+    }
+
+
+class RunTotals:
+    """Collects the rows stored during a run to calculate per-category daily totals in memory.
+
+    Rows are recorded when they are handed to the connector, but only counted once `commit` is
+    called after the connector has written them, as buffered and async writes can still fail.
+    """
+
+    def __init__(self, category_names: dict[str, str]):
+        self.category_names = category_names
+        self._frames: dict[str, list[DataFrame]] = {}
+        self._pending: list[tuple[str, DataFrame]] = []
+
+    def add(self, df: DataFrame, table_name: str):
+        """Record the value column of a DataFrame that is being stored."""
+        if df.empty or table_name not in schema.TOTAL_COLUMNS:
+            return
+
+        value_column = schema.TOTAL_COLUMNS[table_name]
+        self._pending.append((table_name, df[["date", "source", "name", value_column]]))
+
+    def commit(self):
+        """Count the recorded DataFrames, once the connector has written them."""
+        for table_name, df in self._pending:
+            self._frames.setdefault(table_name, []).append(df)
+        self._pending.clear()
+
+    def totals(self, day: date) -> dict[str, float]:
+        """Calculate the total per category for a date.
+
+        Rows stored more than once for the same date, source and name are counted once, using the
+        last stored value, which matches the upsert behaviour of the connectors.
+        """
+        totals = {}
+        for table_name, frames in self._frames.items():
+            value_column = schema.TOTAL_COLUMNS[table_name]
+            df = concat(frames, ignore_index=True).drop_duplicates(subset=["date", "source", "name"], keep="last")
+            values = df.loc[df["date"] == day, value_column]
+            if not values.empty:
+                totals[self.category_names.get(table_name, table_name)] = round(float(values.sum()), 2)
+
+        return totals
+
+
+class TotalsHistory:
+    """Local store of per-category daily totals of recent days."""
+
+    def __init__(self, path: str, max_days: int = 31):
+        self.path = Path(path)
+        self.max_days = max_days
+        self.logger = logging.getLogger(__name__)
+        self._history: dict[str, dict[str, float]] = {}
+
+        if self.path.is_file():
+            try:
+                with self.path.open(encoding="utf-8") as f:
+                    self._history = json.load(f)
+            except Exception as e:
+                self.logger.warning(f"Could not read totals history `{self.path}`: {e}")
+
+    def get(self, day: date) -> dict[str, float] | None:
+        """Get the stored totals of a date, or None when the date is not in the history."""
+        return self._history.get(day.isoformat())
+
+    def set(self, day: date, totals: dict[str, float]):
+        """Store the totals of a date and drop dates older than the retention period."""
+        self._history[day.isoformat()] = totals
+
+        oldest = (day - timedelta(days=self.max_days)).isoformat()
+        self._history = {key: value for key, value in self._history.items() if key >= oldest}
+
+        try:
+            self.path.parent.mkdir(parents=True, exist_ok=True)
+            temp_path = self.path.with_suffix(f"{self.path.suffix}.tmp")
+            with temp_path.open("w", encoding="utf-8") as f:
+                json.dump(self._history, f, indent=2, sort_keys=True)
+            temp_path.replace(self.path)
+        except Exception as e:
+            self.logger.warning(f"Could not write totals history `{self.path}`: {e}")
+
+
+class RecordingConnector(Connector):
+    """Connector wrapper that records every stored DataFrame in the run totals.
+
+    The recorded rows are counted in the totals when the wrapped connector has been flushed, which
+    is when buffered and async writes are known to have succeeded.
+    """
+
+    def __init__(self, connector: Connector, run_totals: RunTotals):
+        self.connector = connector
+        self.run_totals = run_totals
+
+    def store_data(self, df, table_name):
+        """Store data with the wrapped connector and record it once it has been accepted."""
+        self.connector.store_data(df, table_name)
+        self.run_totals.add(df, table_name)
+
+    def flush(self):
+        """Flush the wrapped connector and count the rows it has written in the run totals."""
+        self.connector.flush()
+        self.run_totals.commit()
+
+    def close(self):
+        """Close the wrapped connector."""
+        self.connector.close()
+
+    def get_category_totals(self, day):
+        """Get the category totals of a date from the wrapped connector."""
+        return self.connector.get_category_totals(day)
+
+    def get_daily_summary(self, report_date=None):
+        """Get the daily summary from the wrapped connector."""
+        return self.connector.get_daily_summary(report_date)
+
+    def run_statistics(self):
+        """Get the run statistics of the wrapped connector."""
+        return self.connector.run_statistics()
@@ -0,0 +1,206 @@
+"""Timing spans for Finance Dashboard runs.
+
+Stages of a run are wrapped in spans, which record their duration and attributes such as the source
+and number of rows:
+
+    with tracing.span("store", source=source, table=table_name) as current:
+        ...
+        current.set(rows=len(df))
+
+Spans nest per thread, so a span opened inside another span records it as its parent and inherits its
+source. At the end of a run the spans are written as a JSON trace and as a Prometheus textfile, which
+node_exporter's textfile collector picks up, so the duration per stage and source can be charted over
+runs.
+"""
+
+import json
+import logging
+import statistics
+import threading
+import time
+from collections.abc import Iterator
+from contextlib import contextmanager
+from dataclasses import asdict, dataclass, field
+from datetime import datetime
+from itertools import count
+from pathlib import Path
+from typing import Any
+
+# Prefix of all exported Prometheus metrics
+METRIC_PREFIX = "finance_dashboard"
+
+# Quantiles of the span durations exported to Prometheus
+QUANTILES = (0.5, 0.95)
+
+
+@dataclass
+class Span:
+    """A timed stage of a run."""
+
+    id: int
+    name: str
+    parent_id: int | None
+    thread: str
+    started_at: float
+    duration: float = 0.0
+    status: str = "ok"
+    attributes: dict[str, Any] = field(default_factory=dict)
+
+    def set(self, **attributes: Any):
+        """Add attributes to the span."""
+        self.attributes.update(attributes)
+
+
+class Tracer:
+    """Records the spans of a run."""
+
+    def __init__(self):
+        self.started_at = time.time()
+        self.spans: list[Span] = []
+        self._ids = count(1)
+        self._lock = threading.Lock()
+        self._local = threading.local()
+
+    def _stack(self) -> list[Span]:
+        if not hasattr(self._local, "stack"):
+            self._local.stack = []
+        return self._local.stack
+
+    @contextmanager
+    def span(self, name: str, **attributes: Any) -> Iterator[Span]:
+        """Time the enclosed block as a span, marking it as failed when it raises."""
+        stack = self._stack()
+        # Spans inherit the source of their parent, so API calls and writes are attributed to their source
+        if stack and "source" not in attributes and "source" in stack[-1].attributes:
+            attributes = {"source": stack[-1].attributes["source"], **attributes}
+        current = Span(
+            id=next(self._ids),
+            name=name,
+            parent_id=stack[-1].id if stack else None,
+            thread=threading.current_thread().name,
+            started_at=time.time(),
+            attributes=attributes,
+        )
+        stack.append(current)
+        start = time.perf_counter()
+        try:
+            yield current
+        except BaseException as e:
+            current.status = "error"
+            current.set(error=type(e).__name__)
+            raise
+        finally:
+            current.duration = time.perf_counter() - start
+            stack.pop()
+            with self._lock:
+                self.spans.append(current)
+
+    def write_trace(self, path: str | Path):
+        """Write all spans to a JSON trace file."""
+        with self._lock:
+            spans = [asdict(span) for span in sorted(self.spans, key=lambda span: span.started_at)]
+
+        trace = {"started_at": datetime.fromtimestamp(self.started_at).isoformat(), "spans": spans}
+        _write_atomic(Path(path), json.dumps(trace, indent=2, default=str))
+
+    def prometheus_metrics(self) -> str:
+        """Get the span durations and row counts in the Prometheus text format.
+
+        Span durations are exported as a summary per span name and source, the stored rows as a gauge
+        per source and table.
+        """
+        with self._lock:
+            spans = list(self.spans)
+
+        durations: dict[tuple[str, str], list[float]] = {}
+        rows: dict[tuple[str, str], int] = {}
+        for span in spans:
+            source = str(span.attributes.get("source", ""))
+            durations.setdefault((span.name, source), []).append(span.duration)
+            if span.name == "store_records" and "rows" in span.attributes:
+                key = (source, str(span.attributes.get("table", "")))
+                rows[key] = rows.get(key, 0) + int(span.attributes["rows"])
+
+        lines = [
+            f"# HELP {METRIC_PREFIX}_span_duration_seconds Duration of the stages of the last run",
+            f"# TYPE {METRIC_PREFIX}_span_duration_seconds summary",
+        ]
+        for (name, source), values in sorted(durations.items()):
+            labels = f'span="{_escape(name)}",source="{_escape(source)}"'
+            for quantile in QUANTILES:
+                lines.append(
+                    f'{METRIC_PREFIX}_span_duration_seconds{{{labels},quantile="{quantile}"}} '
+                    f"{_quantile(values, quantile):.6f}"
+                )
+            lines.append(f"{METRIC_PREFIX}_span_duration_seconds_sum{{{labels}}} {sum(values):.6f}")
+            lines.append(f"{METRIC_PREFIX}_span_duration_seconds_count{{{labels}}} {len(values)}")
+
+        lines.append(f"# HELP {METRIC_PREFIX}_span_errors Number of failed stages of the last run")
+        lines.append(f"# TYPE {METRIC_PREFIX}_span_errors gauge")
+        lines.append(f"{METRIC_PREFIX}_span_errors {sum(span.status == 'error' for span in spans)}")
+
+        lines.append(f"# HELP {METRIC_PREFIX}_stored_rows Number of rows stored in the last run")
+        lines.append(f"# TYPE {METRIC_PREFIX}_stored_rows gauge")
+        for (source, table), value in sorted(rows.items()):
+            lines.append(f'{METRIC_PREFIX}_stored_rows{{source="{_escape(source)}",table="{_escape(table)}"}} {value}')
+
+        lines.append(f"# HELP {METRIC_PREFIX}_last_run_timestamp_seconds Start time of the last run")
+        lines.append(f"# TYPE {METRIC_PREFIX}_last_run_timestamp_seconds gauge")
+        lines.append(f"{METRIC_PREFIX}_last_run_timestamp_seconds {self.started_at:.0f}")
+        return "\n".join(lines) + "\n"
+
+    def write_prometheus(self, path: str | Path):
+        """Write the metrics to a Prometheus textfile."""
+        _write_atomic(Path(path), self.prometheus_metrics())
+
+
+def _quantile(values: list[float], quantile: float) -> float:
+    if len(values) == 1:
+        return values[0]
+    return statistics.quantiles(values, n=100, method="inclusive")[round(quantile * 100) - 1]
+
+
+def _escape(value: str) -> str:
+    return value.replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+
+
+def _write_atomic(path: Path, content: str):
+    """Write a file through a temporary file, so readers like node_exporter never see a partial file."""
+    path.parent.mkdir(parents=True, exist_ok=True)
+    temp_path = path.with_suffix(f"{path.suffix}.tmp")
+    temp_path.write_text(content, encoding="utf-8")
+    temp_path.replace(path)
+
+
+_tracer = Tracer()
+
+
+def get_tracer() -> Tracer:
+    """Get the tracer of the current run."""
+    return _tracer
+
+
+def reset() -> Tracer:
+    """Start a new run with an empty tracer."""
+    global _tracer
+
+    _tracer = Tracer()
+    return _tracer
+
+
+def span(name: str, **attributes: Any):
+    """Time the enclosed block as a span of the current run."""
+    return _tracer.span(name, **attributes)
+
+
+def write(trace_path: str | Path | None = None, prometheus_path: str | Path | None = None):
+    """Write the spans of the current run, logging instead of raising when a file can't be written."""
+    logger = logging.getLogger(__name__)
+    for path, writer in ((trace_path, _tracer.write_trace), (prometheus_path, _tracer.write_prometheus)):
+        if not path:
+            continue
+        try:
+            writer(path)
+            logger.info(f"Run metrics written to {path}")
+        except Exception as e:
+            logger.warning(f"Could not write run metrics to {path}: {e}")
@@ -0,0 +1,352 @@
+from datetime import date
+from types import SimpleNamespace
+
+import pyarrow as pa
+import pyarrow.parquet as pq
+import pytest
+from pandas import DataFrame
+
+bigquery = pytest.importorskip("google.cloud.bigquery")
+
+from finance_dashboard import schema  # noqa: E402
+from finance_dashboard.connector import bigquery as bigquery_connector  # noqa: E402
+from finance_dashboard.exceptions import StorageError  # noqa: E402
+
+
+class RecordingClient:
+    """BigQuery client that keeps the uploaded load job files instead of running jobs."""
+
+    def __init__(self):
+        self.uploads = []
+
+    def load_table_from_file(self, file_obj, destination, size=None, job_config=None):
+        """Keep the uploaded file and return a finished load job."""
+        self.uploads.append({"data": file_obj.read(), "destination": destination, "size": size, "config": job_config})
+        return SimpleNamespace(
+            job_id="load", job_type="load", created=None, started=None, ended=None, result=lambda: None
+        )
+
+
+@pytest.fixture
+def connector(monkeypatch):
+    """BigQuery connector with a recording client and without credentials."""
+    monkeypatch.setattr(
+        bigquery_connector.service_account.Credentials, "from_service_account_file", lambda path: object()
+    )
+    connector = bigquery_connector.BigQueryConnector("credentials.json", "project", "finance", "EU")
+    connector._client = RecordingClient()
+    return connector
+
+
+def test_load_uploads_parquet_with_the_table_schema(connector):
+    """Writes are uploaded as a single Parquet buffer with the explicit schema of the table."""
+    df = schema.BANK.coerce(
+        DataFrame(
+            [{"date": date(2025, 1, 2), "source": "Bunq", "name": "Savings", "balance": 100, "unknown": "dropped"}]
+        )
+    )
+
+    columns = connector._load_to_temp_table(connector.client, df, "bank", "project.finance.bank_temp")
+
+    upload = connector.client.uploads[0]
+    table = pq.read_table(pa.BufferReader(upload["data"]))
+    assert columns == ["date", "source", "name", "balance"]
+    assert table.column_names == columns
+    assert table.schema.field("date").type == pa.date32()
+    assert table.schema.field("balance").type == pa.float64()
+    assert table.to_pylist()[0]["balance"] == 100.0
+    assert upload["size"] == len(upload["data"])
+    assert upload["config"].source_format == bigquery.SourceFormat.PARQUET
+    assert [field.name for field in upload["config"].schema] == columns
+    assert connector.jobs.summary()["jobs"] == 1
+
+
+def test_unpartitioned_table_is_not_migrated_during_setup(connector, caplog):
+    """An existing table without date partitioning is reported, not replaced, when it is checked."""
+    queries = []
+    connector._run_query = lambda operation, query, **kwargs: queries.append(operation)
+    connector.client.get_table = lambda table_id: SimpleNamespace(time_partitioning=None)
+
+    connector._ensure_table_exists(connector.client, "bank")
+
+    assert queries == []
+    assert "--migrate-partitioning" in caplog.text
+
+
+def test_hashes_are_not_committed_when_the_write_fails(connector, tmp_path):
+    """Rows of a failed write are written again by the next write instead of being skipped."""
+    connector.snapshot_hashes = bigquery_connector.SnapshotHashes(
+        connector._dataset_id(), str(tmp_path / "hashes.json")
+    )
+    connector._prepare_write = lambda df, table_name: connector.snapshot_hashes.changed_rows(df, table_name)
+    connector._stage_write = lambda client, df, table_name, temp_table_name: "MERGE"
+    connector.client.delete_table = lambda table_id: None
+
+    def fail(operation, query, **kwargs):
+        raise RuntimeError("MERGE failed")
+
+    connector._run_query = fail
+    df = DataFrame([{"date": date.today(), "source": "Bunq", "name": "Savings", "balance": 100.0}])
+    with pytest.raises(RuntimeError):
+        connector._write(df, "bank")
+
+    assert len(connector.snapshot_hashes.changed_rows(df, "bank")[0]) == 1
+
+
+def test_failed_write_invalidates_the_touched_tables_and_view(connector):
+    """A failed write script verifies its table, the daily totals table and the totals view again."""
+    for kind, object_id in [
+        ("table", "project.finance.bank"),
+        ("table", "project.finance.stock"),
+        ("table", "project.finance.daily_totals"),
+        ("view", "project.finance.total"),
+    ]:
+        connector.metadata_cache.mark_verified(kind, object_id)
+    connector._prepare_write = lambda df, table_name: (df, {})
+    connector._stage_write = lambda client, df, table_name, temp_table_name: "MERGE"
+    connector.client.delete_table = lambda table_id: None
+
+    def fail(operation, query, **kwargs):
+        raise RuntimeError("MERGE failed")
+
+    connector._run_query = fail
+    with pytest.raises(RuntimeError):
+        connector._write(bank_rows(100.0), "bank")
+
+    assert not connector.metadata_cache.is_verified("table", "project.finance.bank")
+    assert not connector.metadata_cache.is_verified("table", "project.finance.daily_totals")
+    assert not connector.metadata_cache.is_verified("view", "project.finance.total")
+    assert connector.metadata_cache.is_verified("table", "project.finance.stock")
+
+
+def test_close_waits_for_queued_writes_and_stops_the_writers(connector, monkeypatch):
+    """Closing the connector finishes the queued async writes and shuts down their threads."""
+    written = []
+    connector.write_mode = "async"
+    monkeypatch.setattr(connector, "_write", lambda df, table_name: written.append(table_name))
+    connector.client.close = lambda: None
+    df = DataFrame([{"date": date.today(), "source": "Bunq", "name": "Savings", "balance": 100.0}])
+    connector.store_data(df, "bank")
+    executor = connector._executors["bank"]
+
+    connector.close()
+
+    assert written == ["bank"]
+    assert executor._shutdown
+    assert connector._executors == {}
+
+
+def test_daily_summary_scans_a_bounded_window(connector):
+    """The summary searches the latest date with data in a constant date window ending at the report date."""
+    queries = []
+
+    def run_query(operation, query, job_config=None, **kwargs):
+        queries.append((query, {parameter.name: parameter.value for parameter in job_config.query_parameters}))
+        return SimpleNamespace(to_dataframe=DataFrame)
+
+    connector._run_query = run_query
+
+    assert connector.get_daily_summary(date(2025, 1, 8)) is None
+    query, parameters = queries[0]
+    assert parameters == {"start_date": date(2025, 1, 1), "end_date": date(2025, 1, 8)}
+    assert "MAX(date)" in query
+    assert "WHERE date BETWEEN @start_date AND @end_date" in query
+
+
+def test_verified_tables_are_not_looked_up_again(connector):
+    """Tables in the metadata cache are not requested from BigQuery until their entry expires."""
+    lookups = []
+    connector.client.get_table = lambda table_id: (
+        lookups.append(table_id) or SimpleNamespace(time_partitioning=bigquery.TimePartitioning(field="date"))
+    )
+
+    connector._ensure_table_exists(connector.client, "bank")
+    connector._ensure_table_exists(connector.client, "bank")
+    connector.metadata_cache.invalidate("table", "project.finance.bank")
+    connector._ensure_table_exists(connector.client, "bank")
+
+    assert lookups == ["project.finance.bank", "project.finance.bank"]
+
+
+def bank_rows(*balances: float, name: str = "Savings") -> DataFrame:
+    """Build bank rows of today for one account, one row per balance."""
+    return DataFrame([{"date": date.today(), "source": "Bunq", "name": name, "balance": b} for b in balances])
+
+
+@pytest.fixture
+def writes(connector, monkeypatch):
+    """Tables and DataFrames written by the connector, instead of uploading them."""
+    written = []
+    monkeypatch.setattr(connector, "_write", lambda df, table_name: written.append((table_name, df)))
+    return written
+
+
+def test_buffered_writes_merge_once_per_table_on_flush(connector, writes):
+    """Buffered DataFrames are written on flush with one write per table, the last row per key winning."""
+    connector.write_mode = "buffered"
+    connector.store_data(bank_rows(100.0), "bank")
+    connector.store_data(bank_rows(110.0), "bank")
+    connector.store_data(bank_rows(5.0, name="Checking"), "bank")
+    assert writes == []
+
+    connector.flush()
+
+    assert [table_name for table_name, _ in writes] == ["bank"]
+    assert writes[0][1][["name", "balance"]].to_dict("records") == [
+        {"name": "Savings", "balance": 110.0},
+        {"name": "Checking", "balance": 5.0},
+    ]
+    assert connector._buffers == {}
+
+
+def test_full_buffer_is_written_before_flush(connector, writes):
+    """A table is written as soon as its buffer reaches the maximum number of rows."""
+    connector.write_mode = "buffered"
+    connector.buffer_max_rows = 2
+    connector.store_data(bank_rows(100.0), "bank")
+    connector.store_data(bank_rows(5.0, name="Checking"), "bank")
+
+    assert [len(df) for _, df in writes] == [2]
+
+
+def test_failed_table_doesnt_stop_the_flush_of_the_others(connector, monkeypatch):
+    """Every buffered table is written, and the failed ones are reported together."""
+    written = []
+
+    def write(df, table_name):
+        if table_name == "bank":
+            raise RuntimeError("MERGE failed")
+        written.append(table_name)
+
+    monkeypatch.setattr(connector, "_write", write)
+    connector.write_mode = "buffered"
+    connector.store_data(bank_rows(100.0), "bank")
+    connector.store_data(
+        DataFrame([{"date": date.today(), "source": "Coinbase", "name": "Bitcoin", "portfolio_value": 1.0}]), "crypto"
+    )
+
+    with pytest.raises(StorageError, match="tables: bank"):
+        connector.flush()
+    assert written == ["crypto"]
+
+
+def test_missing_totals_table_is_created_and_backfilled_once(connector):
+    """The daily totals table is backfilled from the fact tables and the view redefined when it is created."""
+    queries = []
+    created = []
+    connector._run_query = lambda operation, query, *args, **kwargs: queries.append((operation, query))
+    connector.category_names = {"bank": "bank-accounts", "stock": "stocks", "crypto": "crypto"}
+
+    def get_table(table_id):
+        if table_id.endswith("daily_totals"):
+            raise LookupError(table_id)
+        return SimpleNamespace(time_partitioning=bigquery.TimePartitioning(field="date"))
+
+    connector.client.get_table = get_table
+    connector.client.create_table = lambda table: created.append(table)
+
+    connector._ensure_totals_table(connector.client)
+    connector._ensure_totals_table(connector.client)
+
+    assert [table.table_id for table in created] == ["daily_totals"]
+    assert created[0].time_partitioning.field == "date"
+    assert [operation for operation, _ in queries] == ["backfill_daily_totals", "replace_totals_view"]
+    backfill = queries[0][1]
+    assert "INSERT INTO `project.finance.daily_totals`" in backfill
+    assert "'bank-accounts' AS source" in backfill
+    assert "SUM(portfolio_value)" in backfill
+    assert "FROM `project.finance.daily_totals`" in queries[1][1]
+
+
+def test_totals_refresh_only_recalculates_the_written_dates(connector):
+    """The refresh MERGE of a write only reads and updates the partitions of the written dates."""
+    connector.category_names = {"bank": "bank-accounts", "stock": "stocks", "crypto": "crypto"}
+
+    query = connector._build_totals_refresh_query("bank", [date(2025, 1, 2), date(2025, 1, 1)])
+
+    assert "MERGE `project.finance.daily_totals` AS target" in query
+    assert "FROM `project.finance.bank`" in query
+    assert "'bank-accounts' AS source" in query
+    assert query.count("IN (DATE '2025-01-01', DATE '2025-01-02')") == 2
+
+
+def test_write_refreshes_the_totals_in_the_merge_script(connector):
+    """The upsert of a table and the refresh of its daily totals run as one script."""
+    scripts = []
+    connector._prepare_write = lambda df, table_name: (df, {})
+    connector._run_query = lambda operation, query, **kwargs: scripts.append((operation, query))
+    connector.client.delete_table = lambda table_id: None
+
+    connector._write(bank_rows(100.0), "bank")
+
+    operation, script = scripts[0]
+    assert operation == "merge_bank"
+    assert script.index("MERGE `project.finance.bank`") < script.index("MERGE `project.finance.daily_totals`")
+
+
+def test_transaction_mode_writes_all_tables_together_on_flush(connector, monkeypatch):
+    """In transaction mode the buffers are never written early, and flush writes all tables at once."""
+    transactions = []
+    monkeypatch.setattr(connector, "_write_transaction", lambda frames: transactions.append(frames))
+    connector.write_mode = "transaction"
+    connector.buffer_max_rows = 1
+    connector.store_data(bank_rows(100.0), "bank")
+    connector.store_data(bank_rows(110.0), "bank")
+    connector.store_data(
+        DataFrame([{"date": date.today(), "source": "Coinbase", "name": "Bitcoin", "portfolio_value": 1.0}]), "crypto"
+    )
+    assert transactions == []
+
+    connector.flush()
+
+    assert len(transactions) == 1
+    assert sorted(transactions[0]) == ["bank", "crypto"]
+    assert transactions[0]["bank"]["balance"].tolist() == [110.0]
+
+
+def test_transaction_merges_every_table_in_one_script(connector):
+    """All staged tables are merged in a single job between BEGIN and COMMIT TRANSACTION."""
+    scripts = []
+    deleted = []
+    connector._prepare_write = lambda df, table_name: (df, {})
+    connector._stage_write = lambda client, df, table_name, temp_table_name: f"MERGE {table_name};\n"
+    connector._run_query = lambda operation, query, **kwargs: scripts.append((operation, query))
+    connector.client.delete_table = lambda table_id: deleted.append(table_id)
+
+    connector._write_transaction({"bank": bank_rows(100.0), "stock": bank_rows(1.0)})
+
+    operation, script = scripts[0]
+    assert len(scripts) == 1
+    assert operation == "merge_transaction"
+    assert script.index("BEGIN TRANSACTION") < script.index("MERGE bank") < script.index("MERGE stock")
+    assert script.index("MERGE stock") < script.index("COMMIT TRANSACTION") < script.index("ROLLBACK TRANSACTION")
+    assert len(deleted) == 2
+
+
+def test_failed_transaction_is_reported_for_all_tables(connector, monkeypatch):
+    """A failed transaction reports every table it contained and leaves nothing buffered."""
+
+    def fail(frames):
+        raise RuntimeError("transaction rolled back")
+
+    monkeypatch.setattr(connector, "_write_transaction", fail)
+    connector.write_mode = "transaction"
+    connector.store_data(bank_rows(100.0), "bank")
+    connector.store_data(bank_rows(1.0), "stock")
+
+    with pytest.raises(StorageError, match="tables: bank, stock"):
+        connector.flush()
+    assert connector._buffers == {}
+
+
+def test_buffered_categoricals_are_coerced_after_concatenation(connector, writes):
+    """Buffered DataFrames with different categories are written with the table's categorical dtypes."""
+    connector.write_mode = "buffered"
+    connector.store_data(bank_rows(100.0), "bank")
+    connector.store_data(
+        DataFrame([{"date": date.today(), "source": "ING", "name": "Checking", "balance": 5.0}]), "bank"
+    )
+
+    connector.flush()
+
+    assert str(writes[0][1]["source"].dtype) == "category"
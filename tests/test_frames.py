@@ -0,0 +1,77 @@
+from datetime import date
+
+import pandas as pd
+import pytest
+
+from finance_dashboard import frames, schema
+
+ROWS = [
+    {"date": date(2025, 1, 2), "source": "Bunq", "name": "Savings", "balance": 100.5, "currency": "EUR"},
+    {
+        "date": date(2025, 1, 2),
+        "source": "Bunq",
+        "name": "Dollars",
+        "balance": 92.0,
+        "currency": "EUR",
+        "original_balance": 100.0,
+        "original_currency": "USD",
+    },
+    {"date": date(2025, 1, 2), "source": "Bunq", "name": "Empty", "balance": None, "currency": "EUR"},
+]
+
+
+@pytest.fixture
+def backend():
+    """Restore the default backend after the test."""
+    yield frames.set_backend
+    frames.set_backend("numpy")
+
+
+@pytest.mark.parametrize("name", frames.BACKENDS)
+def test_build_frame_keeps_columns_missing_from_the_first_row(backend, name):
+    """Columns that only later rows have are kept, with nulls for the other rows."""
+    backend(name)
+    df = frames.build_frame(ROWS)
+
+    assert list(df.columns) == [
+        "date",
+        "source",
+        "name",
+        "balance",
+        "currency",
+        "original_balance",
+        "original_currency",
+    ]
+    assert df["original_balance"].tolist()[1] == 100.0
+    assert df["original_currency"].tolist()[1] == "USD"
+    assert df["original_balance"].isna().tolist() == [True, False, True]
+
+
+def test_build_frame_backends_are_equal_after_coercion(backend):
+    """Both backends store the same values once coerced to the table schema."""
+    backend("numpy")
+    numpy_df = schema.BANK.coerce(frames.build_frame(ROWS))
+    backend("arrow")
+    arrow_df = schema.BANK.coerce(frames.build_frame(ROWS))
+
+    assert isinstance(arrow_df["name"].dtype, pd.ArrowDtype)
+    pd.testing.assert_frame_equal(
+        numpy_df.astype(object).where(numpy_df.notna(), None),
+        arrow_df.astype(object).where(arrow_df.notna(), None),
+    )
+
+
+@pytest.mark.parametrize("name", frames.BACKENDS)
+def test_build_frame_empty_with_columns(backend, name):
+    """An empty batch gives an empty DataFrame with the requested columns."""
+    backend(name)
+    df = frames.build_frame([], columns=["name", "balance"])
+
+    assert df.empty
+    assert list(df.columns) == ["name", "balance"]
+
+
+def test_set_backend_rejects_unknown_backend():
+    """Unknown backends are rejected."""
+    with pytest.raises(ValueError, match="Unknown DataFrame backend"):
+        frames.set_backend("polars")
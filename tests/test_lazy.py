@@ -0,0 +1,26 @@
+import logging
+
+from finance_dashboard.logger.lazy import dump_payload
+
+
+def test_payload_is_serialized_when_formatted():
+    """The payload is dumped as indented JSON when the message is formatted."""
+    assert str(dump_payload({"balance": 1})) == '{\n  "balance": 1\n}'
+
+
+def test_payload_is_truncated_at_the_limit():
+    """Long payloads are cut off at the limit."""
+    assert str(dump_payload(list(range(1000)), limit=20)) == "[\n  0,\n  1,\n  2,\n  3... (truncated at 20 characters)"
+
+
+def test_payload_is_not_serialized_when_not_logged(caplog):
+    """Nothing is serialized when debug messages are not handled."""
+
+    class Unserializable:
+        def __str__(self):
+            raise AssertionError("serialized")
+
+    caplog.set_level(logging.INFO)
+    logging.getLogger(__name__).debug("Response: %s", dump_payload(Unserializable()))
+
+    assert caplog.records == []
@@ -0,0 +1,45 @@
+import tracemalloc
+
+import pytest
+
+from finance_dashboard import memory
+
+
+@pytest.fixture(autouse=True)
+def stop_tracing():
+    """Leave tracemalloc and the memory tracker stopped after the test."""
+    yield
+    memory.stop()
+    tracemalloc.stop()
+
+
+def test_stages_are_measured():
+    """Every stage records the memory it allocated."""
+    memory.start(top=1)
+    with memory.stage("collect", source="Bunq"):
+        data = bytearray(1024 * 1024)
+    stages = memory.stop()
+
+    assert len(data) == 1024 * 1024
+    assert [(stage["stage"], stage["source"]) for stage in stages] == [("collect", "Bunq")]
+    assert stages[0]["peak_bytes"] >= 1024 * 1024
+    assert not tracemalloc.is_tracing()
+
+
+def test_tracing_started_elsewhere_is_kept():
+    """Stopping the tracker doesn't stop tracing that was started before it."""
+    tracemalloc.start()
+    memory.start()
+    with memory.stage("collect"):
+        pass
+    memory.stop()
+
+    assert tracemalloc.is_tracing()
+
+
+def test_stage_without_tracker_does_nothing():
+    """Stages are not measured when the tracker was not started."""
+    with memory.stage("collect"):
+        pass
+
+    assert memory.stop() == []
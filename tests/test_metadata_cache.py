@@ -0,0 +1,67 @@
+from finance_dashboard.connector import metadata_cache
+from finance_dashboard.connector.metadata_cache import MetadataCache
+
+TABLE_ID = "project.finance.bank"
+
+
+class Clock:
+    """Settable replacement for time.time."""
+
+    def __init__(self, now: float = 1000.0):
+        self.now = now
+
+    def __call__(self) -> float:
+        """Get the current time."""
+        return self.now
+
+
+def test_verified_entries_expire_after_the_ttl(monkeypatch):
+    """An object is only considered verified until its entry is older than the TTL."""
+    clock = Clock()
+    monkeypatch.setattr(metadata_cache.time, "time", clock)
+    cache = MetadataCache(ttl=60)
+
+    cache.mark_verified(MetadataCache.TABLE, TABLE_ID)
+    clock.now += 59
+    assert cache.is_verified(MetadataCache.TABLE, TABLE_ID)
+    assert not cache.is_verified(MetadataCache.VIEW, TABLE_ID)
+
+    clock.now += 1
+    assert not cache.is_verified(MetadataCache.TABLE, TABLE_ID)
+
+
+def test_entries_are_persisted_between_runs(tmp_path, monkeypatch):
+    """A new cache loads the entries of the file that are still within the TTL."""
+    clock = Clock()
+    monkeypatch.setattr(metadata_cache.time, "time", clock)
+    path = tmp_path / "cache" / "metadata.json"
+
+    cache = MetadataCache(str(path), ttl=60)
+    cache.mark_verified(MetadataCache.DATASET, "project.finance")
+    clock.now += 30
+    cache.mark_verified(MetadataCache.TABLE, TABLE_ID)
+
+    clock.now += 40
+    reloaded = MetadataCache(str(path), ttl=60)
+    assert reloaded.is_verified(MetadataCache.TABLE, TABLE_ID)
+    assert reloaded._entries == {f"table:{TABLE_ID}": 1030.0}
+
+
+def test_invalidated_entries_are_checked_again(tmp_path):
+    """An invalidated object is no longer verified, also not in the persisted cache."""
+    path = tmp_path / "metadata.json"
+    cache = MetadataCache(str(path))
+    cache.mark_verified(MetadataCache.TABLE, TABLE_ID)
+
+    cache.invalidate(MetadataCache.TABLE, TABLE_ID)
+
+    assert not cache.is_verified(MetadataCache.TABLE, TABLE_ID)
+    assert not MetadataCache(str(path)).is_verified(MetadataCache.TABLE, TABLE_ID)
+
+
+def test_unreadable_cache_file_is_ignored(tmp_path):
+    """A corrupt cache file leaves the cache empty instead of failing."""
+    path = tmp_path / "metadata.json"
+    path.write_text("{", encoding="utf-8")
+
+    assert MetadataCache(str(path))._entries == {}
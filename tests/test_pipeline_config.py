@@ -0,0 +1,32 @@
+import pytest
+
+from finance_dashboard.pipeline_config import PipelineConfig
+
+CONFIG = """
+database:
+  connector: sqlite
+crypto:
+  enabled: true
+  accounts:
+    - name: Cosmos
+      type: cosmos
+    - name: Kraken
+      type: {account_type}
+"""
+
+
+@pytest.fixture
+def load_config(tmp_path):
+    """Load a pipeline configuration with a second crypto account of the given type."""
+
+    def load(account_type: str) -> PipelineConfig:
+        path = tmp_path / "pipeline.yml"
+        path.write_text(CONFIG.format(account_type=account_type), encoding="utf-8")
+        return PipelineConfig(str(path))
+
+    return load
+
+
+def test_unknown_account_type_is_not_a_validation_error(load_config):
+    """Accounts of an unknown type are skipped at runtime, so existing configurations stay valid."""
+    assert load_config("kraken").validate() == []
@@ -0,0 +1,53 @@
+import time
+
+import pytest
+
+from finance_dashboard.profiling import MAIN_SCOPE, DeterministicProfiler, Profiler, SamplingProfiler, create_profiler
+
+
+def busy(seconds: float):
+    """Keep the main thread busy, so the sampling profiler has stacks to sample."""
+    end = time.perf_counter() + seconds
+    while time.perf_counter() < end:
+        pass
+
+
+def test_profiler_is_abstract():
+    """The base profiler can't be used without a write implementation."""
+    with pytest.raises(TypeError):
+        Profiler()
+
+
+def test_sampling_profiler_writes_a_profile_per_source(tmp_path):
+    """Samples of the main thread are attributed to the enclosing source scope."""
+    profiler = SamplingProfiler(interval=0.001)
+    profiler.start()
+    with profiler.scope("Bunq / Main"):
+        busy(0.05)
+    profiler.stop()
+
+    names = {path.name for path in profiler.write(tmp_path)}
+
+    assert {"Bunq_Main.collapsed", "report.txt"} <= names
+    assert f"{__name__}:busy" in (tmp_path / "Bunq_Main.collapsed").read_text(encoding="utf-8")
+
+
+def test_deterministic_profiler_returns_to_the_previous_scope(tmp_path):
+    """Profiling continues in the main scope after a source scope ends."""
+    profiler = DeterministicProfiler(top=5)
+    profiler.start()
+    with profiler.scope("Cosmos"):
+        busy(0.001)
+    busy(0.001)
+    profiler.stop()
+
+    names = {path.name for path in profiler.write(tmp_path)}
+
+    assert names == {f"{MAIN_SCOPE}.prof", "Cosmos.prof", "report.txt"}
+
+
+def test_create_profiler_rejects_unknown_profilers():
+    """Only the available profilers can be created."""
+    assert isinstance(create_profiler("cprofile"), DeterministicProfiler)
+    with pytest.raises(ValueError, match="Unknown profiler: pyspy"):
+        create_profiler("pyspy")
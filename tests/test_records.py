@@ -0,0 +1,67 @@
+from datetime import date
+
+import pytest
+
+from finance_dashboard import frames
+from finance_dashboard.connector.sqlite import SQLiteConnector
+from finance_dashboard.records import RecordSink, annotate_records, batched, convert_records
+
+# Value of one unit of each currency in EUR
+RATES = {"EUR": 1.0, "USD": 0.5}
+
+
+class FixedRateConverter:
+    """Currency converter with fixed rates to EUR."""
+
+    ref_currency = "EUR"
+    currencies = frozenset({"EUR", "USD"})
+
+    def convert(self, amount, currency, new_currency):
+        """Convert an amount with the fixed rates."""
+        return amount * RATES[currency] / RATES[new_currency]
+
+
+@pytest.fixture
+def connector():
+    """In-memory SQLite connector."""
+    connector = SQLiteConnector(":memory:")
+    yield connector
+    connector.close()
+
+
+@pytest.mark.parametrize("backend", frames.BACKENDS)
+def test_mixed_currency_batch_keeps_original_values(connector, backend):
+    """The original values of foreign currency records are stored whatever the first record is."""
+    frames.set_backend(backend)
+    records = [
+        {"name": "Savings", "iban": "NL01", "balance": 100.0, "currency": "EUR"},
+        {"name": "Dollars", "iban": "NL02", "balance": 100.0, "currency": "USD"},
+    ]
+    try:
+        stored = RecordSink(connector, "bank").consume(
+            annotate_records(convert_records(records, FixedRateConverter(), ["balance"]), "Bunq", date(2025, 1, 2))
+        )
+    finally:
+        frames.set_backend("numpy")
+
+    rows = connector.connection.execute(
+        "SELECT name, balance, currency, original_balance, original_currency FROM bank ORDER BY name"
+    ).fetchall()
+    assert stored == 2
+    assert rows == [("Dollars", 50.0, "EUR", 100.0, "USD"), ("Savings", 100.0, "EUR", None, None)]
+
+
+def test_convert_records_keeps_unsupported_currency():
+    """Records in an unsupported currency keep their values."""
+    records = list(
+        convert_records([{"name": "Yen", "balance": 10.0, "currency": "JPY"}], FixedRateConverter(), ["balance"])
+    )
+
+    assert records == [
+        {"name": "Yen", "balance": 10.0, "currency": "JPY", "original_balance": 10.0, "original_currency": "JPY"}
+    ]
+
+
+def test_batched():
+    """Records are grouped in batches of at most the batch size."""
+    assert [len(batch) for batch in batched(({"n": n} for n in range(5)), 2)] == [2, 2, 1]
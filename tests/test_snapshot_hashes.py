@@ -0,0 +1,60 @@
+import json
+from datetime import date
+
+from pandas import DataFrame
+
+from finance_dashboard.connector.snapshot_hashes import SnapshotHashes
+
+
+def bank_frame(balance: float) -> DataFrame:
+    """Build a bank DataFrame with a single account of today."""
+    return DataFrame([{"date": date.today(), "source": "Bunq", "name": "Savings", "balance": balance}])
+
+
+def test_rows_are_skipped_once_committed(tmp_path):
+    """Rows are only skipped after their hashes were committed, and changed rows are written again."""
+    hashes = SnapshotHashes("project.finance", str(tmp_path / "hashes.json"))
+
+    changed, pending = hashes.changed_rows(bank_frame(100.0), "bank")
+    assert len(changed) == 1
+    assert len(hashes.changed_rows(bank_frame(100.0), "bank")[0]) == 1
+
+    hashes.commit(pending)
+    assert hashes.changed_rows(bank_frame(100.0), "bank")[0].empty
+    assert len(hashes.changed_rows(bank_frame(101.0), "bank")[0]) == 1
+    assert hashes.statistics() == {"skipped_rows": 1, "skipped_writes": 1}
+
+
+def test_hashes_are_kept_per_destination(tmp_path):
+    """Rows written to one dataset are not skipped for another dataset sharing the file."""
+    path = str(tmp_path / "hashes.json")
+    production = SnapshotHashes("project.finance", path)
+    production.commit(production.changed_rows(bank_frame(100.0), "bank")[1])
+
+    assert SnapshotHashes("project.finance", path).changed_rows(bank_frame(100.0), "bank")[0].empty
+    assert len(SnapshotHashes("project.finance_test", path).changed_rows(bank_frame(100.0), "bank")[0]) == 1
+
+
+def test_hashes_without_destination_are_ignored(tmp_path):
+    """Hashes written without a destination are not trusted."""
+    path = tmp_path / "hashes.json"
+    hashes = SnapshotHashes("project.finance", str(path))
+    hashes.commit(hashes.changed_rows(bank_frame(100.0), "bank")[1])
+    legacy = {key.split("|", 1)[1]: value for key, value in json.loads(path.read_text()).items()}
+    path.write_text(json.dumps(legacy))
+
+    assert len(SnapshotHashes("project.finance", str(path)).changed_rows(bank_frame(100.0), "bank")[0]) == 1
+
+
+def test_invalidate_forgets_the_table_of_the_destination(tmp_path):
+    """Invalidating a table only forgets its hashes in the same destination."""
+    path = str(tmp_path / "hashes.json")
+    production = SnapshotHashes("project.finance", path)
+    production.commit(production.changed_rows(bank_frame(100.0), "bank")[1])
+    test = SnapshotHashes("project.finance_test", path)
+    test.commit(test.changed_rows(bank_frame(100.0), "bank")[1])
+
+    test.invalidate("bank")
+
+    assert len(test.changed_rows(bank_frame(100.0), "bank")[0]) == 1
+    assert production.changed_rows(bank_frame(100.0), "bank")[0].empty
@@ -0,0 +1,37 @@
+import logging
+
+from finance_dashboard import collectors, sources
+from finance_dashboard.connector.sqlite import SQLiteConnector
+
+
+def test_builtin_collectors_are_module_functions():
+    """Built-in source types resolve to the standalone collectors, whatever the case of the type."""
+    assert sources.get_collector("crypto", "Cosmos") is collectors.collect_cosmos
+    assert sources.get_collector("bank", "bunq") is collectors.collect_bunq
+    assert sources.get_collector("crypto", "kraken") is None
+
+
+def test_source_types():
+    """The source types of a category are listed without importing their collectors."""
+    assert sources.source_types("crypto") == ["coinbase", "cosmos", "web3", "web3-solana"]
+
+
+def test_account_env_value(monkeypatch):
+    """Account values are read from the environment variable named by their `*_env` key."""
+    monkeypatch.setenv("TEST_WALLET", "osmo1abc")
+    context = sources.SourceContext(connector=None, converter=None, logger=None)
+
+    assert context.account_env_value({"wallet_address_env": "TEST_WALLET"}, "wallet_address_env") == "osmo1abc"
+    assert context.account_env_value({}, "wallet_address_env", "none") == "none"
+
+
+def test_collector_skips_account_without_credentials(caplog):
+    """A collector skips an account without credentials before creating its repository."""
+    connector = SQLiteConnector(":memory:")
+    context = sources.SourceContext(connector=connector, converter=None, logger=logging.getLogger())
+
+    with caplog.at_level(logging.INFO):
+        collectors.collect_cosmos(context, "Osmosis", {"type": "cosmos"})
+
+    connector.close()
+    assert "Skipping Osmosis - no wallet address configured" in caplog.text
@@ -0,0 +1,72 @@
+from datetime import date
+
+import pytest
+from pandas import DataFrame
+
+from finance_dashboard.connector import Connector
+from finance_dashboard.connector.spool import SpoolingConnector
+from finance_dashboard.connector.sqlite import SQLiteConnector
+from finance_dashboard.exceptions import StorageError
+
+
+class FailingConnector(Connector):
+    """Connector of an unreachable database."""
+
+    def store_data(self, df, table_name):
+        """Fail to store the data."""
+        raise ConnectionError("database unreachable")
+
+
+def bank_frame(balance: float) -> DataFrame:
+    """Build a bank DataFrame with a single account."""
+    return DataFrame(
+        [{"date": date(2025, 1, 2), "source": "Bunq", "name": "Savings", "balance": balance, "currency": "EUR"}]
+    )
+
+
+@pytest.fixture
+def database(tmp_path):
+    """SQLite connector in a temporary directory."""
+    connector = SQLiteConnector(str(tmp_path / "finance.db"))
+    connector.setup_database("bank-accounts", "stocks", "crypto")
+    yield connector
+    connector.close()
+
+
+def stored_balances(connector: SQLiteConnector) -> list[tuple]:
+    """Get the stored bank balances."""
+    return connector.connection.execute("SELECT name, balance FROM bank").fetchall()
+
+
+def test_spool_is_replayed_after_a_crash(tmp_path, database):
+    """Data spooled by a run that never flushed is written by the next run."""
+    spool_path = tmp_path / "spool"
+    crashed = SpoolingConnector(database, str(spool_path))
+    crashed.store_data(bank_frame(100.0), "bank")
+    # The run crashes while writing the next batch, leaving a partially written file
+    (spool_path / "bank" / "partial.tmp").write_bytes(b"PAR1")
+
+    assert stored_balances(database) == []
+
+    SpoolingConnector(database, str(spool_path)).flush()
+
+    assert stored_balances(database) == [("Savings", 100.0)]
+    assert list((spool_path / "bank").glob("*.parquet")) == []
+
+
+def test_spool_is_kept_when_the_database_fails(tmp_path, database):
+    """Spooled data is kept when the write fails and replayed, latest batch first, on the next run."""
+    spool_path = tmp_path / "spool"
+    failed = SpoolingConnector(FailingConnector(), str(spool_path))
+    failed.store_data(bank_frame(100.0), "bank")
+    failed.store_data(bank_frame(150.0), "bank")
+
+    with pytest.raises(StorageError, match="kept for the next run"):
+        failed.flush()
+    assert len(list((spool_path / "bank").glob("*.parquet"))) == 2
+
+    spool = SpoolingConnector(database, str(spool_path))
+    spool.flush()
+
+    assert stored_balances(database) == [("Savings", 150.0)]
+    assert spool.run_statistics()["spool"] == {"spooled_batches": 0, "replayed_rows": 1}
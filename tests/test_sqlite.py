@@ -0,0 +1,98 @@
+from datetime import date
+
+import pytest
+from pandas import DataFrame
+
+from finance_dashboard.connector.sqlite import SQLiteConnector
+
+TODAY = date(2025, 1, 2)
+YESTERDAY = date(2025, 1, 1)
+
+
+@pytest.fixture
+def connector(tmp_path):
+    """SQLite connector with its tables and view set up."""
+    connector = SQLiteConnector(str(tmp_path / "data" / "finance.db"))
+    connector.setup_database("bank-accounts", "stocks", "crypto")
+    yield connector
+    connector.close()
+
+
+def test_round_trip(connector):
+    """Stored rows are read back through the total view and the daily summary."""
+    connector.store_data(
+        DataFrame(
+            [
+                {"date": YESTERDAY, "source": "Bunq", "name": "Savings", "balance": 100.0, "currency": "EUR"},
+                {"date": TODAY, "source": "Bunq", "name": "Savings", "balance": 120.0, "currency": "EUR"},
+            ]
+        ),
+        "bank",
+    )
+    connector.store_data(
+        DataFrame(
+            [
+                {
+                    "date": TODAY,
+                    "source": "Coinbase",
+                    "name": "Bitcoin",
+                    "type": "wallet",
+                    "symbol": "BTC",
+                    "amount": 0.5,
+                    "current_value": 60.0,
+                    "portfolio_value": 30.0,
+                    "currency": "EUR",
+                }
+            ]
+        ),
+        "crypto",
+    )
+
+    totals = connector.get_totals(start_date=TODAY.isoformat())
+    assert totals.to_dict("records") == [
+        {"date": TODAY, "source": "bank-accounts", "total_balance": 120.0},
+        {"date": TODAY, "source": "crypto", "total_balance": 30.0},
+    ]
+    assert connector.get_category_totals(YESTERDAY) == {"bank-accounts": 100.0}
+
+    summary = connector.get_daily_summary(TODAY)
+    assert summary["total_today"] == 150.0
+    assert summary["total_yesterday"] == 100.0
+    assert summary["total_change_pct"] == 50.0
+
+
+def test_store_data_upserts_on_date_source_and_name(connector):
+    """Storing a row again replaces it instead of adding a duplicate."""
+    for balance in (100.0, 110.0):
+        connector.store_data(
+            DataFrame([{"date": TODAY, "source": "Bunq", "name": "Savings", "iban": "NL01", "balance": balance}]),
+            "bank",
+        )
+
+    assert connector.connection.execute("SELECT date, name, iban, balance FROM bank").fetchall() == [
+        ("2025-01-02", "Savings", "NL01", 110.0)
+    ]
+
+
+def test_daily_summary_without_data(connector):
+    """There is no daily summary without data for today or yesterday."""
+    assert connector.get_daily_summary(TODAY) is None
+
+
+def test_daily_summary_reports_the_latest_date_with_data(connector):
+    """Without data on the report date, the summary compares the latest date with data to the day before."""
+    connector.store_data(
+        DataFrame(
+            [
+                {"date": date(2024, 12, 31), "source": "Bunq", "name": "Savings", "balance": 80.0},
+                {"date": YESTERDAY, "source": "Bunq", "name": "Savings", "balance": 100.0},
+            ]
+        ),
+        "bank",
+    )
+
+    summary = connector.get_daily_summary(TODAY)
+    assert summary["total_today"] == 100.0
+    assert summary["total_yesterday"] == 80.0
+    assert summary["total_change_pct"] == 25.0
+    assert connector.get_daily_summary(date(2025, 2, 1)) is None
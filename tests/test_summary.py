@@ -0,0 +1,159 @@
+import logging
+from datetime import date, timedelta
+from types import SimpleNamespace
+
+import pytest
+from pandas import DataFrame
+
+from finance_dashboard.connector import Connector
+from finance_dashboard.summary import RecordingConnector, RunTotals, TotalsHistory, build_daily_summary
+
+TODAY = date(2025, 1, 2)
+CATEGORY_NAMES = {"bank": "bank-accounts", "stock": "stocks", "crypto": "crypto"}
+
+
+class BufferingConnector(Connector):
+    """Connector that writes on flush, failing when told to."""
+
+    def __init__(self, fail: bool = False):
+        self.fail = fail
+        self.buffered = []
+
+    def store_data(self, df, table_name):
+        """Buffer the data."""
+        self.buffered.append((df, table_name))
+
+    def flush(self):
+        """Fail or forget the buffered data."""
+        if self.fail:
+            raise ConnectionError("database unreachable")
+        self.buffered.clear()
+
+
+def bank_frame(*balances: float) -> DataFrame:
+    """Build a bank DataFrame of today with one account per balance."""
+    return DataFrame(
+        [
+            {"date": TODAY, "source": "Bunq", "name": f"Account {number}", "balance": balance}
+            for number, balance in enumerate(balances)
+        ]
+    )
+
+
+def test_rows_are_counted_once_flushed():
+    """Stored rows only count in the run totals once the connector has written them."""
+    run_totals = RunTotals(CATEGORY_NAMES)
+    sink = RecordingConnector(BufferingConnector(), run_totals)
+
+    sink.store_data(bank_frame(100.0, 50.0), "bank")
+    assert run_totals.totals(TODAY) == {}
+
+    sink.flush()
+    assert run_totals.totals(TODAY) == {"bank-accounts": 150.0}
+
+
+def test_rows_are_not_counted_when_the_flush_fails():
+    """Rows of a failed write are not counted in the run totals."""
+    run_totals = RunTotals(CATEGORY_NAMES)
+    sink = RecordingConnector(BufferingConnector(fail=True), run_totals)
+    sink.store_data(bank_frame(100.0), "bank")
+
+    with pytest.raises(ConnectionError):
+        sink.flush()
+    assert run_totals.totals(TODAY) == {}
+
+
+def test_rows_stored_twice_are_counted_once():
+    """Like the connectors' upsert, the last stored value of a row counts."""
+    run_totals = RunTotals(CATEGORY_NAMES)
+    run_totals.add(bank_frame(100.0), "bank")
+    run_totals.add(bank_frame(120.0), "bank")
+    run_totals.commit()
+
+    assert run_totals.totals(TODAY) == {"bank-accounts": 120.0}
+
+
+def test_totals_history_round_trip(tmp_path):
+    """Stored totals are read back by a new history, and dates past the retention are dropped."""
+    path = str(tmp_path / "daily_totals.json")
+    TotalsHistory(path, max_days=1).set(date(2024, 12, 31), {"crypto": 10.0})
+    history = TotalsHistory(path, max_days=1)
+    history.set(TODAY, {"bank-accounts": 150.0})
+
+    history = TotalsHistory(path, max_days=1)
+    assert history.get(TODAY) == {"bank-accounts": 150.0}
+    assert history.get(date(2024, 12, 31)) is None
+
+
+def test_build_daily_summary():
+    """Categories of either day are compared, missing totals count as 0."""
+    summary = build_daily_summary({"bank-accounts": 150.0, "crypto": 20.0}, {"bank-accounts": 100.0})
+
+    assert summary["total_today"] == 170.0
+    assert summary["total_change_pct"] == 70.0
+    assert [category["name"] for category in summary["categories"]] == ["bank-accounts", "crypto"]
+    assert build_daily_summary({}, {}) is None
+
+
+@pytest.fixture
+def dashboard(tmp_path, monkeypatch):
+    """Dashboard with a SQLite database and crypto accounts of the given test source types."""
+    from finance_dashboard import sources
+    from finance_dashboard.main import FinanceDashboard
+    from finance_dashboard.pipeline_config import PipelineConfig
+
+    def collect_empty(context, account_name, account_config):
+        """Collect a wallet without holdings."""
+
+    def collect_failing(context, account_name, account_config):
+        """Fail like the built-in collectors, by logging the error."""
+        logging.getLogger(__name__).error(f"{account_name} data collection failed")
+
+    monkeypatch.setitem(sources._collectors, ("crypto", "empty"), collect_empty)
+    monkeypatch.setitem(sources._collectors, ("crypto", "failing"), collect_failing)
+    monkeypatch.chdir(tmp_path)
+
+    def create(*account_types: str) -> FinanceDashboard:
+        accounts = "".join(f"    - name: {name}\n      type: {name}\n" for name in account_types)
+        (tmp_path / "pipeline.yml").write_text(
+            "logging:\n  telegram:\n    send_summary: true\n"
+            f"database:\n  connector: sqlite\ncrypto:\n  enabled: true\n  accounts:\n{accounts}",
+            encoding="utf-8",
+        )
+        return FinanceDashboard(PipelineConfig("pipeline.yml"))
+
+    return create
+
+
+def test_accounts_without_data_are_collected(dashboard):
+    """An account that stores no rows without an error doesn't make the run totals incomplete."""
+    finance_dashboard = dashboard("empty")
+    finance_dashboard.run()
+
+    assert finance_dashboard.uncollected_accounts == []
+
+
+def test_failed_and_unknown_accounts_are_uncollected(dashboard):
+    """Accounts whose collector logged an error or whose type is unknown make the run totals incomplete."""
+    finance_dashboard = dashboard("empty", "failing", "kraken")
+    finance_dashboard.run()
+
+    assert finance_dashboard.uncollected_accounts == ["failing", "kraken"]
+
+
+def test_run_without_rows_summarizes_the_latest_stored_date(dashboard):
+    """A run that stores nothing today reports the latest stored date instead of a total of zero."""
+    finance_dashboard = dashboard("empty")
+    yesterday = date.today() - timedelta(days=1)
+    finance_dashboard.connector.store_data(
+        DataFrame([{"date": yesterday, "source": "Bunq", "name": "Savings", "balance": 100.0}]), "bank"
+    )
+    summaries = []
+    finance_dashboard.telegram_logger = SimpleNamespace(
+        send_daily_summary=lambda summary_data, **kwargs: summaries.append(summary_data),
+        send_error_digest=lambda: None,
+        error_digest=None,
+    )
+    finance_dashboard.run()
+
+    assert [summary["total_today"] for summary in summaries] == [100.0]
@@ -0,0 +1,153 @@
+import json
+import logging
+import threading
+
+import pytest
+import requests
+
+from finance_dashboard.logger import telegram
+from finance_dashboard.logger.telegram import TelegramLogger
+
+
+def telegram_response(status_code: int, payload: dict | None = None) -> requests.Response:
+    """Create a Telegram API response with a status code and JSON payload."""
+    response = requests.Response()
+    response.status_code = status_code
+    response._content = json.dumps(payload or {}).encode()
+    return response
+
+
+def log_record(message: str) -> logging.LogRecord:
+    """Create an error log record with a message."""
+    return logging.LogRecord("finance_dashboard", logging.ERROR, __file__, 1, message, None, None)
+
+
+@pytest.fixture
+def sent(monkeypatch):
+    """Texts of the messages posted to Telegram."""
+    texts = []
+    monkeypatch.setattr(
+        telegram.requests,
+        "post",
+        lambda url, params, timeout: texts.append(params["text"]) or telegram_response(200),
+    )
+    return texts
+
+
+@pytest.fixture
+def handler():
+    """Telegram handler that only sends when flushed and isn't rate limited."""
+    handler = TelegramLogger.TelegramHandler("token", "chat", linger=60, min_interval=0)
+    yield handler
+    handler.close()
+
+
+def test_records_are_sent_in_one_message(handler, sent):
+    """Records emitted before a flush are joined into a single message."""
+    handler.emit(log_record("first"))
+    handler.emit(log_record("second"))
+    handler.flush()
+
+    assert sent == ["first\n\nsecond"]
+
+
+def test_long_records_are_split(handler):
+    """Messages never exceed the maximum Telegram message length."""
+    messages = handler._batch(["a" * 5000, "b" * 10])
+
+    assert [len(message) for message in messages] == [4096, 904 + 2 + 10]
+
+
+def test_logging_is_not_blocked_while_sending(handler, monkeypatch):
+    """Records can be emitted from another thread while a batch is being sent."""
+    emitted = []
+
+    def post(url, params, timeout):
+        thread = threading.Thread(target=lambda: emitted.append(handler.emit(log_record("during send"))))
+        thread.start()
+        thread.join(timeout=1)
+        emitted.append(thread.is_alive())
+        return telegram_response(200)
+
+    monkeypatch.setattr(telegram.requests, "post", post)
+    handler.emit(log_record("first"))
+    handler.flush()
+
+    assert emitted == [None, False]
+    assert handler._pending == ["during send"]
+
+
+def test_rate_limited_message_is_retried(handler, monkeypatch):
+    """A message Telegram rate limits is sent again after the delay it asks for."""
+    responses = [
+        telegram_response(429, {"parameters": {"retry_after": 0}}),
+        telegram_response(200),
+    ]
+    texts = []
+    monkeypatch.setattr(
+        telegram.requests, "post", lambda url, params, timeout: texts.append(params["text"]) or responses.pop(0)
+    )
+    handler.emit(log_record("alert"))
+    handler.flush()
+
+    assert texts == ["alert", "alert"]
+
+
+def test_rejected_message_is_reported(handler, monkeypatch, caplog):
+    """A message Telegram rejects is logged as a failure instead of being treated as sent."""
+    monkeypatch.setattr(telegram.requests, "post", lambda url, params, timeout: telegram_response(401))
+    handler.emit(log_record("alert"))
+    handler.flush()
+
+    assert "Failed to send log message to Telegram: 401" in caplog.text
+
+
+def error_record(message: str, function: str = "get_and_store_wallet") -> logging.LogRecord:
+    """Create an error log record of a failed exception in a function."""
+    exc_info = (ConnectionError, ConnectionError(message), None)
+    record = logging.LogRecord("finance_dashboard", logging.ERROR, __file__, 1, message, None, exc_info)
+    record.funcName = function
+    return record
+
+
+def test_error_digest_passes_only_the_first_occurrence():
+    """Repeated errors are counted but only the first one is passed on as an alert."""
+    digest = TelegramLogger.ErrorDigest()
+
+    passed = [digest.filter(error_record(f"[Osmosis] Error {attempt}")) for attempt in range(3)]
+    passed.append(digest.filter(error_record("[Kraken] Error")))
+
+    assert passed == [True, False, False, True]
+    assert digest.statistics() == {"errors": 4, "distinct": 2, "suppressed": 2}
+    assert digest.reset() == {
+        ("ConnectionError", "Osmosis", "get_and_store_wallet"): 3,
+        ("ConnectionError", "Kraken", "get_and_store_wallet"): 1,
+    }
+    assert digest.statistics() == {"errors": 0, "distinct": 0, "suppressed": 0}
+
+
+def test_error_digest_source_attribute():
+    """The `source` attribute of a record takes precedence over the message prefix."""
+    record = error_record("[Osmosis] Error")
+    record.source = "Cosmos"
+
+    assert TelegramLogger.ErrorDigest().fingerprint(record) == ("ConnectionError", "Cosmos", "get_and_store_wallet")
+
+
+def test_error_digest_lists_repeated_errors(tmp_path, monkeypatch):
+    """The digest message lists the errors that occurred more than once."""
+    monkeypatch.chdir(tmp_path)
+    messages = []
+    logger = TelegramLogger()
+    monkeypatch.setattr(logger, "send_message", lambda message, parse_mode: messages.append(message))
+    for _ in range(2):
+        logger.error_digest.filter(error_record("[Osmosis] Error"))
+    logger.error_digest.filter(error_record("[Kraken] Error"))
+
+    logger.send_error_digest()
+    logger.send_error_digest()
+
+    assert len(messages) == 1
+    assert "3 errors, 2 distinct" in messages[0]
+    assert "2x <code>ConnectionError</code> in Osmosis (get_and_store_wallet)" in messages[0]
+    assert "Kraken" not in messages[0]
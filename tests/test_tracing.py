@@ -0,0 +1,51 @@
+import pytest
+
+from finance_dashboard import tracing
+from finance_dashboard.main import FinanceDashboard
+from finance_dashboard.pipeline_config import PipelineConfig
+
+
+def test_nested_spans_inherit_the_source():
+    """Spans opened inside a span record it as parent and inherit its source."""
+    tracer = tracing.Tracer()
+    with tracer.span("collect", source="Bunq") as parent, tracer.span("api.bunq") as child:
+        pass
+
+    assert child.parent_id == parent.id
+    assert child.attributes == {"source": "Bunq"}
+    assert [span.name for span in tracer.spans] == ["api.bunq", "collect"]
+
+
+def test_failed_span_records_the_error():
+    """A span that raises is marked as failed with the type of the error."""
+    tracer = tracing.Tracer()
+    with pytest.raises(ValueError, match="broken"), tracer.span("store"):
+        raise ValueError("broken")
+
+    assert tracer.spans[0].status == "error"
+    assert tracer.spans[0].attributes == {"error": "ValueError"}
+
+
+def test_prometheus_metrics():
+    """Durations are exported per span and source, stored rows per source and table."""
+    tracer = tracing.Tracer()
+    for rows in (2, 3):
+        with tracer.span("store_records", source="Bunq", table="bank") as current:
+            current.set(rows=rows)
+
+    metrics = tracer.prometheus_metrics()
+
+    assert 'finance_dashboard_span_duration_seconds_count{span="store_records",source="Bunq"} 2' in metrics
+    assert 'finance_dashboard_stored_rows{source="Bunq",table="bank"} 5' in metrics
+    assert "finance_dashboard_span_errors 0" in metrics
+
+
+def test_run_trace_includes_startup(tmp_path, monkeypatch):
+    """The spans of the connector creation and setup are kept in the trace of the run."""
+    monkeypatch.chdir(tmp_path)
+    (tmp_path / "pipeline.yml").write_text("database:\n  connector: sqlite\n", encoding="utf-8")
+
+    FinanceDashboard(PipelineConfig("pipeline.yml")).run()
+
+    names = {span.name for span in tracing.get_tracer().spans}
+    assert {"connector.create", "connector.setup", "flush"} <= names